@@ -0,0 +1,69 @@
+"""
+Benchmark of CollisionEvent with and without the spatial index of the GameManager.
+
+Run from the repository root:
+    python -m benchmarks.bench_broad_phase
+"""
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from game.abc import GameObject
+from game.events import CollisionEvent
+from game.game_manager import GameManager
+
+
+class Bullet(GameObject):
+    ...
+
+class Enemy(GameObject):
+    ...
+
+
+def build_stage(count:int, seed:int = 0) -> GameManager:
+    """Spread `count` objects (half bullets, half enemies) over a world sized to keep a constant density"""
+    rng = random.Random(seed)
+    world_size = (count * 2000) ** 0.5
+    hits = []
+    event = CollisionEvent(Bullet, Enemy, lambda bullet, enemy: hits.append((bullet, enemy)))
+    game_manager = GameManager((world_size, world_size), [event])
+    for index in range(count):
+        cls = Bullet if index % 2 else Enemy
+        size = (8, 8) if cls is Bullet else (32, 32)
+        cls(game_manager, (rng.uniform(0, world_size), rng.uniform(0, world_size)), size)
+    return game_manager
+
+
+def time_frames(func, frames:int) -> float:
+    start = time.perf_counter()
+    for _ in range(frames):
+        func()
+    return (time.perf_counter() - start) / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 1000, 5000, 10000])
+    parser.add_argument("--frames", type=int, default=5)
+    parser.add_argument("--naive-limit", type=int, default=2000, help="Largest object count to time the all pairs loop at")
+    args = parser.parse_args()
+    
+    print(f"{'objects':>8} {'all pairs (ms)':>15} {'spatial hash (ms)':>18} {'speedup':>8}")
+    for count in args.counts:
+        game_manager = build_stage(count)
+        event = game_manager.event_manager.events[0]
+        bullets, enemies = game_manager.game_objects[Bullet], game_manager.game_objects[Enemy]
+        
+        indexed = time_frames(lambda: game_manager.update(1/60), args.frames)
+        if count <= args.naive_limit:
+            naive = time_frames(lambda: event.run(bullets, enemies), args.frames)
+            print(f"{count:>8} {naive*1000:>15.3f} {indexed*1000:>18.3f} {naive/indexed:>7.1f}x")
+        else:
+            print(f"{count:>8} {'skipped':>15} {indexed*1000:>18.3f} {'-':>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark of the frame time of Transition.draw for every built-in transition, against the previous draw which
+rendered, scaled and rotated the whole scene every frame.
+
+Run from the repository root:
+    python -m benchmarks.bench_transitions
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from better_pygame import Scene, transition
+from better_pygame.section import Section
+from better_pygame.utils import *
+
+
+class StripedScene(Scene):
+    """A scene with enough shapes on it that redrawing it costs something"""
+    def __init__(self, scene_manager, screen_size:tuple[int, int]) -> None:
+        super().__init__(scene_manager)
+        width, height = screen_size
+        self.rects = [pygame.Rect(x, y, 30, 30) for x in range(0, width, 40) for y in range(0, height, 40)]
+
+    def handle_event(self, event:pygame.Event):
+        ...
+
+    def update(self, dt:float):
+        ...
+
+    def draw(self, screen:pygame.Surface):
+        screen.fill((20, 20, 40))
+        for index, rect in enumerate(self.rects):
+            pygame.draw.rect(screen, (index % 255, 120, 200), rect)
+
+
+def legacy_draw(self:transition.Transition, screen:pygame.Surface):
+    """Transition.draw before the cached pipeline"""
+    if not self._running:
+        return
+    if not self.scene:
+        return
+
+    surf = transparent_surface(self.scene_size)
+    self.scene.draw(surf)
+    surf = pygame.transform.scale(surf, self._curr_size)
+    surf = pygame.transform.rotate(surf, self._curr_angle % 360)
+
+    curr_section = self.sections[self.curr_section_index]
+    rotation_origin = curr_section.rotation_origin if isinstance(curr_section, Section) else curr_section.get("rotation_origin")
+    if rotation_origin is None:
+        rotation_origin = tup_divide(self._curr_size, (2, 2))
+    origin_to_size_ratio = tup_divide(rotation_origin, self.scene_size)
+
+    rotated_size = surf.get_size()
+    if rotated_size != self._curr_size:
+        position_shift = tup_round(tup_multiply(tup_subtract((rotated_size[0], rotated_size[1]), self._curr_size), origin_to_size_ratio))
+    else:
+        position_shift = (0,0)
+    surf.set_alpha(int(self._curr_transparency))
+    screen.blit(surf, tup_subtract(self._curr_position, position_shift))
+
+
+def build_transitions(screen_size:tuple[int, int], duration:float) -> dict[str, transition.Transition]:
+    return {
+        "LinearSlideEnter": transition.LinearSlideEnter(duration, "left", screen_size),
+        "LinearSlideExit": transition.LinearSlideExit(duration, "right", screen_size),
+        "LinearFadeIn": transition.LinearFadeIn(duration),
+        "LinearFadeOut": transition.LinearFadeOut(duration),
+        "SpinEnter": transition.SpinEnter(duration, "up", screen_size),
+        "SpinExit": transition.SpinExit(duration, "down", screen_size),
+        "SpinShrinkExit": transition.SpinShrinkExit(duration, screen_size),
+    }
+
+
+def time_transition(trans:transition.Transition, draw, scene:Scene, screen:pygame.Surface, frames:int, dt:float, snapshot:bool = False) -> float:
+    """Average time of a draw call over `frames` frames of the transition"""
+    trans.set_snapshot(snapshot)
+    trans.start(scene, screen.get_size())
+    total = 0
+    for _ in range(frames):
+        trans.update(dt)
+        start = time.perf_counter()
+        draw(trans, screen)
+        total += time.perf_counter() - start
+    trans.terminate()
+    pygame.event.clear()
+    return total / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, nargs=2, default=[1280, 720])
+    parser.add_argument("--frames", type=int, default=60)
+    parser.add_argument("--require-update", action="store_true", help="Mark the scene as requiring update, so only snapshot mode skips redrawing it")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen_size = tuple(args.size)
+    screen = pygame.display.set_mode(screen_size)
+    scene = StripedScene(None, screen_size)
+    scene.set_transition_require_update(args.require_update)
+    dt = 1/60
+    # Long enough that the transitions are still running after the timed frames
+    duration = dt * (args.frames + 1)
+
+    print(f"{'transition':>16} {'legacy (ms)':>12} {'cached (ms)':>12} {'snapshot (ms)':>14} {'speedup':>8}")
+    for name, trans in build_transitions(screen_size, duration).items():
+        legacy = time_transition(trans, legacy_draw, scene, screen, args.frames, dt)
+        cached = time_transition(trans, transition.Transition.draw, scene, screen, args.frames, dt)
+        snapshot = time_transition(trans, transition.Transition.draw, scene, screen, args.frames, dt, snapshot=True)
+        print(f"{name:>16} {legacy * 1000:>12.3f} {cached * 1000:>12.3f} {snapshot * 1000:>14.3f} {legacy / min(cached, snapshot):>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
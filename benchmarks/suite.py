@@ -0,0 +1,247 @@
+"""
+Headless benchmark suite of the hot paths of the engine, runs with the SDL dummy video driver.
+
+Run from the repository root:
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --save-baseline benchmarks/baseline.json
+    python -m benchmarks.suite --baseline benchmarks/baseline.json
+
+With --baseline, exits with status 1 and lists every case slower than the baseline by more than the tolerance.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from typing import Callable
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+import better_pygame
+from better_pygame import Animation, Effect
+from better_pygame.animation_system import AnimationSystem
+from game.abc import GameObject
+from game.behaviors.behavior import Gravity, Immovable, Projectile, Solid
+from game.events import OverlapEvent
+from game.game_manager import GameManager
+
+from .bench_broad_phase import Bullet, Enemy, build_stage
+from .bench_transitions import StripedScene, build_transitions
+
+SCREEN_SIZE = (1280, 720)
+
+# name -> setup, a setup builds the case and returns the function timed, one call being one frame
+CASES:dict[str, Callable[[], Callable[[], None]]] = {}
+
+def case(name:str):
+    def register(setup:Callable[[], Callable[[], None]]):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+def _register_event_cases():
+    for count in (100, 1000, 5000):
+        @case(f"collision_event/{count}")
+        def setup_collision(count=count):
+            game_manager = build_stage(count)
+            return lambda: game_manager.update(1/60)
+
+        @case(f"overlap_event/{count}")
+        def setup_overlap(count=count):
+            game_manager = build_stage(count)
+            game_manager.event_manager.remove_event(game_manager.event_manager.events[0])
+            game_manager.event_manager.add_event(OverlapEvent(Bullet, Enemy, lambda bullet, enemy, info: None))
+            return lambda: game_manager.update(1/60)
+
+_register_event_cases()
+
+
+class Crate(GameObject):
+    ...
+
+class Tile(GameObject):
+    ...
+
+@case("solid_event/500_crates_2000_tiles")
+def setup_solid():
+    rng = random.Random(0)
+    game_manager = GameManager(SCREEN_SIZE, [])
+    for x in range(0, 2000 * 16, 16):
+        tile = Tile(game_manager, (x % 1600, 600 + x // 1600 * 16), (16, 16))
+        tile.behaviors = [Solid(tile), Immovable()]
+    for _ in range(500):
+        crate = Crate(game_manager, (rng.uniform(0, 1580), rng.uniform(0, 590)), (20, 20))
+        crate.behaviors = [Solid(crate), Gravity(crate, 300, 400)]
+    game_manager.event_manager.add_event(Solid.register_event())
+    return lambda: game_manager.update(1/60)
+
+
+@case("physics/5000_projectiles_gravities")
+def setup_physics():
+    rng = random.Random(0)
+    game_manager = GameManager(SCREEN_SIZE, [])
+    for _ in range(5000):
+        bullet = Bullet(game_manager, (rng.uniform(0, 1280), rng.uniform(0, 720)), (4, 4))
+        bullet.behaviors = [Projectile(200, rng.uniform(0, math.tau), bullet), Gravity(bullet, 9.81, 50)]
+    return lambda: game_manager.physics.step(1/60)
+
+
+def _build_animations(count:int) -> list[Animation]:
+    frames = [pygame.Surface((16, 16)) for _ in range(8)]
+    timeline = better_pygame.AnimationTimeline.uniform(len(frames), 12)
+    return [Animation(frames, None, timeline=timeline, time_offset=index / count) for index in range(count)]
+
+@case("animation/update_5000")
+def setup_animation_update():
+    animations = _build_animations(5000)
+    def run():
+        for animation in animations:
+            animation.update(1/60)
+    return run
+
+@case("animation/system_5000")
+def setup_animation_system():
+    system = AnimationSystem()
+    for animation in _build_animations(5000):
+        system.add(animation)
+    return lambda: system.update(1/60)
+
+
+@case("effect/draw_50_spinning")
+def setup_effect():
+    screen = pygame.display.get_surface()
+    image = pygame.Surface((64, 64), pygame.SRCALPHA)
+    image.fill((200, 60, 60, 255))
+    effects = []
+    for index in range(50):
+        effect = Effect([{"start_angle":0, "end_angle":720, "start_size":(64, 64), "end_size":(96, 96), "duration":1000}])
+        effect.start(image, (index * 20 % 1200, index * 13 % 640), (64, 64))
+        effects.append(effect)
+    def run():
+        for effect in effects:
+            effect.update(1/60)
+            effect.draw(screen)
+    return run
+
+
+def _register_transition_cases():
+    for name in build_transitions(SCREEN_SIZE, 1):
+        @case(f"transition/{name}")
+        def setup_transition(name=name):
+            screen = pygame.display.get_surface()
+            scene = StripedScene(None, SCREEN_SIZE)
+            # Long enough to never end while timed, timed from the middle where every transition is on screen
+            transition = build_transitions(SCREEN_SIZE, 1000)[name]
+            transition.start(scene, SCREEN_SIZE)
+            transition.update(500)
+            def run():
+                transition.update(1/60)
+                transition.draw(screen)
+            return run
+
+_register_transition_cases()
+
+
+@case("scene_manager/switch")
+def setup_scene_switch():
+    screen = pygame.display.get_surface()
+    scene_manager = better_pygame.SceneManager(SCREEN_SIZE)
+    scenes = {}
+    for key in ("a", "b"):
+        scene = StripedScene(scene_manager, SCREEN_SIZE)
+        scene.set_enter_transition(better_pygame.transition.LinearSlideEnter(0.1, "left", SCREEN_SIZE))
+        scene.set_exit_transition(better_pygame.transition.LinearFadeOut(0.1))
+        scenes[key] = scene
+    scene_manager.init_scenes(scenes)
+    state = {"key":"b"}
+    def run():
+        # One switch played through its transitions
+        scene_manager.change_scene(state["key"])
+        state["key"] = "a" if state["key"] == "b" else "b"
+        for _ in range(8):
+            scene_manager.update(1/60)
+            scene_manager.draw(screen)
+    return run
+
+
+def time_case(setup:Callable[[], Callable[[], None]], frames:int, repeats:int) -> dict:
+    """Median and min over `repeats` runs of the time per frame, in ms"""
+    run = setup()
+    run()
+    runs = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(frames):
+            run()
+        runs.append((time.perf_counter() - start) / frames * 1000)
+    pygame.event.clear()
+    return {"median_ms":statistics.median(runs), "min_ms":min(runs), "frames":frames, "repeats":repeats}
+
+
+def compare(results:dict, baseline:dict, tolerance:float) -> list[str]:
+    """Cases whose median got slower than the baseline by more than `tolerance`, as a ratio"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        ratio = result["median_ms"] / base["median_ms"] if base["median_ms"] else math.inf
+        result["baseline_ratio"] = ratio
+        if ratio > 1 + tolerance:
+            regressions.append(f"{name}: {base['median_ms']:.3f} ms -> {result['median_ms']:.3f} ms ({ratio:.2f}x)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", default="", help="Only run the cases whose name contains this")
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", help="Write the results as json to this path")
+    parser.add_argument("--baseline", help="Compare against the results saved at this path")
+    parser.add_argument("--save-baseline", help="Write the results as the baseline to this path")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slow down against the baseline, 0.25 is 25%%")
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode(SCREEN_SIZE)
+
+    results = {}
+    for name, setup in CASES.items():
+        if args.filter not in name:
+            continue
+        results[name] = time_case(setup, args.frames, args.repeats)
+        print(f"{name:<40} {results[name]['median_ms']:>10.3f} ms")
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+
+    report = {
+        "meta":{"python":platform.python_version(), "pygame":pygame.version.ver, "platform":platform.platform(),
+                "frames":args.frames, "repeats":args.repeats},
+        "results":results,
+    }
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as file:
+                json.dump(report, file, indent=2)
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.tolerance:.0%}:", file=sys.stderr)
+        for regression in regressions:
+            print("  " + regression, file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,12 @@
 from .scene import Scene, SceneManager
-from .animation import Animation, MultiAnimation
+from .animation import Animation, AnimationTimeline, MultiAnimation
 from .transition import Transition
 from ._constants import *
-from .effect import Effect
\ No newline at end of file
+from .effect import Effect, EffectRenderCache
+from .render_queue import RenderQueue
+from .assets import AssetManager, PreloadTask, asset_manager
+from .atlas import TextureAtlas
+from .event_bus import EventBus, ANY_ID, event_bus
+from .game_loop import GameLoop
+from .input_recording import InputRecorder, InputReplay
+from .profiler import Profiler
@@ -1,5 +1,65 @@
+import math
+from typing import Sequence
+
 import pygame
 from ._constants import ON_ANIMATION_END, ON_ANIMATION_LOOP
+from .assets import asset_manager
+from .event_bus import event_bus
+
+class AnimationTimeline:
+    '''Frame durations of an animation, maps a time to a frame in O(1)
+    
+    Usage
+    ---------
+    One timeline can be shared by many Animations, each with their own time offset.\n
+    timeline = AnimationTimeline([0.1, 0.1, 0.3, 0.1])\n
+    timeline = AnimationTimeline.uniform(frame_count=8, framerate=12)
+    '''
+    def __init__(self, durations:Sequence[float]) -> None:
+        '''
+        Parameters
+        ------------
+        durations: Sequence[float]
+            How long each frame is shown, in seconds
+        '''
+        if not durations:
+            raise ValueError("Timeline needs at least one frame")
+        if min(durations) <= 0:
+            raise ValueError(f"Frame durations must be positive, got {list(durations)}")
+        self.durations = tuple(durations)
+        self.frame_count = len(self.durations)
+        self.starts:list[float] = []
+        total = 0
+        for duration in self.durations:
+            self.starts.append(total)
+            total += duration
+        self.total = total
+        
+        # Buckets as long as the shortest frame, a bucket overlaps at most 2 frames so a lookup is one step at most
+        self._bucket_size = min(self.durations)
+        self._buckets:list[int] = []
+        frame = 0
+        for bucket in range(math.ceil(total / self._bucket_size) + 1):
+            bucket_start = bucket * self._bucket_size
+            while frame + 1 < self.frame_count and self.starts[frame + 1] <= bucket_start:
+                frame += 1
+            self._buckets.append(frame)
+    
+    @classmethod
+    def uniform(cls, frame_count:int, framerate:int|float) -> "AnimationTimeline":
+        '''Timeline of `frame_count` frames all shown for 1/`framerate` seconds'''
+        return cls([1/framerate] * frame_count)
+    
+    def frame_at(self, time:float) -> int:
+        '''Index of the frame shown at `time` seconds into one play of the timeline, 0 <= time < total'''
+        bucket = int(time / self._bucket_size)
+        if bucket >= len(self._buckets):
+            return self.frame_count - 1
+        frame = self._buckets[bucket]
+        if frame + 1 < self.frame_count and self.starts[frame + 1] <= time:
+            frame += 1
+        return frame
+
 
 class Animation:
     '''Simple Animation for an Object
@@ -10,51 +70,117 @@ class Animation:
             Called every frame to update the Animation object
         get_frame:
             Get the Surface of the current animation frame
+        seek:
+            Jump to a time of the animation
         
         Events
         ----------
-        Animation loop: type - ON_ANIMATION_LOOP, element - Animation
-        Animation end: type - ON_ANIMATION_END, element - Animation
+        Animation loop: type - ON_ANIMATION_LOOP, element - Animation, object_id:str|None, count:int - loops completed since the last update
+        Animation end: type - ON_ANIMATION_END, element - Animation, object_id:str|None\n
+        Published on better_pygame.event_bus, subscribe to it to get them
     '''
+    # Set while registered in an AnimationSystem, which then holds the time and play state of the animation
+    _system = None
+    _row:int = -1
     
-    def __init__(self, images:list[str|pygame.Surface], framerate:int|float, loop:bool = True, loop_count:int = -1, paused:bool = False, object_id:str|None = None) -> None:
+    def __init__(self, images:list[str|pygame.Surface], framerate:int|float|None, loop:bool = True, loop_count:int = -1, paused:bool = False, object_id:str|None = None,
+                 timeline:AnimationTimeline|None = None, time_offset:float = 0) -> None:
         '''
         Parameters
         ----------------------------------------
         images: `list`[`str`|`Surface`]
-            A list of pygame Surfaces (recommended) or paths to the images
+            A list of pygame Surfaces or paths to the images, paths are loaded through the shared asset manager
         framerate: `int`
-            Number of frames per second
+            Number of frames per second, ignored if a timeline is given
         loop: `bool`
             If the animation loops
         loop_count: `int`
             The number of times the animation loops, -1 for infinite
         id: `str`
             The id of the object, for handling events
+        timeline: `AnimationTimeline`
+            Duration of every frame, can be shared between animations
+        time_offset: `float`
+            Time the animation starts at, in seconds, to desync animations sharing a timeline
         '''
         self.images:list[pygame.Surface] = []
+        self._asset_paths:list[str] = []
         for image in images:
             if isinstance(image, str):
-                self.images.append(pygame.image.load(image))
+                self.images.append(asset_manager.load(image))
+                self._asset_paths.append(image)
             elif isinstance(image, pygame.Surface):
                 self.images.append(image)
             else:
                 raise ValueError("image must be path string or pygame.Surface")
         
-        self.current_frame = 0
-        
-        self.framerate = framerate
-        self.timer = self.frame_delay
+        if timeline is None:
+            if framerate is None:
+                raise ValueError("Animation needs a framerate or a timeline")
+            timeline = AnimationTimeline.uniform(len(self.images), framerate)
+        elif timeline.frame_count != len(self.images):
+            raise ValueError(f"Timeline has {timeline.frame_count} frames, but {len(self.images)} images were given")
+        self.timeline = timeline
+        self.time_offset = time_offset
         
         self.loop = loop
         self.loop_count = loop_count
         self.curr_loop_count = loop_count
         
-        self.paused = paused
+        self._paused = paused
         
         self.object_id = object_id
         
         self._running = True
+        self.seek(0)
+    
+    @property
+    def cycle_time(self) -> float:
+        '''Time since the start of the current loop'''
+        if self._system is None:
+            return self._cycle_time
+        return float(self._system.times[self._row])
+    
+    @cycle_time.setter
+    def cycle_time(self, value:float):
+        if self._system is None:
+            self._cycle_time = value
+        else:
+            self._system.times[self._row] = value
+    
+    @property
+    def paused(self) -> bool:
+        return self._paused
+    
+    @paused.setter
+    def paused(self, value:bool):
+        self._paused = value
+        self._on_play_state_change()
+    
+    @property
+    def playing(self) -> bool:
+        '''If the animation is advanced by update, not paused and not ended'''
+        return self._running and not self._paused
+    
+    def _on_play_state_change(self):
+        if self._system is not None:
+            self._system._on_play_state_change(self)
+    
+    @property
+    def framerate(self):
+        return 1/self.timeline.durations[self.current_frame]
+    
+    @framerate.setter
+    def framerate(self, value:int|float):
+        '''Replace the timeline with a uniform one, keeping the current frame'''
+        frame = self.current_frame
+        system = self._system
+        if system is not None:
+            system.remove(self)
+        self.timeline = AnimationTimeline.uniform(len(self.images), value)
+        self.seek_frame(frame)
+        if system is not None:
+            system.add(self)
     
     @property
     def frame_delay(self):
@@ -64,6 +190,17 @@ class Animation:
     def frame_delay(self, value:float):
         self.framerate = 1/value
     
+    @property
+    def timer(self):
+        '''Time left before the next frame'''
+        return self.timeline.starts[self.current_frame] + self.timeline.durations[self.current_frame] - self.cycle_time
+    
+    @timer.setter
+    def timer(self, value:float):
+        # Seeks to `value` seconds before the end of the current frame, no events are triggered
+        frame_end = self.timeline.starts[self.current_frame] + self.timeline.durations[self.current_frame]
+        self.seek(frame_end - value - self.time_offset)
+    
     def pause(self):
         '''Pause the animation at the current frame'''
         self.paused = True
@@ -72,6 +209,25 @@ class Animation:
         '''Resume paused animation'''
         self.paused = False
     
+    def seek(self, time:float):
+        '''Jump to `time` seconds after the start of the current loop, without triggering events
+        
+        Parameters
+        -------------
+        time: `float`
+            Time in the timeline, wrapped around its total duration'''
+        self.cycle_time = (time + self.time_offset) % self.timeline.total
+        self.current_frame = self.timeline.frame_at(self.cycle_time)
+        if self._system is not None:
+            self._system._on_seek(self)
+    
+    def seek_frame(self, frame:int):
+        '''Jump to the start of a frame, without triggering events'''
+        self.cycle_time = self.timeline.starts[frame]
+        self.current_frame = frame
+        if self._system is not None:
+            self._system._on_seek(self)
+    
     def update(self, dt:float):
         '''Called every loop to update the Animation
         
@@ -79,41 +235,59 @@ class Animation:
         -------------
         dt: `float`
             Time passed since last frame in seconds'''
-        if self.paused or not self._running:
+        # Advanced by its AnimationSystem while registered in one
+        if self._paused or not self._running or self._system is not None:
+            return
+        self._advance(self.cycle_time + dt)
+    
+    def _advance(self, cycle_time:float):
+        '''Internal method to move to `cycle_time` seconds after the start of the current loop, completing loops past the end of the timeline'''
+        timeline = self.timeline
+        if cycle_time < timeline.total:
+            self.cycle_time = cycle_time
+            self.current_frame = timeline.frame_at(cycle_time)
             return
         
-        self.timer -= dt
-        while self.timer <= 0:
-            self.current_frame += 1
-            if self.current_frame >= len(self.images):
-                if self.loop and self.curr_loop_count > 0:
-                    self.current_frame = 0
-                    self.curr_loop_count -= 1
-                    event = pygame.Event(ON_ANIMATION_LOOP, {"element":self, "object_id":self.object_id})
-                    pygame.event.post(event)
-                elif self.loop and self.curr_loop_count == -1:
-                    self.current_frame = 0
-                    event = pygame.Event(ON_ANIMATION_LOOP, {"element":self, "object_id":self.object_id})
-                    pygame.event.post(event)
-                else:
-                    self.current_frame -= 1
-                    self._running = False
-                    event = pygame.Event(ON_ANIMATION_END, {"element":self, "object_id":self.object_id})
-                    pygame.event.post(event)
-                    break
-            self.timer -= self.frame_delay
+        # One or more plays completed, a long hitch loops only once in event count
+        loops = int(cycle_time // timeline.total)
+        if self.loop and self.curr_loop_count == -1:
+            self._post_loop(loops)
+        elif self.loop and self.curr_loop_count >= loops:
+            self.curr_loop_count -= loops
+            self._post_loop(loops)
+        else:
+            if self.loop and self.curr_loop_count > 0:
+                self._post_loop(self.curr_loop_count)
+                self.curr_loop_count = 0
+            self.cycle_time = timeline.starts[-1]
+            self.current_frame = timeline.frame_count - 1
+            self._running = False
+            self._on_play_state_change()
+            event_bus.publish(ON_ANIMATION_END, self, self.object_id)
+            return
+        self.cycle_time = cycle_time - loops * timeline.total
+        self.current_frame = timeline.frame_at(self.cycle_time)
+    
+    def _post_loop(self, count:int):
+        event_bus.publish(ON_ANIMATION_LOOP, self, self.object_id, count=count)
     
     def replay(self):
         '''Replay the animation from beginning'''
         self._running = True
-        self.timer = self.frame_delay
+        self._on_play_state_change()
         self.curr_loop_count = self.loop_count
-        self.current_frame = 0
+        self.seek(0)
         
     
     def get_frame(self):
         '''Return the Surface for the current frame'''
         return self.images[self.current_frame]
+    
+    def release_assets(self):
+        '''Release the images loaded from paths, call when the animation is no longer used'''
+        for path in self._asset_paths:
+            asset_manager.release(path)
+        self._asset_paths = []
 
 
 class MultiAnimation:
@@ -127,6 +301,9 @@ class MultiAnimation:
             Get the Surface of the current animation frame
     '''
 
+    # Set while registered in an AnimationSystem, which then advances the current animation
+    _system = None
+    
     def __init__(self, animations:dict[str, Animation], start:str|None = None) -> None:
         self.animations = animations
         if start and start not in animations.keys():
@@ -134,17 +311,25 @@ class MultiAnimation:
         self.curr_animation_key = start
     
     def add_animation(self, key:str, animation:Animation):
+        previous = self.animations.get(key)
         self.animations[key] = animation
+        if self._system is not None and key == self.curr_animation_key:
+            self._system._on_switch(previous, animation)
     
     def remove_animation(self, key:str):
         if key in self.animations.keys():
-            self.animations.pop(key)
+            animation = self.animations.pop(key)
+            if self._system is not None and key == self.curr_animation_key:
+                self._system._on_switch(animation, None)
         else:
             raise ValueError(f"Key [{key}] not in animations")
     
     def switch_animation(self, key:str):
         if key in self.animations.keys():
+            previous = self.curr_animation
             self.curr_animation_key = key
+            if self._system is not None:
+                self._system._on_switch(previous, self.curr_animation)
         else:
             raise ValueError(f"Key [{key}] not in animations")
     
@@ -0,0 +1,181 @@
+from typing import Callable
+
+import numpy as np
+
+from .animation import Animation, AnimationTimeline, MultiAnimation
+
+class AnimationSystem:
+    '''Advances every registered Animation in one vectorized pass
+
+    Usage
+    ---------
+    system = AnimationSystem()\n
+    system.add(enemy.animation)\n
+    ...\n
+    system.update(dt)  # instead of calling update on each animation\n
+    Draw code keeps reading animation.get_frame(), current_frame is only written for the animations whose frame changed.\n
+    The time of a registered animation lives in the system, animations sharing a timeline are looked up together.\n
+    Registering a MultiAnimation registers its current animation, switch_animation() swaps the registered one,
+    so like MultiAnimation.update() only the animation shown advances.\n
+    Requires numpy, unlike the rest of better_pygame.
+    '''
+    def __init__(self, on_frame_change:Callable[[Animation], None]|None = None, capacity:int = 64) -> None:
+        '''
+        Parameters
+        ------------
+        on_frame_change: Callable[[Animation], None]|None
+            Called after an update for every animation whose frame changed
+        capacity: int
+            Initial number of animations the arrays hold, they grow as needed
+        '''
+        self.on_frame_change = on_frame_change
+        self.animations:list[Animation] = []
+        self.times = np.zeros(capacity)
+        self.frames = np.zeros(capacity, dtype=np.intp)
+        self.totals = np.zeros(capacity)
+        self.playing = np.zeros(capacity, dtype=bool)
+        self.timeline_ids = np.zeros(capacity, dtype=np.intp)
+        self._timelines:dict[int, AnimationTimeline] = {}
+        # Registered MultiAnimations, only their current animation is in `animations`
+        self._multi_animations:set[MultiAnimation] = set()
+        # Rows per timeline, rebuilt after registrations change
+        self._groups:list[tuple[AnimationTimeline, np.ndarray, np.ndarray]]|None = None
+
+    def __len__(self):
+        return len(self.animations)
+
+    def __contains__(self, animation:Animation):
+        return animation._system is self
+
+    def _grow(self):
+        for name in ("times", "frames", "totals", "playing", "timeline_ids"):
+            column = getattr(self, name)
+            new_column = np.zeros(len(column) * 2, dtype=column.dtype)
+            new_column[:len(column)] = column
+            setattr(self, name, new_column)
+
+    def add(self, animation:Animation|MultiAnimation):
+        '''Register an animation, or the current animation of a MultiAnimation, the first one if none is set yet'''
+        if isinstance(animation, MultiAnimation):
+            if animation._system is not None:
+                raise ValueError(f"{animation} is already registered in an animation system")
+            animation._system = self
+            self._multi_animations.add(animation)
+            if not animation.curr_animation_key and animation.animations:
+                # MultiAnimation.update picks the first animation the same way
+                animation.curr_animation_key = next(iter(animation.animations))
+            if animation.curr_animation:
+                self.add(animation.curr_animation)
+            return
+        if animation._system is not None:
+            raise ValueError(f"{animation} is already registered in an animation system")
+        row = len(self.animations)
+        if row == len(self.times):
+            self._grow()
+        self.times[row] = animation.cycle_time
+        self.frames[row] = animation.current_frame
+        self.totals[row] = animation.timeline.total
+        self.playing[row] = animation.playing
+        self.timeline_ids[row] = id(animation.timeline)
+        self._timelines[id(animation.timeline)] = animation.timeline
+        self.animations.append(animation)
+        animation._system = self
+        animation._row = row
+        self._groups = None
+
+    def remove(self, animation:Animation|MultiAnimation):
+        '''Unregister an animation, it keeps its time and can be updated on its own again'''
+        if isinstance(animation, MultiAnimation):
+            if animation._system is not self:
+                raise ValueError(f"{animation} is not registered in this animation system")
+            animation._system = None
+            self._multi_animations.discard(animation)
+            if animation.curr_animation and animation.curr_animation._system is self:
+                self.remove(animation.curr_animation)
+            return
+        if animation._system is not self:
+            raise ValueError(f"{animation} is not registered in this animation system")
+        row = animation._row
+        cycle_time = float(self.times[row])
+        last_row = len(self.animations) - 1
+        last = self.animations.pop()
+        if row != last_row:
+            for column in (self.times, self.frames, self.totals, self.playing, self.timeline_ids):
+                column[row] = column[last_row]
+            self.animations[row] = last
+            last._row = row
+        animation._system = None
+        animation._row = -1
+        animation.cycle_time = cycle_time
+        self._groups = None
+
+    def clear(self):
+        for animation in list(self.animations):
+            self.remove(animation)
+        # The MultiAnimations whose current animation was just removed
+        for multi_animation in self._multi_animations:
+            multi_animation._system = None
+        self._multi_animations.clear()
+
+    def _on_play_state_change(self, animation:Animation):
+        '''Called by a registered animation when it is paused, resumed, ended or replayed'''
+        self.playing[animation._row] = animation.playing
+
+    def _on_switch(self, previous:Animation|None, current:Animation|None):
+        '''Called by a registered MultiAnimation when its current animation changes, the previous one stops at its time'''
+        if previous is current:
+            return
+        if previous is not None and previous._system is self:
+            self.remove(previous)
+        if current is not None and current._system is None:
+            self.add(current)
+
+    def _on_seek(self, animation:Animation):
+        '''Called by a registered animation when it jumps to another time, the frame it compares against is the one it jumped to'''
+        self.frames[animation._row] = animation.current_frame
+
+    def _get_groups(self) -> list[tuple[AnimationTimeline, np.ndarray, np.ndarray]]:
+        '''Internal method to get the frame starts and the rows of every timeline'''
+        if self._groups is None:
+            timeline_ids = self.timeline_ids[:len(self.animations)]
+            self._groups = []
+            for timeline_id in np.unique(timeline_ids):
+                timeline = self._timelines[int(timeline_id)]
+                self._groups.append((timeline, np.asarray(timeline.starts), np.flatnonzero(timeline_ids == timeline_id)))
+            # Drop the timelines no animation uses anymore
+            self._timelines = {id(group[0]):group[0] for group in self._groups}
+        return self._groups
+
+    def update(self, dt:float) -> list[Animation]:
+        '''Advance every playing animation by `dt` seconds
+
+        Returns
+        ---------
+        The animations whose frame changed'''
+        count = len(self.animations)
+        if not count:
+            return []
+        times = self.times[:count]
+        playing = self.playing[:count]
+        np.add(times, dt, out=times, where=playing)
+
+        # Loops and ends post events and change loop counts, done per animation
+        for row in np.flatnonzero(playing & (times >= self.totals[:count])):
+            self.animations[row]._advance(float(times[row]))
+
+        new_frames = np.empty(count, dtype=np.intp)
+        for _, starts, rows in self._get_groups():
+            new_frames[rows] = np.searchsorted(starts, times[rows], side="right") - 1
+        frames = self.frames[:count]
+        changed_rows = np.flatnonzero(new_frames != frames)
+        frames[:] = new_frames
+
+        changed = []
+        for row in changed_rows:
+            animation = self.animations[row]
+            animation.current_frame = int(new_frames[row])
+            changed.append(animation)
+        if self.on_frame_change:
+            for animation in changed:
+                self.on_frame_change(animation)
+        return changed
@@ -0,0 +1,212 @@
+import os
+import threading
+from typing import Callable, Iterable
+
+import pygame
+
+AssetKey = tuple[str, tuple[int, int]|None]
+# A path, or a path and the size the image is scaled to
+AssetSpec = str|tuple[str, tuple[int, int]|None]
+
+class PreloadTask:
+    '''Progress of an AssetManager.preload() running on a background thread
+
+    Usage
+    ---------
+    A loading scene polls `progress` or `finished` every frame, and changes scene once the task is finished.\n
+    Images are decoded on the background thread, their pixel format conversion is done on the main thread when they are first used.
+    '''
+    def __init__(self, total:int) -> None:
+        self.total = total
+        self.done = 0
+        self.errors:list[tuple[str, Exception]] = []
+        self._thread:threading.Thread|None = None
+
+    @property
+    def progress(self) -> float:
+        '''Ratio of loaded assets, 0-1'''
+        return self.done / self.total if self.total else 1
+
+    @property
+    def finished(self) -> bool:
+        return self.done >= self.total
+
+    def wait(self, timeout:float|None = None):
+        '''Block until the preloading is done or `timeout` seconds passed'''
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+class AssetManager:
+    '''Path keyed cache of images shared by everything that loads them
+
+    Usage
+    ---------
+    load() returns the cached image and adds a reference to it, release() removes it, an image is evicted when no reference is left.\n
+    Images are converted to the display pixel format with convert() or convert_alpha() once the display is set.
+    Images loaded before pygame.display.set_mode() are converted by convert_loaded(), call it right after set_mode(),
+    or on their next load() otherwise. Surfaces handed out before the conversion keep their format, load them again to get the converted ones.\n
+    All of better_pygame uses the shared `asset_manager` instance.
+    '''
+    def __init__(self, root:str = "") -> None:
+        '''
+        Parameters
+        ------------
+        root: str
+            Directory the asset paths are relative to, the working directory if empty
+        '''
+        self.root = root
+        self._images:dict[AssetKey, pygame.Surface] = {}
+        self._refcounts:dict[AssetKey, int] = {}
+        self._unconverted:set[AssetKey] = set()
+        self._lock = threading.RLock()
+
+    def __contains__(self, path:str):
+        return (self._normalize(path), None) in self._images
+
+    def __len__(self):
+        return len(self._images)
+
+    def _normalize(self, path:str) -> str:
+        return os.path.normpath(os.path.join(self.root, path))
+
+    @staticmethod
+    def _convert(image:pygame.Surface) -> pygame.Surface:
+        '''Internal method to convert an image to the display pixel format, keeping its per pixel alpha'''
+        if image.get_flags() & pygame.SRCALPHA:
+            return image.convert_alpha()
+        return image.convert()
+
+    def convert_loaded(self):
+        '''Convert the images loaded before the display was set to its pixel format, does nothing without a display'''
+        if not self._unconverted or pygame.display.get_surface() is None:
+            return
+        with self._lock:
+            for key in self._unconverted:
+                if key in self._images:
+                    self._images[key] = AssetManager._convert(self._images[key])
+            self._unconverted.clear()
+
+    def _get_or_load(self, key:AssetKey) -> pygame.Surface:
+        '''Internal method to get an image from the cache, loading it on a miss'''
+        image = self._images.get(key)
+        if image is not None:
+            return image
+        path, size = key
+        original = self._images.get((path, None)) if size is not None else None
+        image = original if original is not None else pygame.image.load(path)
+        if size is not None:
+            image = pygame.transform.scale(image, size)
+        with self._lock:
+            # Another thread may have loaded it meanwhile, keep the first one so every user shares it
+            cached = self._images.get(key)
+            if cached is not None:
+                return cached
+            self._images[key] = image
+            self._refcounts[key] = 0
+            self._unconverted.add(key)
+        return image
+
+    def load(self, path:str, size:tuple[int, int]|None = None) -> pygame.Surface:
+        '''Get an image, loading it if it is not cached, and add a reference to it
+
+        Parameters
+        ------------
+        path: str
+            Path to the image
+        size: tuple[int, int]|None
+            Size to scale the image to, scaled images are cached separately from the original'''
+        key = (self._normalize(path), tuple(size) if size is not None else None)
+        self._get_or_load(key)
+        self.convert_loaded()
+        with self._lock:
+            self._refcounts[key] += 1
+            return self._images[key]
+
+    def release(self, path:str, size:tuple[int, int]|None = None):
+        '''Remove a reference to an image added by load(), the image is evicted when no reference is left'''
+        key = (self._normalize(path), tuple(size) if size is not None else None)
+        with self._lock:
+            refcount = self._refcounts.get(key)
+            if refcount is None:
+                raise KeyError(f"Asset {path} with size {size} is not loaded")
+            if refcount <= 0:
+                # Preloaded but never loaded, or released more times than loaded
+                raise KeyError(f"Asset {path} with size {size} has no reference to release")
+            if refcount > 1:
+                self._refcounts[key] = refcount - 1
+                return
+            self._evict(key)
+
+    def reload(self, path:str):
+        '''Load an image again after its file changed, every cached size of it is replaced and keeps its references.\n
+        Surfaces handed out before keep the old pixels, load() the image again to get the new ones'''
+        path = self._normalize(path)
+        original = pygame.image.load(path)
+        with self._lock:
+            for key in [key for key in self._images if key[0] == path]:
+                size = key[1]
+                self._images[key] = original if size is None else pygame.transform.scale(original, size)
+                self._unconverted.add(key)
+        self.convert_loaded()
+
+    def _evict(self, key:AssetKey):
+        self._images.pop(key, None)
+        self._refcounts.pop(key, None)
+        self._unconverted.discard(key)
+
+    def _key(self, asset:AssetSpec) -> AssetKey:
+        if isinstance(asset, str):
+            return (self._normalize(asset), None)
+        path, size = asset
+        return (self._normalize(path), tuple(size) if size is not None else None)
+
+    def evict_unused(self, assets:Iterable[AssetSpec]|None = None):
+        '''Evict every image without references, such as preloaded images that were never loaded
+
+        Parameters
+        ------------
+        assets: Iterable[AssetSpec]|None
+            Only evict these images, paths or (path, size), if given'''
+        with self._lock:
+            if assets is None:
+                keys = [key for key, refcount in self._refcounts.items() if refcount <= 0]
+            else:
+                keys = [key for key in map(self._key, assets) if self._refcounts.get(key, 1) <= 0]
+            for key in keys:
+                self._evict(key)
+
+    def get_refcount(self, path:str, size:tuple[int, int]|None = None) -> int:
+        return self._refcounts.get((self._normalize(path), tuple(size) if size is not None else None), 0)
+
+    def preload(self, paths:Iterable[AssetSpec], on_progress:Callable[[PreloadTask], None]|None = None) -> PreloadTask:
+        '''Decode images on a background thread without adding references to them
+
+        Parameters
+        ------------
+        paths: Iterable[AssetSpec]
+            Paths of the images to load, or (path, size) to cache them scaled like load(path, size) does
+        on_progress: Callable[[PreloadTask], None]|None
+            Called from the background thread after every image
+
+        Returns
+        ---------
+        PreloadTask to follow the progress with, failed paths are kept in its `errors`'''
+        keys = [self._key(path) for path in paths]
+        task = PreloadTask(len(keys))
+
+        def run():
+            for key in keys:
+                try:
+                    self._get_or_load(key)
+                except Exception as error:
+                    task.errors.append((key[0], error))
+                task.done += 1
+                if on_progress:
+                    on_progress(task)
+
+        task._thread = threading.Thread(target=run, name="AssetManager.preload", daemon=True)
+        task._thread.start()
+        return task
+
+asset_manager = AssetManager()
@@ -0,0 +1,185 @@
+import json
+import os
+from typing import Sequence
+
+import pygame
+
+from .animation import Animation, MultiAnimation
+from .assets import asset_manager
+from .utils import transparent_surface
+
+ATLAS_VERSION = 1
+
+class TextureAtlas:
+    '''All the frames of one or more animations packed into a single sheet
+
+    Usage
+    ---------
+    atlas = TextureAtlas.load_or_build("assets/player_atlas.png", {"idle":[...paths], "run":[...paths]})\n
+    animation = atlas.to_multi_animation(12, start="idle")\n
+    The first run packs the frame files into one sheet and saves it as a png with a json file of the frame rects next to it,
+    later runs only load that png, until a frame file is modified or the paths change.\n
+    Frames are subsurfaces of the sheet, so they share its pixels.\n
+    A loaded sheet holds a reference in the shared asset manager, call release() once the atlas is no longer used.
+    '''
+    def __init__(self, sheet:pygame.Surface, rects:dict[str, list[pygame.Rect]], sources:dict[str, list[str]]|None = None) -> None:
+        '''
+        Parameters
+        ------------
+        sheet: pygame.Surface
+            The packed sheet
+        rects: dict[str, list[pygame.Rect]]
+            The rects of the frames on the sheet, per animation key
+        sources: dict[str, list[str]]|None
+            The paths the frames were loaded from, per animation key, used to know when the saved sheet is outdated
+        '''
+        self.sheet = sheet
+        self.rects = rects
+        self.sources = sources or {}
+        self._frames = {key:[sheet.subsurface(rect) for rect in key_rects] for key, key_rects in rects.items()}
+        # Path of the sheet in the asset manager when it was loaded through it
+        self._sheet_path:str|None = None
+
+    def keys(self):
+        return self._frames.keys()
+
+    def get_frames(self, key:str = "default") -> list[pygame.Surface]:
+        '''The frames of an animation, as subsurfaces of the sheet'''
+        return self._frames[key]
+
+    @staticmethod
+    def pack_rects(sizes:Sequence[tuple[int, int]], max_width:int = 2048, padding:int = 1) -> tuple[list[pygame.Rect], tuple[int, int]]:
+        '''Place rects of the given sizes on shelves, tallest first, returns the rects in the order of `sizes` and the sheet size'''
+        order = sorted(range(len(sizes)), key=lambda index: sizes[index][1], reverse=True)
+        rects:list[pygame.Rect|None] = [None] * len(sizes)
+        x = y = shelf_height = sheet_width = 0
+        for index in order:
+            width, height = sizes[index]
+            if x and x + width > max_width:
+                y += shelf_height + padding
+                x = shelf_height = 0
+            rects[index] = pygame.Rect(x, y, width, height)
+            x += width + padding
+            shelf_height = max(shelf_height, height)
+            sheet_width = max(sheet_width, x - padding)
+        return rects, (sheet_width, y + shelf_height)
+
+    @classmethod
+    def pack(cls, frames:dict[str, Sequence[pygame.Surface]], max_width:int = 2048, padding:int = 1, sources:dict[str, list[str]]|None = None) -> "TextureAtlas":
+        '''Pack frames into a new sheet
+
+        Parameters
+        ------------
+        frames: dict[str, Sequence[pygame.Surface]]
+            The frames of every animation, per animation key
+        max_width: int
+            Maximum width of the sheet, unless a frame is wider
+        padding: int
+            Empty pixels between frames, avoids bleeding when the frames are scaled'''
+        keys = list(frames)
+        surfaces = [surface for key in keys for surface in frames[key]]
+        packed, sheet_size = TextureAtlas.pack_rects([surface.get_size() for surface in surfaces], max_width, padding)
+        sheet = transparent_surface(sheet_size)
+        sheet.blits([(surface, rect) for surface, rect in zip(surfaces, packed)], doreturn=False)
+
+        rects = {}
+        start = 0
+        for key in keys:
+            rects[key] = packed[start:start + len(frames[key])]
+            start += len(frames[key])
+        return cls(sheet, rects, sources)
+
+    @classmethod
+    def from_animation(cls, animation:Animation|MultiAnimation, max_width:int = 2048, padding:int = 1) -> "TextureAtlas":
+        '''Pack the frames of an Animation, under the key "default", or of every animation of a MultiAnimation'''
+        if isinstance(animation, MultiAnimation):
+            frames = {key:anim.images for key, anim in animation.animations.items()}
+        else:
+            frames = {"default":animation.images}
+        return cls.pack(frames, max_width, padding)
+
+    @classmethod
+    def from_paths(cls, sources:dict[str, list[str]], max_width:int = 2048, padding:int = 1) -> "TextureAtlas":
+        '''Pack frames loaded from image files, per animation key'''
+        frames = {key:[pygame.image.load(path) for path in paths] for key, paths in sources.items()}
+        return cls.pack(frames, max_width, padding, sources)
+
+    def to_animation(self, framerate:int|float, key:str = "default", **kwargs) -> Animation:
+        '''Create an Animation from the frames of a key, `kwargs` are passed to Animation'''
+        return Animation(list(self.get_frames(key)), framerate, **kwargs)
+
+    def to_multi_animation(self, framerate:int|float|dict[str, int|float], start:str|None = None, **kwargs) -> MultiAnimation:
+        '''Create a MultiAnimation with an Animation per key, `framerate` can be given per key, `kwargs` are passed to every Animation'''
+        animations = {}
+        for key in self.keys():
+            key_framerate = framerate[key] if isinstance(framerate, dict) else framerate
+            animations[key] = self.to_animation(key_framerate, key, **kwargs)
+        return MultiAnimation(animations, start)
+
+    @staticmethod
+    def get_metadata_path(path:str) -> str:
+        return os.path.splitext(path)[0] + ".json"
+
+    def save(self, path:str):
+        '''Save the sheet as an image at `path` and the frame rects in a json file next to it'''
+        pygame.image.save(self.sheet, path)
+        metadata = {
+            "version":ATLAS_VERSION,
+            "size":list(self.sheet.get_size()),
+            "frames":{key:[list(rect) for rect in rects] for key, rects in self.rects.items()},
+            "sources":self.sources,
+            "source_mtimes":{key:[os.path.getmtime(source) for source in sources] for key, sources in self.sources.items()},
+        }
+        with open(TextureAtlas.get_metadata_path(path), "w") as file:
+            json.dump(metadata, file)
+
+    @staticmethod
+    def _read_metadata(path:str) -> dict|None:
+        '''Internal method to read the metadata of a saved sheet, None if it is missing or from another version'''
+        try:
+            with open(TextureAtlas.get_metadata_path(path)) as file:
+                metadata = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if metadata.get("version") != ATLAS_VERSION or not os.path.exists(path):
+            return None
+        return metadata
+
+    @classmethod
+    def load(cls, path:str) -> "TextureAtlas":
+        '''Load a saved sheet and its frame rects, the sheet is loaded through the shared asset manager'''
+        metadata = TextureAtlas._read_metadata(path)
+        if metadata is None:
+            raise FileNotFoundError(f"No atlas saved at {path}")
+        rects = {key:[pygame.Rect(rect) for rect in key_rects] for key, key_rects in metadata["frames"].items()}
+        atlas = cls(asset_manager.load(path), rects, metadata["sources"])
+        atlas._sheet_path = path
+        return atlas
+
+    def release(self):
+        '''Release the reference to the sheet added by load(), the sheet is evicted from the asset manager when no atlas uses it anymore'''
+        if self._sheet_path is not None:
+            asset_manager.release(self._sheet_path)
+            self._sheet_path = None
+
+    @classmethod
+    def load_or_build(cls, path:str, sources:dict[str, list[str]], max_width:int = 2048, padding:int = 1) -> "TextureAtlas":
+        '''Load the sheet saved at `path`, or pack the frame files of `sources` and save them there
+        if there is no saved sheet, the paths changed or a frame file was modified since it was saved'''
+        sources = {key:list(key_sources) for key, key_sources in sources.items()}
+        metadata = TextureAtlas._read_metadata(path)
+        if metadata is not None and metadata["sources"] == sources:
+            try:
+                mtimes = {key:[os.path.getmtime(source) for source in key_sources] for key, key_sources in sources.items()}
+            except OSError:
+                # Frame files are not shipped, the saved sheet is all there is
+                mtimes = metadata["source_mtimes"]
+            if mtimes == metadata["source_mtimes"]:
+                return cls.load(path)
+
+        atlas = cls.from_paths(sources, max_width, padding)
+        atlas.save(path)
+        if path in asset_manager:
+            # The asset manager still holds the outdated sheet, atlases loaded before keep using it
+            asset_manager.reload(path)
+        return cls.load(path)
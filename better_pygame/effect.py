@@ -1,9 +1,172 @@
+from collections import OrderedDict
 from typing import Sequence, Literal, Any
 import pygame
 
 from .section import Section
 from ._constants import ON_EFFECT_END
+from .event_bus import event_bus
 from .utils import *
+
+def _surface_bytes(surf:pygame.Surface) -> int:
+    return surf.get_pitch() * surf.get_height()
+
+class EffectRenderCache:
+    '''Bounded LRU cache of scaled and rotated effect images
+    
+    Usage
+    ------
+    Rendered images are keyed by (image, original size, quantized size, quantized angle), so effects sharing an image and
+    spinning or pulsing through the same values reuse each other's surfaces instead of transforming every frame.\n
+    The cache is bounded by the memory of its surfaces, a large rotated image costs as much as many small ones.\n
+    Rotation sheets baked with precompute() have their own budget and are never evicted by get(),
+    so one effect baking a sheet does not drop the surfaces of the others.\n
+    All Effects share `default_render_cache` unless given their own.\n
+    The cache holds a reference to the images, an image modified in place should be removed with discard_image().
+    '''
+    def __init__(self, max_bytes:int = 64 * 1024 * 1024, max_sheet_bytes:int = 32 * 1024 * 1024, angle_step:float = 1, size_step:float = 1) -> None:
+        '''
+        Parameters
+        ------------
+        max_bytes: int
+            Maximum memory of the rendered surfaces kept, least recently used surfaces are dropped first, 0 disables caching
+        max_sheet_bytes: int
+            Maximum memory of the rotation sheets baked by precompute(), least recently baked sheets are dropped first
+        angle_step: float
+            Angles are rounded to the nearest multiple of this, in degrees
+        size_step: float
+            Sizes are rounded down to a multiple of this, in pixels
+        '''
+        if angle_step <= 0 or size_step <= 0:
+            raise ValueError(f"Quantization steps must be positive, got angle_step-{angle_step}, size_step-{size_step}")
+        self.max_bytes = max_bytes
+        self.max_sheet_bytes = max_sheet_bytes
+        self.angle_step = angle_step
+        self.size_step = size_step
+        self.hits = 0
+        self.misses = 0
+        self._surfaces:OrderedDict[tuple, pygame.Surface] = OrderedDict()
+        self._bytes = 0
+        # (image, original size, quantized size) -> one surface per angle step
+        self._sheets:OrderedDict[tuple, list[pygame.Surface]] = OrderedDict()
+        self._sheet_bytes = 0
+    
+    def __len__(self):
+        return len(self._surfaces) + sum(len(sheet) for sheet in self._sheets.values())
+    
+    @property
+    def size_bytes(self) -> int:
+        '''Memory of the cached surfaces and rotation sheets'''
+        return self._bytes + self._sheet_bytes
+    
+    @property
+    def hit_rate(self) -> float:
+        '''Ratio of lookups served from the cache, 0 if there was no lookup'''
+        total = self.hits + self.misses
+        return self.hits / total if total else 0
+    
+    def reset_stats(self):
+        '''Reset the hit and miss counters'''
+        self.hits = 0
+        self.misses = 0
+    
+    def clear(self):
+        '''Drop all rendered surfaces and rotation sheets'''
+        self._surfaces.clear()
+        self._bytes = 0
+        self._sheets.clear()
+        self._sheet_bytes = 0
+    
+    def discard_image(self, image:pygame.Surface):
+        '''Drop all rendered surfaces and rotation sheets of an image'''
+        for key in [key for key in self._surfaces if key[0] is image]:
+            self._bytes -= _surface_bytes(self._surfaces.pop(key))
+        for key in [key for key in self._sheets if key[0] is image]:
+            self._sheet_bytes -= sum(_surface_bytes(surf) for surf in self._sheets.pop(key))
+    
+    def quantize_angle(self, angle:float) -> float:
+        return round(angle / self.angle_step) * self.angle_step % 360
+    
+    def quantize_size(self, size:tuple[float, float]) -> tuple[int, int]:
+        step = self.size_step
+        return max(int(size[0] // step * step), 0), max(int(size[1] // step * step), 0)
+    
+    @staticmethod
+    def render(image:pygame.Surface, image_size:tuple[float, float], size:tuple[int, int], angle:float) -> pygame.Surface:
+        '''Render an image cropped to `image_size`, scaled to `size` and rotated by `angle` without caching'''
+        surf = transparent_surface(image_size)
+        surf.blit(image, (0,0))
+        if size != surf.get_size():
+            surf = pygame.transform.scale(surf, size)
+        if angle:
+            surf = pygame.transform.rotate(surf, angle)
+        return surf
+    
+    def get(self, image:pygame.Surface, image_size:tuple[float, float], size:tuple[float, float], angle:float) -> pygame.Surface:
+        '''Get the rendered surface of an image, rendering it on a miss
+        
+        Parameters
+        ------------
+        image: pygame.Surface
+            The image to be rendered
+        image_size: tuple[float, float]
+            The original size of the image, the image is cropped to it
+        size: tuple[float, float]
+            Size to scale the image to, quantized with `size_step`
+        angle: float
+            Angle to rotate the image by, quantized with `angle_step`'''
+        size = self.quantize_size(size)
+        angle = self.quantize_angle(angle)
+        image_size = tuple(image_size)
+        sheet = self._sheets.get((image, image_size, size))
+        if sheet is not None:
+            # Angles wrapped around 360 that are not a multiple of the step are not in the sheet
+            index = round(angle / self.angle_step)
+            if index < len(sheet) and abs(index * self.angle_step - angle) < 1e-9:
+                self.hits += 1
+                return sheet[index]
+        
+        key = (image, image_size, size, angle)
+        surf = self._surfaces.get(key)
+        if surf is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surf
+        
+        self.misses += 1
+        surf = EffectRenderCache.render(image, image_size, size, angle)
+        surf_bytes = _surface_bytes(surf)
+        if surf_bytes <= self.max_bytes:
+            self._surfaces[key] = surf
+            self._bytes += surf_bytes
+            while self._bytes > self.max_bytes:
+                self._bytes -= _surface_bytes(self._surfaces.popitem(last=False)[1])
+        return surf
+    
+    def precompute(self, image:pygame.Surface, image_size:tuple[float, float], size:tuple[float, float]):
+        '''Bake a full rotation sheet of an image at one size, one surface per `angle_step`.\n
+        Kept within `max_sheet_bytes` apart from the surfaces cached by get(), a sheet bigger than it is not baked.'''
+        size = self.quantize_size(size)
+        image_size = tuple(image_size)
+        key = (image, image_size, size)
+        if key in self._sheets:
+            self._sheets.move_to_end(key)
+            return
+        steps = int(round(360 / self.angle_step))
+        sheet = []
+        sheet_bytes = 0
+        for index in range(steps):
+            surf = EffectRenderCache.render(image, image_size, size, self.quantize_angle(index * self.angle_step))
+            sheet_bytes += _surface_bytes(surf)
+            if sheet_bytes > self.max_sheet_bytes:
+                return
+            sheet.append(surf)
+        self._sheets[key] = sheet
+        self._sheet_bytes += sheet_bytes
+        while self._sheet_bytes > self.max_sheet_bytes:
+            self._sheet_bytes -= sum(_surface_bytes(surf) for surf in self._sheets.popitem(last=False)[1])
+
+default_render_cache = EffectRenderCache()
+
 class Effect:
     '''Base of all object Effects
     
@@ -17,14 +180,19 @@ class Effect:
     
     Events
     ---------
-    on effect end - type: ON_EFECT_END, element: Effect, object_id:str|None
+    on effect end - type: ON_EFECT_END, element: Effect, object_id:str|None\n
+    Published on better_pygame.event_bus, subscribe to it to get them
     '''
-    def __init__(self, sections: Sequence[dict | Section] = [], object_id: str | None = None) -> None:
+    def __init__(self, sections: Sequence[dict | Section] = [], object_id: str | None = None, render_cache:EffectRenderCache|None = None, precompute:bool = False) -> None:
         '''
         Parameters
         ------------
         sections: list[dict|Section]
             A list of different sections at different durations of the effect
+        render_cache: EffectRenderCache|None
+            Cache of the rendered images, defaults to the shared `default_render_cache`
+        precompute: bool
+            If a full rotation sheet of the image at its original size is baked into the render cache when the effect starts
         
         sections dict
         --------------
@@ -58,6 +226,11 @@ class Effect:
         self._curr_transparency = 255
         self._curr_transparency_change_rate = None
         
+        self.render_cache = render_cache if render_cache is not None else default_render_cache
+        self.precompute = precompute
+        
+        self._draw_rects = DirtyRectTracker()
+        
         self.object_id = object_id
 
     def start(self, image:pygame.Surface, image_position:tuple[float, float], image_size:tuple[float, float], pygame_gui:bool = False, gui_object:Any = None):
@@ -90,6 +263,9 @@ class Effect:
                 
             self._gui_object = gui_object
         
+        if self.precompute:
+            self.render_cache.precompute(image, image_size, image_size)
+        
         self._on_change_section()
     
     def set_image(self, image:pygame.Surface):
@@ -118,8 +294,7 @@ class Effect:
         if self._is_pygame_gui and self._gui_object_original_visibility:
             self._gui_object.visible = 1
         
-        event = pygame.Event(ON_EFFECT_END, {"element":self, "object_id":self.object_id})
-        pygame.event.post(event)
+        event_bus.publish(ON_EFFECT_END, self, self.object_id)
     
     
     @staticmethod
@@ -220,8 +395,7 @@ class Effect:
                 self._running = False
                 self.scene = None
                 self.curr_section_index -= 1
-                event = pygame.Event(ON_EFFECT_END, {"element":self, "object_id":self.object_id})
-                pygame.event.post(event)
+                event_bus.publish(ON_EFFECT_END, self, self.object_id)
                 if self._is_pygame_gui and self._gui_object_original_visibility:
                     self._gui_object.visible = 1
             else:
@@ -230,16 +404,13 @@ class Effect:
                 self.update(dt - section_time)
 
 
-    def draw(self, screen:pygame.Surface):
-        '''Draw the effect image on the screen'''
+    def _get_draw_surface(self) -> tuple[pygame.Surface, tuple[float, float]]|None:
+        '''Internal method to get the transformed image and where it is drawn, None if nothing is drawn'''
         if not self._running:
-            return
+            return None
         if not self.image:
-            return
-        surf = transparent_surface(self.original_image_size)
-        surf.blit(self.image, (0,0))
-        surf = pygame.transform.scale(surf, self._curr_size)
-        surf = pygame.transform.rotate(surf, self._curr_angle % 360)
+            return None
+        surf = self.render_cache.get(self.image, self.original_image_size, self._curr_size, self._curr_angle % 360)
         
         curr_section = self.sections[self.curr_section_index]
         rotation_origin = curr_section.rotation_origin if isinstance(curr_section, Section) else curr_section.get("rotation_origin")
@@ -254,8 +425,31 @@ class Effect:
             position_shift = tup_round(tup_multiply(tup_subtract((rotated_size[0], rotated_size[1]), self._curr_size), origin_to_size_ratio))
         else:
             position_shift = (0,0)
+        position = tup_add(self.original_image_position, tup_subtract(self._curr_position, position_shift))
+        return surf, position
+    
+    def get_draw_rect(self) -> pygame.Rect|None:
+        '''Get the region the effect is drawn over with its current values, None if nothing is drawn.\n
+        The transformed image is kept in the render cache, the following draw() reuses it.'''
+        drawn = self._get_draw_surface()
+        if drawn is None:
+            return None
+        surf, position = drawn
+        return surf.get_rect(topleft=position)
+    
+    def draw(self, screen:pygame.Surface):
+        '''Draw the effect image on the screen'''
+        drawn = self._get_draw_surface()
+        if drawn is None:
+            return
+        surf, position = drawn
         surf.set_alpha(int(self._curr_transparency))
-        screen.blit(surf, tup_add(self.original_image_position, tup_subtract(self._curr_position, position_shift)))
+        screen.blit(surf, position)
+    
+    def pop_dirty_rects(self) -> list[pygame.Rect]:
+        '''Get the screen regions changed by the effect since the last call, used for dirty rect rendering.\n
+        Called before drawing, returns the region drawn over last frame and the one about to be drawn over.'''
+        return self._draw_rects.pop(self.get_draw_rect())
         
 
 
@@ -0,0 +1,95 @@
+import weakref
+from typing import Any, Callable
+
+import pygame
+
+ANY_ID = object()
+'''object_id to subscribe to the events of every object'''
+
+EventCallback = Callable[[pygame.Event], Any]
+
+class EventBus:
+    '''Synchronous dispatch of the lifecycle events of Animation, Effect, Transition and Section
+
+    Usage
+    ---------
+    event_bus.subscribe(ON_ANIMATION_END, callback, object_id="player_run")\n
+    Callbacks get the same pygame.Event that used to be posted, right when it happens instead of through the SDL event queue on the next frame.\n
+    Subscriptions are keyed by (event type, object_id), so a publish costs two dict lookups, and nothing when no one subscribed.\n
+    With `bridge_to_sdl`, events are also posted with pygame.event.post() for code still reading them from pygame.event.get().\n
+    All of better_pygame publishes on the shared `event_bus` instance.
+    '''
+    def __init__(self, bridge_to_sdl:bool = False) -> None:
+        '''
+        Parameters
+        ------------
+        bridge_to_sdl: bool
+            If events are also posted to the SDL event queue
+        '''
+        self.bridge_to_sdl = bridge_to_sdl
+        self._subscribers:dict[tuple[int, Any], list[EventCallback]] = {}
+
+    def subscribe(self, event_type:int, callback:EventCallback, object_id:Any = ANY_ID) -> EventCallback:
+        '''Call `callback` with every event of `event_type` published by objects with `object_id`, or by any object by default.
+        Returns the callback, to be used as a decorator'''
+        self._subscribers.setdefault((event_type, object_id), []).append(callback)
+        return callback
+
+    def subscribe_weak(self, event_type:int, method:Callable[[pygame.Event], Any], object_id:Any = ANY_ID) -> EventCallback:
+        '''Like subscribe(), for a bound method whose object is only weakly referenced, the subscription is removed once the object is collected.
+        Returns the callback subscribed, to pass to unsubscribe()'''
+        weak_method = weakref.WeakMethod(method)
+        def callback(event:pygame.Event):
+            method = weak_method()
+            if method is None:
+                self.unsubscribe(event_type, callback, object_id)
+                return
+            method(event)
+        return self.subscribe(event_type, callback, object_id)
+    
+    def unsubscribe(self, event_type:int, callback:EventCallback, object_id:Any = ANY_ID):
+        '''Remove a subscription made with subscribe()'''
+        key = (event_type, object_id)
+        callbacks = self._subscribers.get(key)
+        if not callbacks or callback not in callbacks:
+            raise ValueError(f"{callback} is not subscribed to event type {event_type} with object_id {object_id}")
+        # Copied so that a publish iterating the callbacks is not affected
+        callbacks = [subscribed for subscribed in callbacks if subscribed != callback]
+        if callbacks:
+            self._subscribers[key] = callbacks
+        else:
+            del self._subscribers[key]
+
+    def clear(self):
+        '''Remove every subscription'''
+        self._subscribers.clear()
+
+    def publish(self, event_type:int, element:Any, object_id:Any = None, **attributes):
+        '''Dispatch an event to its subscribers, then post it to SDL if bridged
+
+        Parameters
+        ------------
+        event_type: int
+            One of the event types of better_pygame._constants, or a custom one
+        element: Any
+            The object publishing the event
+        object_id: Any
+            The object_id of the element
+        attributes:
+            Extra attributes of the event'''
+        subscribers = self._subscribers
+        by_id = subscribers.get((event_type, object_id))
+        to_all = subscribers.get((event_type, ANY_ID))
+        if by_id is None and to_all is None and not self.bridge_to_sdl:
+            return
+        event = pygame.Event(event_type, {"element":element, "object_id":object_id, **attributes})
+        if by_id is not None:
+            for callback in by_id:
+                callback(event)
+        if to_all is not None:
+            for callback in to_all:
+                callback(event)
+        if self.bridge_to_sdl:
+            pygame.event.post(event)
+
+event_bus = EventBus()
@@ -0,0 +1,156 @@
+import time
+
+import pygame
+
+from .input_recording import InputRecorder, InputReplay
+from .scene import SceneManager
+
+class GameLoop:
+    '''Runs a SceneManager with a fixed update step, decoupled from the draw rate
+
+    Usage
+    ---------
+    GameLoop(scene_manager, screen, update_rate=60).run()\n
+    Every frame the time passed is added to an accumulator, SceneManager.update() is called with the fixed step
+    as many times as fit in it, then the scenes are drawn once.\n
+    Before drawing, `scene_manager.interpolation_alpha` is set to how far the simulation is into the next step, 0-1.
+    Scenes pass it to GameManager.draw(screen, alpha) with a GameManager created with `interpolate=True`,
+    which draws moving objects between their previous and current position for smooth motion at any frame rate.\n
+    After a hitch at most `max_updates_per_frame` steps are run, the rest of the time is dropped so the game slows down instead of
+    spiralling, and objects never move more than one step per update, which keeps them from tunnelling through solids.\n
+    With a `recorder`, the input events and frame time of every frame are logged, replay() runs them again headless and as fast as possible.
+    '''
+    def __init__(self, scene_manager:SceneManager, screen:pygame.Surface, update_rate:int|float = 60, max_updates_per_frame:int = 5, max_fps:int = 0,
+                 recorder:InputRecorder|None = None) -> None:
+        '''
+        Parameters
+        ------------
+        scene_manager: SceneManager
+            The scene manager to update and draw
+        screen: pygame.Surface
+            The display surface
+        update_rate: int|float
+            Number of fixed updates per second
+        max_updates_per_frame: int
+            Maximum number of updates run to catch up in one frame
+        max_fps: int
+            Frame rate cap of the draws, 0 for uncapped or when the display is vsynced
+        recorder: InputRecorder|None
+            Records the input events and frame times of the frames run
+        '''
+        self.scene_manager = scene_manager
+        self.screen = screen
+        self.step = 1 / update_rate
+        self.max_updates_per_frame = max_updates_per_frame
+        self.max_fps = max_fps
+        self.recorder = recorder
+
+        self.running = False
+        self.accumulator = 0.0
+        self.alpha = 0.0
+        self.dropped_time = 0.0
+        self._clock = pygame.time.Clock()
+        self._last_time:float|None = None
+
+    def stop(self):
+        '''Stop the loop after the current frame'''
+        self.running = False
+
+    def handle_event(self, event:pygame.Event):
+        '''Called for every event before the updates of a frame, quits on pygame.QUIT'''
+        if event.type == pygame.QUIT:
+            self.stop()
+        self.scene_manager.handle_event(event)
+
+    def advance(self, frame_time:float) -> int:
+        '''Add `frame_time` seconds to the accumulator and run the fixed updates that fit in it
+
+        Returns
+        ---------
+        The number of updates run'''
+        self.accumulator += frame_time
+        updates = 0
+        while self.accumulator >= self.step and updates < self.max_updates_per_frame:
+            self.scene_manager.update(self.step)
+            self.accumulator -= self.step
+            updates += 1
+        if self.accumulator >= self.step:
+            dropped = self.accumulator - self.accumulator % self.step
+            self.dropped_time += dropped
+            self.accumulator -= dropped
+        self.alpha = self.accumulator / self.step
+        return updates
+
+    def draw(self):
+        '''Draw the scenes with the interpolation alpha and update the display'''
+        self.scene_manager.interpolation_alpha = self.alpha
+        dirty_rects = self.scene_manager.draw(self.screen)
+        profiler = self.scene_manager.profiler
+        if profiler is not None and profiler.overlay:
+            overlay_rect = profiler.draw_overlay(self.screen)
+            if dirty_rects is not None:
+                dirty_rects.append(overlay_rect)
+        if dirty_rects is None:
+            pygame.display.update()
+        else:
+            pygame.display.update(dirty_rects)
+
+    def frame(self):
+        '''Run one frame: handle events, run the fixed updates, draw'''
+        now = time.perf_counter()
+        frame_time = 0 if self._last_time is None else now - self._last_time
+        self._last_time = now
+
+        events = pygame.event.get()
+        if self.recorder is not None:
+            self.recorder.record_frame(frame_time, events)
+        self._run_frame(now, frame_time, events)
+        self._clock.tick(self.max_fps)
+
+    def _run_frame(self, start:float, frame_time:float, events:list[pygame.Event], draw:bool = True):
+        '''Internal method to handle the events, update and draw a frame started at `start`'''
+        for event in events:
+            self.handle_event(event)
+        self.advance(frame_time)
+        if draw:
+            self.draw()
+        profiler = self.scene_manager.profiler
+        if profiler is not None:
+            profiler.add("loop.frame", time.perf_counter() - start)
+            profiler.end_frame()
+
+    def run(self):
+        '''Run frames until stop() is called or the window is closed'''
+        self.running = True
+        self._last_time = None
+        while self.running:
+            self.frame()
+
+    def replay(self, replay:InputReplay, draw:bool = True) -> float:
+        '''Run the frames of a recording as fast as possible, with their recorded events and frame times
+
+        The scene manager has to be in the state it was in when recording started.
+        Events posted by the game itself are not recorded, they are posted again while replaying and handled with the recorded ones.
+
+        Parameters
+        ------------
+        replay: InputReplay
+            The recording to run
+        draw: bool
+            If the frames are drawn, False to only time the simulation
+
+        Returns
+        ---------
+        The time in seconds the replay took'''
+        self.running = True
+        self.accumulator = 0.0
+        self.dropped_time = 0.0
+        replay_start = time.perf_counter()
+        for frame_time, events in replay:
+            if not self.running:
+                break
+            now = time.perf_counter()
+            posted = [event for event in pygame.event.get() if event.type >= pygame.USEREVENT]
+            self._run_frame(now, frame_time, events + posted, draw)
+        self.running = False
+        return time.perf_counter() - replay_start
@@ -0,0 +1,136 @@
+import marshal
+import struct
+from typing import BinaryIO, Iterator, Sequence
+
+import pygame
+
+_MAGIC = b"BPIR"
+_VERSION = 1
+_HEADER = struct.Struct("<4sH")
+# Frame time, number of events
+_FRAME = struct.Struct("<dH")
+# Event type, size of the marshalled attributes
+_EVENT = struct.Struct("<iI")
+
+def _is_input_event(event:pygame.Event) -> bool:
+    '''Events posted by code (pygame_gui, timers, EventBus bridged events) are posted again during a replay, only SDL events are recorded'''
+    return event.type < pygame.USEREVENT
+
+def _encode_attributes(attributes:dict) -> bytes:
+    '''Internal method to marshal the attributes of an event, dropping the ones that are not plain data like `window`'''
+    encodable = {}
+    for name, value in attributes.items():
+        try:
+            marshal.dumps(value)
+        except ValueError:
+            continue
+        encodable[name] = value
+    return marshal.dumps(encodable)
+
+
+class InputRecorder:
+    '''Writes the input events and frame times of a game to a binary log, to be replayed with InputReplay
+
+    Usage
+    ---------
+    with InputRecorder("session.bpir") as recorder:\n
+        GameLoop(scene_manager, screen, recorder=recorder).run()\n
+    Every frame is written as its frame time followed by its events, each event being its type and its attributes
+    marshalled, attributes that are not plain data (window) are dropped.\n
+    Frames are written as they are recorded, a crash keeps the frames before it.
+    '''
+    def __init__(self, path:str) -> None:
+        '''
+        Parameters
+        ------------
+        path: str
+            Path of the log, overwritten if it exists
+        '''
+        self.path = path
+        self.frame_count = 0
+        self._file:BinaryIO|None = open(path, "wb")
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION))
+
+    def __enter__(self) -> "InputRecorder":
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def record_frame(self, frame_time:float, events:Sequence[pygame.Event]):
+        '''Write a frame, `frame_time` is the time in seconds since the previous frame and `events` the events it handled'''
+        if self._file is None:
+            raise ValueError(f"InputRecorder of {self.path} is closed")
+        input_events = [event for event in events if _is_input_event(event)]
+        chunks = [_FRAME.pack(frame_time, len(input_events))]
+        for event in input_events:
+            attributes = _encode_attributes(event.dict)
+            chunks.append(_EVENT.pack(event.type, len(attributes)))
+            chunks.append(attributes)
+        self._file.write(b"".join(chunks))
+        self.frame_count += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class InputReplay:
+    '''The frames of a log written by InputRecorder
+
+    Usage
+    ---------
+    replay = InputReplay("session.bpir")\n
+    GameLoop(scene_manager, screen).replay(replay)\n
+    Iterating gives (frame_time, events) for every recorded frame, the events being rebuilt pygame.Event.\n
+    Only input is recorded, the game has to start from the same state for the replay to match: same scenes, same random seeds.
+    '''
+    def __init__(self, path:str) -> None:
+        '''
+        Parameters
+        ------------
+        path: str
+            Path of a log written by InputRecorder
+        '''
+        self.path = path
+        self.frames:list[tuple[float, list[pygame.Event]]] = []
+        with open(path, "rb") as file:
+            data = file.read()
+        magic, version = _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not an input recording")
+        if version != _VERSION:
+            raise ValueError(f"{path} is an input recording of version {version}, version {_VERSION} is supported")
+
+        offset = _HEADER.size
+        # A frame cut short by a crash while recording is dropped
+        while offset + _FRAME.size <= len(data):
+            frame_time, event_count = _FRAME.unpack_from(data, offset)
+            frame_offset = offset + _FRAME.size
+            events = []
+            for _ in range(event_count):
+                if frame_offset + _EVENT.size > len(data):
+                    break
+                event_type, size = _EVENT.unpack_from(data, frame_offset)
+                frame_offset += _EVENT.size
+                if frame_offset + size > len(data):
+                    break
+                events.append(pygame.Event(event_type, marshal.loads(data[frame_offset:frame_offset + size])))
+                frame_offset += size
+            else:
+                self.frames.append((frame_time, events))
+                offset = frame_offset
+                continue
+            break
+
+    def __len__(self):
+        return len(self.frames)
+
+    def __iter__(self) -> Iterator[tuple[float, list[pygame.Event]]]:
+        return iter(self.frames)
+
+    @property
+    def total_time(self) -> float:
+        '''Recorded time in seconds'''
+        return sum(frame_time for frame_time, _ in self.frames)
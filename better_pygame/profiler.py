@@ -0,0 +1,129 @@
+import csv
+import json
+import time
+from typing import Any, Callable
+
+import pygame
+
+class Profiler:
+    '''Frame time of named phases over the last frames
+
+    Usage
+    ---------
+    profiler = Profiler()\n
+    scene_manager.profiler = profiler  # times handle_event, update and draw\n
+    game_manager.profiler = profiler  # times physics, the spatial index and every event\n
+    GameLoop ends the frames of the profiler of its scene manager, call end_frame() after every frame otherwise.\n
+    Time spent in a phase is summed over a frame, a phase timed inside another is also counted in it.\n
+    Hooks check `profiler is None` before anything else, there is no cost when no profiler is set.
+    '''
+    def __init__(self, frames:int = 300, overlay:bool = False) -> None:
+        '''
+        Parameters
+        ------------
+        frames: int
+            Number of frames kept, older frames are overwritten
+        overlay: bool
+            If GameLoop draws the overlay of the profiler every frame
+        '''
+        self.frames = frames
+        self.overlay = overlay
+        self._samples:dict[str, list[float]] = {}
+        self._current:dict[str, float] = {}
+        self._index = 0
+        self.frame_count = 0
+        self._font:pygame.font.Font|None = None
+
+    def add(self, phase:str, seconds:float):
+        '''Add time spent in a phase to the current frame'''
+        self._current[phase] = self._current.get(phase, 0) + seconds
+
+    def time(self, phase:str, func:Callable, *args) -> Any:
+        '''Call `func` with `args` and add the time it took to a phase, returns what `func` returned'''
+        start = time.perf_counter()
+        result = func(*args)
+        self.add(phase, time.perf_counter() - start)
+        return result
+
+    def end_frame(self):
+        '''Store the phase times of the current frame in the ring buffer and start a new frame'''
+        index = self._index
+        for phase, samples in self._samples.items():
+            samples[index] = self._current.pop(phase, 0)
+        for phase, seconds in self._current.items():
+            # New phase, the frames before it was first timed count as 0
+            samples = self._samples[phase] = [0.0] * self.frames
+            samples[index] = seconds
+        self._current = {}
+        self._index = (index + 1) % self.frames
+        self.frame_count += 1
+
+    def reset(self):
+        self._samples.clear()
+        self._current.clear()
+        self._index = 0
+        self.frame_count = 0
+
+    @property
+    def phases(self) -> list[str]:
+        return list(self._samples)
+
+    def get_samples(self, phase:str) -> list[float]:
+        '''Times of a phase in seconds over the kept frames, oldest first'''
+        samples = self._samples[phase]
+        if self.frame_count < self.frames:
+            return samples[:self.frame_count]
+        return samples[self._index:] + samples[:self._index]
+
+    def get_stats(self, phase:str) -> dict[str, float]:
+        '''Mean, p50, p95, p99 and max of a phase in milliseconds'''
+        samples = sorted(self.get_samples(phase))
+        if not samples:
+            return {"mean":0, "p50":0, "p95":0, "p99":0, "max":0}
+        # Nearest rank percentiles
+        percentile = lambda ratio: samples[min(len(samples) - 1, int(ratio * len(samples)))] * 1000
+        return {
+            "mean":sum(samples) / len(samples) * 1000,
+            "p50":percentile(0.5),
+            "p95":percentile(0.95),
+            "p99":percentile(0.99),
+            "max":samples[-1] * 1000
+        }
+
+    def get_all_stats(self) -> dict[str, dict[str, float]]:
+        return {phase:self.get_stats(phase) for phase in self._samples}
+
+    def dump_json(self, path:str):
+        '''Write the stats and the samples in milliseconds of every phase to a json file'''
+        data = {
+            "frames":min(self.frame_count, self.frames),
+            "stats":self.get_all_stats(),
+            "samples":{phase:[sample * 1000 for sample in self.get_samples(phase)] for phase in self._samples}
+        }
+        with open(path, "w") as file:
+            json.dump(data, file, indent=2)
+
+    def dump_csv(self, path:str):
+        '''Write the samples in milliseconds to a csv file, a row per frame and a column per phase'''
+        phases = self.phases
+        columns = [self.get_samples(phase) for phase in phases]
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["frame_index"] + phases)
+            for frame, row in enumerate(zip(*columns)):
+                writer.writerow([frame] + [f"{sample * 1000:.4f}" for sample in row])
+
+    def draw_overlay(self, screen:pygame.Surface, position:tuple[int, int] = (0, 0)) -> pygame.Rect:
+        '''Draw the p50/p95/p99 of every phase on the screen, returns the rect drawn over'''
+        if self._font is None:
+            self._font = pygame.font.Font(None, 18)
+        lines = [f"{'phase':<24}{'p50':>8}{'p95':>8}{'p99':>8}"]
+        for phase, stats in self.get_all_stats().items():
+            lines.append(f"{phase[:24]:<24}{stats['p50']:>8.2f}{stats['p95']:>8.2f}{stats['p99']:>8.2f}")
+        surfaces = [self._font.render(line, True, (255, 255, 255)) for line in lines]
+        line_height = self._font.get_linesize()
+        rect = pygame.Rect(position, (max(surface.get_width() for surface in surfaces) + 8, line_height * len(surfaces) + 8))
+        # Opaque, the overlay is redrawn over itself in dirty rect mode
+        screen.fill((0, 0, 0), rect)
+        screen.blits([(surface, (rect.x + 4, rect.y + 4 + index * line_height)) for index, surface in enumerate(surfaces)], doreturn=False)
+        return rect
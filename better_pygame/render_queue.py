@@ -0,0 +1,106 @@
+from typing import Callable
+
+import pygame
+
+class RenderQueue:
+    '''Batches the draws of a frame into one Surface.blits() call per layer
+
+    Usage
+    ---------
+    Objects submit their images with submit() during draw, or blit() so that code written for a pygame.Surface can draw on the queue,
+    then flush() draws every layer from the lowest to the highest onto the screen and empties the queue.\n
+    Draws of a layer are done in submission order, so overlapping images in the same layer stack the same way as with separate blits.\n
+    Blend modes are passed to blits() per draw, a draw with an alpha sets the surface alpha just for that draw.\n
+    Drawing code that needs the real screen is queued with submit_draw(), it is called with the screen during flush() in its place in the layer.
+    '''
+    def __init__(self) -> None:
+        self._layers:dict[int, list[tuple]] = {}
+        # Layers with alpha draws or queued draw calls, drawn in runs between them instead of one blits() call
+        self._unbatched_layers:set[int] = set()
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._layers.values())
+
+    def submit(self, surface:pygame.Surface, position:tuple[float, float], layer:int = 0, blend:int = 0, alpha:int|None = None, area:pygame.Rect|None = None):
+        '''Queue a draw
+
+        Parameters
+        ------------
+        surface: pygame.Surface
+            The image to draw
+        position: tuple[float, float]
+            Top left position on the screen
+        layer: int
+            Lower layers are drawn first
+        blend: int
+            Blend mode of the draw, special_flags of Surface.blit()
+        alpha: int|None
+            Transparency of this draw 0-255, None keeps the surface alpha
+        area: pygame.Rect|None
+            Portion of the surface to draw, the whole surface if None'''
+        try:
+            entries = self._layers[layer]
+        except KeyError:
+            entries = self._layers[layer] = []
+        if alpha is None:
+            entries.append((surface, position, area, blend))
+        else:
+            entries.append((surface, position, area, blend, alpha))
+            self._unbatched_layers.add(layer)
+
+    def submit_draw(self, draw:Callable[[pygame.Surface], None], layer:int = 0):
+        '''Queue a call drawing directly on the screen, made during flush() after the draws submitted before it in the same layer
+
+        Parameters
+        ------------
+        draw: Callable[[pygame.Surface], None]
+            Called with the screen the queue is flushed onto
+        layer: int
+            Lower layers are drawn first'''
+        try:
+            entries = self._layers[layer]
+        except KeyError:
+            entries = self._layers[layer] = []
+        entries.append((draw,))
+        self._unbatched_layers.add(layer)
+
+    def blit(self, source:pygame.Surface, dest:tuple[float, float], area:pygame.Rect|None = None, special_flags:int = 0, layer:int = 0):
+        '''Same as submit(), with the argument order of Surface.blit()'''
+        self.submit(source, dest, layer, special_flags, None, area)
+
+    def clear(self):
+        '''Drop all queued draws'''
+        self._layers.clear()
+        self._unbatched_layers.clear()
+
+    def flush(self, screen:pygame.Surface):
+        '''Draw every queued draw onto the screen, layer by layer, and empty the queue'''
+        for layer in sorted(self._layers):
+            entries = self._layers[layer]
+            if layer not in self._unbatched_layers:
+                screen.blits(entries, doreturn=False)
+                continue
+            RenderQueue._flush_unbatched(screen, entries)
+        self.clear()
+
+    @staticmethod
+    def _flush_unbatched(screen:pygame.Surface, entries:list[tuple]):
+        '''Internal method to draw a layer with alpha draws or draw calls, runs of plain draws are still batched'''
+        batch = []
+        for entry in entries:
+            if len(entry) == 4:
+                batch.append(entry)
+                continue
+            if batch:
+                screen.blits(batch, doreturn=False)
+                batch = []
+            if len(entry) == 1:
+                entry[0](screen)
+                continue
+            surface, position, area, blend, alpha = entry
+            prev_alpha = surface.get_alpha()
+            surface.set_alpha(alpha)
+            screen.blit(surface, position, area, blend)
+            surface.set_alpha(prev_alpha)
+        if batch:
+            screen.blits(batch, doreturn=False)
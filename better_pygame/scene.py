@@ -1,10 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import TypeVar, Dict
+from typing import Callable, TypeVar, Dict
 
 import pygame
 
 from ._constants import ON_TRANSITION_END
+from .assets import AssetSpec, PreloadTask, asset_manager
+from .event_bus import event_bus
+from .profiler import Profiler
 from .transition import Transition
+from .utils import merge_rects
 
 class Scene(ABC):
     '''Abstract base class for Scene
@@ -32,10 +36,28 @@ class Scene(ABC):
         
         def draw(self, screen):
             ...
+    
+    Dirty Rects
+    --------------
+    When the SceneManager runs in dirty rect mode, a Scene that calls set_dirty_rect_tracking(True) reports the regions it changed
+    with mark_dirty(), only those are cleared, redrawn and updated on the display. Scenes not tracking are redrawn fully every frame.
+    Effects drawn by the scene are registered with track_effect() so the regions they draw over are reported too.
+    
+    Lazy Scenes
+    --------------
+    A scene class given to SceneManager.init_scenes() instead of an instance is built on its first use.
+    List the images it loads in `assets`, as paths or (path, size) like it passes them to asset_manager.load(),
+    so SceneManager.preload_scene() can decode and scale them in the background beforehand,
+    and release them in unload(), called when the SceneManager unloads the scene to keep memory capped.
         '''
+    _track_dirty_rects = False
+    _dirty_full = True
+    assets:tuple[AssetSpec, ...] = ()
     
     def __init__(self, scene_manager) -> None:
         self.scene_manager = scene_manager
+        self._dirty_rects:list[pygame.Rect] = []
+        self._tracked_effects:list = []
     @abstractmethod
     def handle_event(self, event:pygame.Event):...
     
@@ -53,9 +75,45 @@ class Scene(ABC):
     
     def set_transition_require_update(self, transition_require_update:bool):
         self._transition_require_update = transition_require_update
+    
+    def set_dirty_rect_tracking(self, track_dirty_rects:bool):
+        '''Set if the scene reports the regions it changed with mark_dirty() instead of being redrawn fully every frame'''
+        self._track_dirty_rects = track_dirty_rects
+        self.mark_dirty()
+    
+    def mark_dirty(self, rect:pygame.Rect|tuple|None = None):
+        '''Mark a region of the scene as changed since the last draw, the whole scene if `rect` is None'''
+        if rect is None:
+            self._dirty_full = True
+            return
+        self._dirty_rects.append(pygame.Rect(rect))
+    
+    def track_effect(self, effect):
+        '''Report the regions an Effect drawn by the scene changes as dirty'''
+        if effect not in self._tracked_effects:
+            self._tracked_effects.append(effect)
+    
+    def untrack_effect(self, effect):
+        self._tracked_effects.remove(effect)
+    
+    def pop_dirty_rects(self) -> list[pygame.Rect]|None:
+        '''Get and reset the regions marked dirty since the last call, None if the whole scene has to be redrawn'''
+        rects = self._dirty_rects
+        self._dirty_rects = []
+        # Popped even when redrawing fully, so the effects do not report stale regions later
+        for effect in self._tracked_effects:
+            rects.extend(effect.pop_dirty_rects())
+        if not self._track_dirty_rects or self._dirty_full:
+            self._dirty_full = False
+            return None
+        return rects
+    
+    def unload(self):
+        '''Called when the SceneManager unloads the scene, release the assets it loaded here'''
 
 S = TypeVar("S", bound=Scene)
 SceneInstanceDict = Dict[str, S]
+SceneFactory = Callable[["SceneManager"], Scene]
 class SceneManager:
     '''Manager of Scenes
 
@@ -75,8 +133,12 @@ class SceneManager:
 
         scene_manager.update(dt)\n
         scene_manager.draw(screen)\n
+    Scenes can also be given as factories, such as the Scene class itself, called with the scene manager to build the scene on its first use.\n
+    preload_scene() decodes the `assets` of a scene on a background thread and builds it on the main thread once they are loaded.\n
+    With `max_loaded_scenes`, the least recently used scenes built from factories are unloaded, and built again when changed to.
     '''
-    def __init__(self, screen_size:tuple[int, int], handle_event_during_transition:bool = False) -> None:
+    def __init__(self, screen_size:tuple[int, int], handle_event_during_transition:bool = False, dirty_rects:bool = False,
+                 max_loaded_scenes:int|None = None) -> None:
         '''
         Initialize Scene Manager. Be sure to call SceneManager.init_scenes() after initializing all the scenes.
         
@@ -86,27 +148,58 @@ class SceneManager:
             Defaulted screen size
         handle_event_during_transition: bool
             If the scene manager will pass events onto the current scene if a transition is currently running
+        dirty_rects: bool
+            If only the regions reported changed by the scenes, transitions and effects are cleared and redrawn,
+            draw() then returns the rects to pass to pygame.display.update()
+        max_loaded_scenes: int|None
+            Maximum number of scenes built from factories kept loaded, None for no limit.
+            The current scene and the scenes in a transition are never unloaded
         '''
+        if max_loaded_scenes is not None and max_loaded_scenes < 1:
+            raise ValueError(f"max_loaded_scenes must be at least 1, got {max_loaded_scenes}")
+        # Loaded scenes, the scenes given as factories are added once built
         self.scenes:SceneInstanceDict = {}
+        self._factories:dict[str, SceneFactory] = {}
+        # Keys of the loaded scenes built from factories, least recently used first
+        self._last_used:dict[str, None] = {}
+        self._preloading:dict[str, PreloadTask] = {}
+        self.max_loaded_scenes = max_loaded_scenes
+        self._scene_limit_pending = False
         self.screen_size = screen_size
         
         self.prev_scene:Scene|None = None
         self.handle_event_during_transition = handle_event_during_transition
         
         self._transitioning:bool = False
-        self._running_transitions:list[Transition] = []
+        # Ordered like a list, with O(1) membership for the transition end callback
+        self._running_transitions:dict[Transition, None] = {}
+        # Weak, so that scene managers no longer used are not kept alive by the shared bus
+        self._transition_end_callback = event_bus.subscribe_weak(ON_TRANSITION_END, self._on_transition_end)
+        
+        self.dirty_rects = dirty_rects
+        self._full_redraw = True
+        # Set by GameLoop before drawing, how far the simulation is into the next fixed update, 0-1
+        self.interpolation_alpha = 0.0
+        # Times handle_event, update and draw when set
+        self.profiler:Profiler|None = None
     
-    def init_scenes(self, scenes:dict[str, S], default_scene:str|None = None):
+    def init_scenes(self, scenes:dict[str, S|SceneFactory], default_scene:str|None = None):
         '''Add all scenes provided to SceneManager
         
         Parameters
         -----------
-        scenes: `dict`[`str`:`Scene`]
-            All the scenes to be added, where the key is the name of the scene
+        scenes: `dict`[`str`:`Scene`|`SceneFactory`]
+            All the scenes to be added, where the key is the name of the scene.
+            A factory, such as a Scene class, is called with the scene manager to build its scene on first use
         default_scene: `str`
             The key to the first scene to be displayed, if not provided, it defaults to the first scene provided in dictionary
         '''
-        self.scenes = scenes
+        self.scenes = {}
+        self._factories = {}
+        self._last_used = {}
+        self._preloading = {}
+        for key, scene in scenes.items():
+            self.add_scene(key, scene)
         if not default_scene:
             keys = list(scenes.keys())
             if len(keys) > 0:
@@ -121,28 +214,123 @@ class SceneManager:
             self.curr_scene = None
             print("Scene Manager missing default scene.")
         else:
-            self.curr_scene = scenes[self.default_scene]
+            self.curr_scene = self.get_scene(self.default_scene)
+        self._full_redraw = True
     
-    def add_scene(self, key:str, scene:S, exist_ok:bool = False):
+    def add_scene(self, key:str, scene:S|SceneFactory, exist_ok:bool = False):
         """Add a scene to the manager
         
         Parameters
         -------------
         key: `str`
             Name of the scene
-        scene: `Scene`
-            Da Scene
+        scene: `Scene`|`SceneFactory`
+            Da Scene, or a factory building it on first use
         exist_ok: `bool`
             If `True`, the new scene replaces the current scene with the provided key.\n
             If `False`, raises ValueError if a scene with the provided key already exists."""
-        if not exist_ok and key in self.scenes.keys():
+        if not exist_ok and self.has_scene(key):
             raise ValueError(f"Scene with key {key} already exists")
+        self.scenes.pop(key, None)
+        self._factories.pop(key, None)
+        self._last_used.pop(key, None)
+        self._preloading.pop(key, None)
+        if isinstance(scene, Scene):
+            self.scenes[key] = scene
+        else:
+            self._factories[key] = scene
+    
+    def has_scene(self, key:str) -> bool:
+        '''If a scene was added with this key, loaded or not'''
+        return key in self.scenes or key in self._factories
+    
+    def is_loaded(self, key:str) -> bool:
+        return key in self.scenes
+    
+    def get_scene(self, key:str) -> Scene:
+        '''Get a scene, building it if it was given as a factory and is not loaded'''
+        scene = self.scenes.get(key)
+        if scene is None:
+            if key not in self._factories:
+                raise ValueError(f"Scene {key} not in scenes")
+            scene = self._build_scene(key)
+        if key in self._last_used:
+            # Most recently used last
+            del self._last_used[key]
+            self._last_used[key] = None
+        return scene
+    
+    def _build_scene(self, key:str) -> Scene:
+        '''Internal method to build a scene from its factory, waiting for its preloading if it is still running'''
+        task = self._preloading.pop(key, None)
+        if task is not None:
+            task.wait()
+        scene = self._factories[key](self)
         self.scenes[key] = scene
+        self._last_used[key] = None
+        return scene
+    
+    def preload_scene(self, key:str) -> PreloadTask|None:
+        '''Decode the `assets` of a scene given as a factory on a background thread, the scene is then built on the main thread
+        during the first update() after they are loaded, so changing to it does not hitch.
+        
+        Returns
+        ---------
+        The PreloadTask of the assets, None if the scene is already loaded'''
+        if key in self.scenes:
+            return None
+        if key not in self._factories:
+            raise ValueError(f"Scene {key} not in scenes")
+        task = self._preloading.get(key)
+        if task is None:
+            task = asset_manager.preload(getattr(self._factories[key], "assets", ()))
+            self._preloading[key] = task
+        return task
+    
+    def _finalize_preloads(self):
+        '''Internal method to build a scene whose assets finished preloading, one per update to spread the cost'''
+        for key, task in self._preloading.items():
+            if task.finished:
+                self._build_scene(key)
+                self._enforce_scene_limit(keep=key)
+                return
+    
+    def _can_unload(self, scene:Scene) -> bool:
+        return scene is not self.curr_scene and scene not in self.get_transitioning_scenes()
+    
+    def unload_scene(self, key:str):
+        '''Unload a scene given as a factory, it is built again on its next use
+        
+        Raises ValueError if the scene can not be built again, or is shown'''
+        if key not in self._factories:
+            raise ValueError(f"Scene {key} was not given as a factory, it can not be unloaded")
+        scene = self.scenes.get(key)
+        if scene is None:
+            return
+        if not self._can_unload(scene):
+            raise ValueError(f"Scene {key} is shown, it can not be unloaded")
+        if scene is self.prev_scene:
+            self.prev_scene = None
+        del self.scenes[key]
+        del self._last_used[key]
+        scene.unload()
+        # Preloaded images the scene never loaded itself have no reference to release
+        asset_manager.evict_unused(getattr(self._factories[key], "assets", ()))
+    
+    def _enforce_scene_limit(self, keep:str|None = None):
+        '''Internal method to unload the least recently used scenes over max_loaded_scenes'''
+        if self.max_loaded_scenes is None:
+            return
+        for key in list(self._last_used):
+            if len(self._last_used) <= self.max_loaded_scenes:
+                return
+            if key != keep and self._can_unload(self.scenes[key]):
+                self.unload_scene(key)
     
     def start_transition(self, transition:Transition, scene:Scene):
         transition.start(scene, self.screen_size)
         self._transitioning = True
-        self._running_transitions.append(transition)
+        self._running_transitions[transition] = None
     
     def change_scene(self, scene_key:str):
         '''Change to another scene, runs exit and enter transitions
@@ -151,7 +339,7 @@ class SceneManager:
         -----------
         scene_key: str
             The key of the scene to switch to'''
-        if scene_key not in self.scenes.keys():
+        if not self.has_scene(scene_key):
             raise ValueError(f"Scene {scene_key} not in scenes")
         self.prev_scene = self.curr_scene
         if self.prev_scene:
@@ -162,22 +350,43 @@ class SceneManager:
             else:
                 self.start_transition(exit_transition, self.prev_scene)
         
-        self.curr_scene = self.scenes[scene_key]
+        self.curr_scene = self.get_scene(scene_key)
+        self._full_redraw = True
         try:
             enter_transition:Transition = self.curr_scene.__getattribute__("_enter_transition")
         except:
             pass
         else:
             self.start_transition(enter_transition, self.curr_scene)
+        self._enforce_scene_limit()
+    
     
+    def close(self):
+        '''Stop listening to the event bus, the scene manager can not run transitions afterwards'''
+        if self._transition_end_callback is not None:
+            event_bus.unsubscribe(ON_TRANSITION_END, self._transition_end_callback)
+            self._transition_end_callback = None
+    
+    def _on_transition_end(self, event:pygame.Event):
+        '''Called by the event bus when any transition ends, the ones started by other scene managers are ignored'''
+        if event.element not in self._running_transitions:
+            return
+        del self._running_transitions[event.element]
+        # The last frame of the transition has to be cleared
+        self._full_redraw = True
+        if len(self._running_transitions) == 0:
+            self._transitioning = False
+        # The scene of the transition may be unloadable now, checked after the update so it is not unloaded mid loop
+        self._scene_limit_pending = True
     
     def handle_event(self, event:pygame.Event):
-        if event.type == ON_TRANSITION_END:
-            if event.element in self._running_transitions:
-                self._running_transitions.remove(event.element)
-                if len(self._running_transitions) == 0:
-                    self._transitioning = False
-        
+        profiler = self.profiler
+        if profiler is None:
+            self._handle_event(event)
+        else:
+            profiler.time("scene.handle_event", self._handle_event, event)
+    
+    def _handle_event(self, event:pygame.Event):
         if not self.curr_scene:
             return
         if self._transitioning and not self.handle_event_during_transition:
@@ -193,18 +402,29 @@ class SceneManager:
             return 1
     
     def _sort_running_transitions(self):
-        self._running_transitions.sort(key=lambda transition: self._transition_get_priority(transition))
+        transitions = sorted(self._running_transitions, key=lambda transition: self._transition_get_priority(transition))
+        self._running_transitions = dict.fromkeys(transitions)
     
     def get_transitioning_scenes(self):
         return [t.scene for t in self._running_transitions if t.scene]
     
     def update(self, dt:float):
+        profiler = self.profiler
+        if profiler is None:
+            self._update(dt)
+        else:
+            profiler.time("scene.update", self._update, dt)
+    
+    def _update(self, dt:float):
+        if self._preloading:
+            self._finalize_preloads()
         if not self.curr_scene:
             return
         curr_scene_transitioning = False
         prev_scene_transitioning = False
         if self._transitioning:
-            for transition in self._running_transitions:
+            # Copied, a transition ending in its update removes itself right away
+            for transition in list(self._running_transitions):
                 transition.update(dt)
                 scene = transition.scene
                 if not scene:
@@ -225,9 +445,63 @@ class SceneManager:
             self.prev_scene.update(dt)
         if not curr_scene_transitioning:
             self.curr_scene.update(dt)
+        if self._scene_limit_pending:
+            self._scene_limit_pending = False
+            self._enforce_scene_limit()
+    
+    def draw(self, screen:pygame.Surface) -> list[pygame.Rect]|None:
+        '''Draw the scenes on the screen
+        
+        Returns
+        ---------
+        None when not in dirty rect mode, otherwise the list of rects changed on the screen, to be passed to pygame.display.update()'''
+        profiler = self.profiler
+        if profiler is None:
+            return self._draw(screen)
+        return profiler.time("scene.draw", self._draw, screen)
     
-    def draw(self, screen:pygame.Surface):
+    def _draw(self, screen:pygame.Surface) -> list[pygame.Rect]|None:
+        if self.dirty_rects:
+            return self._draw_dirty(screen)
         screen.fill((0,0,0))
+        self._draw_scenes(screen)
+    
+    def _get_visible_scenes(self) -> list[Scene]:
+        if not self.curr_scene:
+            return []
+        if self._transitioning and self.prev_scene and self.prev_scene != self.curr_scene:
+            return [self.prev_scene, self.curr_scene]
+        return [self.curr_scene]
+    
+    def _draw_dirty(self, screen:pygame.Surface) -> list[pygame.Rect]:
+        '''Internal method to clear and redraw only the changed regions of the screen'''
+        bounds = screen.get_rect()
+        full_redraw = self._full_redraw
+        self._full_redraw = False
+        rects = []
+        for scene in self._get_visible_scenes():
+            scene_rects = scene.pop_dirty_rects()
+            if scene_rects is None:
+                full_redraw = True
+            else:
+                rects.extend(scene_rects)
+        for transition in self._running_transitions:
+            rects.extend(transition.pop_dirty_rects())
+        
+        rects = [bounds] if full_redraw else merge_rects(rects, bounds)
+        if not rects:
+            return rects
+        
+        # The scenes are drawn once clipped to the union, so the whole union is cleared and updated, not only the rects
+        dirty = rects[0].unionall(rects[1:])
+        screen.set_clip(dirty)
+        screen.fill((0,0,0), dirty)
+        self._draw_scenes(screen)
+        screen.set_clip(None)
+        return [dirty]
+    
+    def _draw_scenes(self, screen:pygame.Surface):
+        '''Internal method to draw the current scene and the running transitions'''
         if not self.curr_scene:
             return
         
@@ -1,6 +1,7 @@
 import pygame
 
 from ._constants import ON_SECTION_START, ON_SECTION_END
+from .event_bus import event_bus
 
 class Section:
     '''Represents a Section of a transition or an effect
@@ -8,7 +9,8 @@ class Section:
     Events
     -------
     on section start - type: ON_SECTION_START, element: Section, object_id: str|None\n
-    on section end - type: ON_SECTION_END, element: Section, object_id: str|None'''
+    on section end - type: ON_SECTION_END, element: Section, object_id: str|None\n
+    Published on better_pygame.event_bus, subscribe to it to get them'''
     def __init__(self, 
                  duration:float, 
                  start_position:tuple[float, float]|None = None, 
@@ -36,10 +38,8 @@ class Section:
 
     def on_start(self):
         """Called when the section starts"""
-        event = pygame.Event(ON_SECTION_START, {"element":self, "object_id":self.object_id})
-        pygame.event.post(event)
+        event_bus.publish(ON_SECTION_START, self, self.object_id)
     
     def on_end(self):
         """Called when the section ends"""
-        event = pygame.Event(ON_SECTION_END, {"element":self, "object_id":self.object_id})
-        pygame.event.post(event)
\ No newline at end of file
+        event_bus.publish(ON_SECTION_END, self, self.object_id)
\ No newline at end of file
@@ -1,8 +1,10 @@
+import math
 from typing import Literal, Sequence
 
 import pygame
 
 from ._constants import ON_TRANSITION_END
+from .event_bus import event_bus
 from .utils import *
 from .section import Section
 
@@ -15,17 +17,24 @@ class Transition:
     To make transition work, Scene.draw() should not be used, instead call Transition.draw(). Transition works by modifying the Surface the Scene drew on.\n
     If Scene is animated, Scene.update() should be called every loop such that the animation will still run during transition.\n
     Do be aware that the Scene's objects coordinates are not moved along with the transition, Scene.handle_event() should not be called while transition is running.\n
+    The Scene is only drawn once per transition unless it is set to require update with Scene.set_transition_require_update(True), call Transition.invalidate_cache() to redraw it otherwise.\n
+    For static scenes that still require update, Transition.set_snapshot() captures the Scene once at start and only animates that capture.\n
     
     Events
     ----------
-    on transition end - type: ON_TRANSITION_END, element: Transition, object_id:str|None
+    on transition end - type: ON_TRANSITION_END, element: Transition, object_id:str|None\n
+    Published on better_pygame.event_bus, subscribe to it to get them
     '''
-    def __init__(self, sections:Sequence[dict|Section] = [], object_id:str|None = None) -> None:
+    def __init__(self, sections:Sequence[dict|Section] = [], object_id:str|None = None, snapshot:bool = False, refresh_interval:int|None = None) -> None:
         '''
         Parameters
         ------------
         sections: list[dict|Section]
             A list of different sections at different durations of the transition
+        snapshot: bool
+            If the scene is captured once at the start of the transition and only that capture is animated, see set_snapshot()
+        refresh_interval: int|None
+            In snapshot mode, recapture the scene every `refresh_interval` frames, never if None
         
         sections dict
         --------------
@@ -58,6 +67,16 @@ class Transition:
         self._curr_transparency = 255
         self._curr_transparency_change_rate = None
         
+        # Draw pipeline caches, the scene surface is reused between frames and runs
+        self._scene_surface:pygame.Surface|None = None
+        self._scene_rendered = False
+        self._transformed_surface:pygame.Surface|None = None
+        self._transformed_key:tuple|None = None
+        self._frames_since_render = 0
+        self.set_snapshot(snapshot, refresh_interval)
+        
+        self._draw_rects = DirtyRectTracker()
+        
         self.object_id = object_id
 
 
@@ -74,6 +93,9 @@ class Transition:
         self.scene_size = scene_size
         self._curr_size = scene_size
         self._running = True
+        self.invalidate_cache()
+        if self.snapshot:
+            self._render_scene()
         
         self._on_change_section()
         self._running = True
@@ -95,8 +117,7 @@ class Transition:
         self._curr_angle_change_rate = None
         self._curr_transparency = 255
         self._curr_transparency_change_rate = None
-        event = pygame.Event(ON_TRANSITION_END, {"element":self, "object_id":self.object_id})
-        pygame.event.post(event)
+        event_bus.publish(ON_TRANSITION_END, self, self.object_id)
     
     @staticmethod
     def get_change_rate_tup(start_tup:tuple[int|float, int|float], end_tup:tuple[int|float, int|float], duration:int|float):
@@ -177,6 +198,12 @@ class Transition:
         '''Update transition for each frame'''
         if not self._running:
             return
+        # Counted per update, a frame can draw the transition more than once
+        self._frames_since_render += 1
+        self._update_sections(dt)
+    
+    def _update_sections(self, dt:float):
+        '''Internal method to advance the sections by `dt`, called again with the remaining time when a section ends'''
         self.timer -= dt
         if self.timer < 0:
             section_time = self.timer + dt
@@ -195,25 +222,75 @@ class Transition:
                 self._running = False
                 self.scene = None
                 self.curr_section_index -= 1
-                event = pygame.Event(ON_TRANSITION_END, {"element":self, "object_id":self.object_id})
-                pygame.event.post(event)
+                event_bus.publish(ON_TRANSITION_END, self, self.object_id)
             else:
                 #Change to next section and update with the remaining unused time of the previous section
                 self._on_change_section()
-                self.update(dt - section_time)
+                self._update_sections(dt - section_time)
     
-    def draw(self, screen:pygame.Surface):
-        '''Draw the transitioning scene on the screen'''
-        if not self._running:
-            return
-        if not self.scene:
-            return
+    def set_snapshot(self, snapshot:bool = True, refresh_interval:int|None = None):
+        '''Set snapshot mode, where the scene is drawn once when the transition starts and only that snapshot is animated,
+        even if the scene is set to require update. Makes a transition cost a blit instead of a scene draw per frame.
+        
+        Parameters
+        ------------
+        snapshot: bool
+            If snapshot mode is on
+        refresh_interval: int|None
+            Recapture the scene every `refresh_interval` frames, never if None'''
+        if refresh_interval is not None and refresh_interval < 1:
+            raise ValueError(f"Refresh interval must be at least 1, got {refresh_interval}")
+        self.snapshot = snapshot
+        self.refresh_interval = refresh_interval
+    
+    def invalidate_cache(self):
+        '''Force the scene to be redrawn on the next draw call.\n
+        Only needed when the scene changes during the transition without `_transition_require_update` set.'''
+        self._scene_rendered = False
+        self._transformed_surface = None
+        self._transformed_key = None
+    
+    def _render_scene(self) -> bool:
+        '''Internal method to draw the scene onto the reused scene surface, returns if the surface changed'''
+        if self._scene_rendered:
+            if self.snapshot:
+                stale = self.refresh_interval is not None and self._frames_since_render >= self.refresh_interval
+            else:
+                # Scenes that do not require update are not updated while transitioning, so their drawing is static
+                stale = getattr(self.scene, "_transition_require_update", False)
+            if not stale:
+                return False
+        if self._scene_surface is None or self._scene_surface.get_size() != tuple(self.scene_size):
+            self._scene_surface = transparent_surface(self.scene_size)
+        else:
+            self._scene_surface.fill((0, 0, 0, 0))
+        self.scene.draw(self._scene_surface)
+        self._scene_rendered = True
+        self._frames_since_render = 0
+        return True
+    
+    def _get_transformed_surface(self, scene_changed:bool) -> pygame.Surface:
+        '''Internal method to scale and rotate the scene surface, skipping identity transforms'''
+        angle = self._curr_angle % 360
+        scaled = tuple(self._curr_size) != tuple(self.scene_size)
+        if not scaled and not angle:
+            return self._scene_surface
         
-        surf = transparent_surface(self.scene_size)
-        self.scene.draw(surf)
-        surf = pygame.transform.scale(surf, self._curr_size)
-        surf = pygame.transform.rotate(surf, self._curr_angle % 360)
+        key = (tuple(self._curr_size), angle)
+        if not scene_changed and key == self._transformed_key:
+            return self._transformed_surface
         
+        surf = self._scene_surface
+        if scaled:
+            surf = pygame.transform.scale(surf, self._curr_size)
+        if angle:
+            surf = pygame.transform.rotate(surf, angle)
+        self._transformed_surface = surf
+        self._transformed_key = key
+        return surf
+    
+    def _get_position(self, rotated_size:tuple[float, float]) -> tuple[float, float]:
+        '''Internal method to get where the transformed scene surface of size `rotated_size` is drawn'''
         curr_section = self.sections[self.curr_section_index]
         rotation_origin = curr_section.rotation_origin if isinstance(curr_section, Section) else curr_section.get("rotation_origin")
         if rotation_origin is None:
@@ -221,14 +298,44 @@ class Transition:
             rotation_origin = tup_divide(self._curr_size, (2, 2))
         origin_to_size_ratio = tup_divide(rotation_origin, self.scene_size)
         
-        rotated_size = surf.get_size()
         if rotated_size != self._curr_size:
             # Reposition the surface to keep rotation origin at center
             position_shift = tup_round(tup_multiply(tup_subtract((rotated_size[0], rotated_size[1]), self._curr_size), origin_to_size_ratio))
         else:
             position_shift = (0,0)
+        return tup_subtract(self._curr_position, position_shift)
+    
+    def get_draw_rect(self) -> pygame.Rect|None:
+        '''Get the region the scene is drawn over with the current values, None if nothing is drawn.\n
+        Worked out from the size and angle without drawing the scene, rotated scenes get a rect a few pixels bigger than drawn.'''
+        if not self._running or not self.scene:
+            return None
+        size = tuple(int(length) for length in self._curr_size)
+        angle = self._curr_angle % 360
+        if not angle:
+            return pygame.Rect(self._get_position(size), size)
+        radians = math.radians(angle)
+        cos, sin = abs(math.cos(radians)), abs(math.sin(radians))
+        rotated_size = (math.ceil(size[0] * cos + size[1] * sin), math.ceil(size[0] * sin + size[1] * cos))
+        # pygame rounds the rotated size differently, padded to cover it
+        return pygame.Rect(self._get_position(rotated_size), rotated_size).inflate(4, 4)
+    
+    def draw(self, screen:pygame.Surface):
+        '''Draw the transitioning scene on the screen'''
+        if not self._running:
+            return
+        if not self.scene:
+            return
+        
+        scene_changed = self._render_scene()
+        surf = self._get_transformed_surface(scene_changed)
         surf.set_alpha(int(self._curr_transparency))
-        screen.blit(surf, tup_subtract(self._curr_position, position_shift))
+        screen.blit(surf, self._get_position(surf.get_size()))
+    
+    def pop_dirty_rects(self) -> list[pygame.Rect]:
+        '''Get the screen regions changed by the transition since the last call, used for dirty rect rendering.\n
+        Called before drawing, returns the region drawn over last frame and the one about to be drawn over.'''
+        return self._draw_rects.pop(self.get_draw_rect())
 
 
 
@@ -23,4 +23,37 @@ def tup_round(tup:tuple[float, float], decimals:int=0):
     return round(tup[0], decimals), round(tup[1], decimals)
 
 def transparent_surface(size:tuple[T, T]):
-    return pygame.Surface(size, pygame.SRCALPHA)
\ No newline at end of file
+    return pygame.Surface(size, pygame.SRCALPHA)
+
+def merge_rects(rects:list[pygame.Rect], bounds:pygame.Rect, full_ratio:float = 0.5) -> list[pygame.Rect]:
+    '''Clip rects to `bounds` and merge the overlapping ones, returns `[bounds]` if they cover more than `full_ratio` of it'''
+    pending = [rect.clip(bounds) for rect in rects]
+    merged:list[pygame.Rect] = []
+    while pending:
+        rect = pending.pop()
+        if not rect.w or not rect.h:
+            continue
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    if sum(rect.w * rect.h for rect in merged) > bounds.w * bounds.h * full_ratio:
+        return [bounds.copy()]
+    return merged
+
+
+class DirtyRectTracker:
+    '''Screen regions changed by something drawn at a rect that can change every frame, used for dirty rect rendering'''
+    def __init__(self) -> None:
+        self.last_rect:pygame.Rect|None = None
+
+    def pop(self, rect:pygame.Rect|None) -> list[pygame.Rect]:
+        '''Get the regions changed since the last call, `rect` being the region about to be drawn over, None if nothing is drawn.\n
+        Returns the previous rect to be cleared and the new one to be drawn, the new one has to be known before drawing
+        such that the draw is not clipped to the previous frame.'''
+        rects = [] if self.last_rect is None else [self.last_rect]
+        if rect is not None:
+            rects.append(rect)
+        self.last_rect = rect
+        return rects
@@ -1,15 +1,34 @@
+import weakref
 from abc import ABC, abstractmethod
 from typing import TypeVar, Any, Sequence, Optional, Type
 
+from .components import ComponentStore, install_component_fields
+
 class Behavior(ABC):
+    _active:bool = True
+    _owner:Optional["GameObject"] = None
+    
     def __init__(self, *, active:bool = True) -> None:
         self.active = active
     
+    @property
+    def active(self) -> bool:
+        return self._active
+    
+    @active.setter
+    def active(self, value:bool):
+        if value == self._active:
+            return
+        self._active = value
+        if self._owner is not None:
+            self._owner._on_behavior_state_change(self)
+    
     def handle_event(self, event) -> None:...
     
     def update(self, dt:float) -> None:...
     
     def draw(self, screen) -> None:...
+    '''Draws the behavior on `screen`, always a pygame.Surface. Called by the object owning it after drawing its image'''
 
     def activate(self):
         self.active = True
@@ -20,44 +39,253 @@ class Behavior(ABC):
     @classmethod
     def register_event(cls) -> Optional[Any]:...
 
+_behavior_types_cache:dict[Type[Behavior], tuple[Type[Behavior], ...]] = {}
+
+def _get_behavior_types(behavior:Behavior) -> tuple[Type[Behavior], ...]:
+    """Returns every Behavior class the behavior is an instance of, cached per behavior class"""
+    behavior_cls = type(behavior)
+    behavior_types = _behavior_types_cache.get(behavior_cls)
+    if behavior_types is None:
+        behavior_types = tuple(cls for cls in behavior_cls.__mro__ if issubclass(cls, Behavior))
+        _behavior_types_cache[behavior_cls] = behavior_types
+    return behavior_types
+
 class GameObject(ABC):
-    instances:dict[Any, list] = {}
+    # Weak references only, so the registry never keeps a destroyed object alive
+    instances:dict[Any, weakref.WeakSet] = {}
+    
+    pool_size:int = 0
+    '''Number of removed instances kept per class to be reused by the next spawns, 0 disables pooling'''
+    _pools:dict[Any, list] = {}
+    
+    # x, y, width, height, velocity_x and velocity_y live in this store when the game manager has one
+    _store:ComponentStore|None = None
+    _entity_id:int = -1
+    
+    # Drawing, objects without an image only draw their behaviors
+    image:Any = None
+    layer:int = 0
+    blend:int = 0
+    alpha:int|None = None
+    # Position before the last fixed update, recorded by the game manager when it interpolates
+    prev_position:tuple[float, float]|None = None
     def __new__(cls, *args, **kwargs):
+        # A pooled instance is initialized again by __init__ like a new one
+        pool = cls._pools.get(cls)
+        if pool:
+            return pool.pop()
+        
         instance = super().__new__(cls)
         if cls.instances.get(cls, None) is not None:
-            cls.instances[cls].append(instance)
+            cls.instances[cls].add(instance)
         else:
-            cls.instances[cls] = [instance]
+            cls.instances[cls] = weakref.WeakSet([instance])
         
         return instance
     
+    @classmethod
+    def get_pooled_count(cls) -> int:
+        '''Returns the number of instances of the class waiting in the pool'''
+        return len(cls._pools.get(cls, ()))
+    
+    @classmethod
+    def clear_pool(cls):
+        '''Drops every pooled instance of the class'''
+        cls._pools.pop(cls, None)
+    
+    def _return_to_pool(self):
+        '''Keeps the object for reuse if its class is pooled, called once the game manager removed it'''
+        cls = type(self)
+        if cls.pool_size <= 0:
+            return
+        pool = cls._pools.get(cls)
+        if pool is None:
+            pool = cls._pools[cls] = []
+        if len(pool) >= cls.pool_size or self in pool:
+            return
+        for behavior in self._behaviors:
+            behavior._owner = None
+        self._behaviors = []
+        self._behavior_index = {}
+        pool.append(self)
+    
     def __init__(self, game_manager, position:tuple[float, float], size:tuple[float, float], velocity:tuple[float, float] = (0, 0), behaviors:Sequence[Behavior] = []) -> None:
         self.game_manager = game_manager
-        game_manager.add_object(self)
-        self.position = self.x, self.y = position
-        self.size = self.width, self.height = size
-        self.velocity = self.velocity_x, self.velocity_y = velocity
+        # Set by the game manager when the object is added
+        self._spawn_index = -1
+        store = getattr(game_manager, "component_store", None)
+        if store is not None:
+            install_component_fields(type(self))
+            self._store = store
+            self._entity_id = store.allocate()
+        self.position = position
+        self.prev_position = None
+        self.size = size
+        self.velocity = velocity
+        self._behaviors:list[Behavior] = []
+        # Active behaviors keyed by every Behavior class they are an instance of
+        self._behavior_index:dict[Type[Behavior], list[Behavior]] = {}
         self.behaviors = behaviors
         self.alive = True
+        # Added last so that the game manager can index the object by its rect
+        game_manager.add_object(self)
+    
+    @property
+    def position(self) -> tuple[float, float]:
+        return (self.x, self.y)
+    
+    @position.setter
+    def position(self, position:tuple[float, float]):
+        self.x, self.y = position
+    
+    @property
+    def size(self) -> tuple[float, float]:
+        return (self.width, self.height)
+    
+    @size.setter
+    def size(self, size:tuple[float, float]):
+        self.width, self.height = size
+    
+    @property
+    def velocity(self) -> tuple[float, float]:
+        return (self.velocity_x, self.velocity_y)
+    
+    @velocity.setter
+    def velocity(self, velocity:tuple[float, float]):
+        self.velocity_x, self.velocity_y = velocity
     
     @property
     def rect(self):
-        return (self.x, self.y, self.width, self.height)
+        store = self._store
+        if store is None:
+            return (self.x, self.y, self.width, self.height)
+        columns, entity_id = store.columns, self._entity_id
+        return (columns["x"][entity_id], columns["y"][entity_id], columns["width"][entity_id], columns["height"][entity_id])
     
     @property
     def area(self):
         return self.width * self.height
     
+    @property
+    def behaviors(self) -> tuple[Behavior, ...]:
+        '''The behaviors of the object, use add_behavior and remove_behavior to modify them'''
+        return tuple(self._behaviors)
+    
+    @behaviors.setter
+    def behaviors(self, behaviors:Sequence[Behavior]):
+        for behavior in list(self._behaviors):
+            self.remove_behavior(behavior)
+        for behavior in behaviors:
+            self.add_behavior(behavior)
+    
+    def add_behavior(self, behavior:Behavior):
+        '''Attaches the behavior to the object, a behavior can only be attached to one object at a time'''
+        if behavior._owner is not None:
+            raise ValueError(f"{behavior} is already attached to {behavior._owner}, create a behavior per object")
+        behavior._owner = self
+        self._behaviors.append(behavior)
+        if behavior.active:
+            self._index_behavior(behavior)
+    
+    def remove_behavior(self, behavior:Behavior):
+        '''Detaches the behavior from the object'''
+        self._behaviors.remove(behavior)
+        if behavior.active:
+            self._unindex_behavior(behavior)
+        behavior._owner = None
+    
+    def _index_behavior(self, behavior:Behavior):
+        gained:list[Type[Behavior]] = []
+        for cls in _get_behavior_types(behavior):
+            indexed = self._behavior_index.get(cls)
+            if indexed is None:
+                self._behavior_index[cls] = [behavior]
+                gained.append(cls)
+            else:
+                indexed.append(behavior)
+        self.game_manager.on_behavior_change(self, behavior, gained, True)
+    
+    def _unindex_behavior(self, behavior:Behavior):
+        lost:list[Type[Behavior]] = []
+        for cls in _get_behavior_types(behavior):
+            indexed = self._behavior_index[cls]
+            indexed.remove(behavior)
+            if not indexed:
+                del self._behavior_index[cls]
+                lost.append(cls)
+        self.game_manager.on_behavior_change(self, behavior, lost, False)
+    
+    def _on_behavior_state_change(self, behavior:Behavior):
+        '''Called by an attached behavior when it is activated or deactivated'''
+        if behavior.active:
+            self._index_behavior(behavior)
+        else:
+            self._unindex_behavior(behavior)
+    
     def has_behavior(self, behavior:Type[Behavior]):
         '''Checks if the object has a certain type of behavior active'''
-        for obj_behavior in self.behaviors:
-            if isinstance(obj_behavior, behavior) and obj_behavior.active:
-                return True
-        return False
+        return behavior in self._behavior_index
+    
+    def get_behaviors(self, behavior:Type[Behavior]) -> list[Behavior]:
+        '''Returns the active behaviors of the object that are instances of a certain type of behavior'''
+        return list(self._behavior_index.get(behavior, ()))
+    
+    def behavior_types(self):
+        '''Returns the types of behavior the object has active, including their base classes'''
+        return self._behavior_index.keys()
+    
+    @property
+    def draw_position(self) -> tuple[float, float]:
+        '''Position to draw the object at, between its previous and current position by the interpolation alpha of the game manager'''
+        position = self.position
+        prev_position = self.prev_position
+        alpha = getattr(self.game_manager, "interpolation_alpha", 1.0)
+        if prev_position is None or alpha >= 1:
+            return position
+        return (prev_position[0] + (position[0] - prev_position[0]) * alpha,
+                prev_position[1] + (position[1] - prev_position[1]) * alpha)
+    
+    def draw(self, screen) -> None:
+        '''Draws the image of the object at its draw position then its active behaviors, `screen` is a pygame.Surface or a RenderQueue.
+        Behaviors are always drawn on the pygame.Surface, through submit_draw when drawn on a RenderQueue.'''
+        submit = getattr(screen, "submit", None)
+        if self.image is not None:
+            position = self.draw_position
+            if submit is not None:
+                submit(self.image, position, self.layer, self.blend, self.alpha)
+            elif self.alpha is None:
+                screen.blit(self.image, position, None, self.blend)
+            else:
+                # The image may be shared, its alpha is only changed for this blit
+                prev_alpha = self.image.get_alpha()
+                self.image.set_alpha(self.alpha)
+                screen.blit(self.image, position, None, self.blend)
+                self.image.set_alpha(prev_alpha)
+        for behavior in self._behaviors:
+            if not behavior.active:
+                continue
+            if submit is None:
+                behavior.draw(screen)
+            elif type(behavior).draw is not Behavior.draw:
+                # Drawn when the queue is flushed, over the image of the object, behaviors that draw nothing keep the layer batched
+                screen.submit_draw(behavior.draw, self.layer)
     
     
+    def _detach_from_store(self):
+        '''Moves the values of the object out of the component store and frees its row, called when the object is removed from the game manager'''
+        store = self._store
+        if store is None:
+            return
+        values = {field:getattr(self, field) for field in store.fields}
+        store.release(self._entity_id)
+        self._store = None
+        self._entity_id = -1
+        for field, value in values.items():
+            setattr(self, field, value)
+    
     def on_destroy(self):
+        '''Marks the object as dead and requests its removal, pooled classes get the object back once it is removed'''
         self.alive = False
         self.game_manager.req_delete_object(self)
     
-    
\ No newline at end of file
+    
@@ -1,8 +1,11 @@
 import math
+from operator import attrgetter
 from typing import Generic, Type
 
-from ..events import Event, ObjectsArg, EventArgument
+from ..events import Event, DynamicObjectsArg, SpatialIndexArg, EventArgument
 from ..abc import Behavior, GameObject
+from ..spatial import BroadPhase, SweepAndPrune, PartitionedIndex, StaticIndex
+from ..physics import PhysicsBehavior, PhysicsField
 from .._typevars import GameObj
 
 class Anchor(Behavior):
@@ -11,7 +14,12 @@ class Anchor(Behavior):
 class Immovable(Behavior):
     ...
 
-class Projectile(Behavior, Generic[GameObj]):
+class Projectile(PhysicsBehavior, Generic[GameObj]):
+    physics_table_name = "projectiles"
+    speed = PhysicsField()
+    angle = PhysicsField()
+    accel = PhysicsField()
+    
     def __init__(self, speed:float, angle:float, ref:GameObj, accel:float = 0, *, active:bool = True) -> None:
         self.speed = speed
         self.angle = angle
@@ -19,9 +27,7 @@ class Projectile(Behavior, Generic[GameObj]):
         self.accel = accel
         self.active = active
     
-    def update(self, dt: float) -> None:
-        if not self.active:
-            return
+    def step(self, dt: float) -> None:
         speed_change = self.speed*self.accel*dt/2
         self.speed += speed_change
         magnitude = self.speed*dt
@@ -32,25 +38,33 @@ class Projectile(Behavior, Generic[GameObj]):
     
     
 
-class Gravity(Behavior, Generic[GameObj]):
+class Gravity(PhysicsBehavior, Generic[GameObj]):
+    physics_table_name = "gravities"
+    accel = PhysicsField()
+    terminal_velo = PhysicsField(optional=True)
+    
     def __init__(self, ref:GameObj, accel:float = 9.81, terminal_velo:float|None = None, *, active:bool = True) -> None:
         self.accel = accel
         self.terminal_velo = terminal_velo
         self._ref = ref
         self.active = active
     
-    def update(self, dt: float) -> None:
-        if not self.active:
-            return
+    def step(self, dt: float) -> None:
         curr_velo = self._ref.velocity_y
         velo_change = -self.accel * dt
         self._ref.velocity_y += velo_change if self.terminal_velo and curr_velo + velo_change > self.terminal_velo else 0
 
 
+_spawn_order = attrgetter("_spawn_index")
+
 class _SolidEvent(Event):
+    # Passes pushing a moved object out of the static objects it ended up in, see run
+    max_static_passes:int = 4
+    
     def __init__(self, solids:set[Type[GameObject]]) -> None:
         self.solids = solids
-    
+        # Kept between frames so that sorting it again only costs the few swaps caused by movement
+        self.sweep_and_prune = SweepAndPrune()
     
     @staticmethod
     def is_overlapping(rect1, rect2):
@@ -66,11 +80,13 @@ class _SolidEvent(Event):
         return True
     
     @staticmethod
-    def resolve_overlap(obj1:GameObject, obj2:GameObject):
+    def resolve_overlap(obj1:GameObject, obj2:GameObject, obj1_movable:bool|None = None, obj2_movable:bool|None = None):
         if not obj1.alive or not obj2.alive:
             return
-        obj1_movable = not obj1.has_behavior(Immovable)
-        obj2_movable = not obj2.has_behavior(Immovable)
+        if obj1_movable is None:
+            obj1_movable = not obj1.has_behavior(Immovable)
+        if obj2_movable is None:
+            obj2_movable = not obj2.has_behavior(Immovable)
         if not obj1_movable and not obj2_movable:
             return
         
@@ -124,36 +140,127 @@ class _SolidEvent(Event):
             
     
     def run(self, *args):
-        all_objects:list[GameObject] = []
-        for objs in args:
-            all_objects += objs
+        """
+        Resolves the overlapping solids like the all-pairs loop it replaces: every moving object in spawn order
+        is resolved against the moving objects spawned after it, in spawn order, testing their current rects.
         
-        for index1 in range(len(all_objects)):
-            for index2 in range(index1+1, len(all_objects)):
-                obj1, obj2 = all_objects[index1], all_objects[index2]
-                if not obj1.alive or not obj2.alive:
-                    continue
-                obj1_movable = not obj1.has_behavior(Immovable)
-                obj2_movable = not obj2.has_behavior(Immovable)
-                if not obj1_movable and not obj2_movable:
-                    continue
-                overlap = self.is_overlapping(obj1.rect, obj2.rect)
-                if not overlap:
-                    continue
-                self.resolve_overlap(all_objects[index1], all_objects[index2])
-    
+        The sweep-and-prune only skips the pairs that cannot touch. An object pushed out of the bounds it was swept
+        with is queried again, so every pair the loop would find overlapping is found, and the result for moving
+        solids is the one of the loop over the objects sorted by spawn order.
+        Static solids differ from the loop: moving objects are pushed out of them before the moving solids are
+        resolved, which is what the loop does when the level is spawned before what moves in it, and pushed out again
+        after if the moving solids pushed them back in. Every push out of static solids queries them again,
+        up to `max_static_passes` times.
+        """
+        solid_groups = list(args)
+        static_index = None
+        if solid_groups and isinstance(solid_groups[-1], BroadPhase):
+            spatial_index = solid_groups.pop()
+            if isinstance(spatial_index, PartitionedIndex):
+                static_index = spatial_index.static
         
+        sweep_and_prune = self.sweep_and_prune
+        dynamic_objects:set[GameObject] = set()
+        for objs in solid_groups:
+            dynamic_objects.update(objs)
+        # Sets iterate in hash order, the spawn order keeps the resolution the same between runs and replays
+        ordered_objects = sorted(dynamic_objects, key=_spawn_order)
+        immovable = {obj:obj.has_behavior(Immovable) for obj in ordered_objects}
         
+        if static_index is not None:
+            for obj in ordered_objects:
+                if obj.alive and not immovable[obj]:
+                    self._push_out_of_static(obj, static_index)
         
+        for obj in [obj for obj in sweep_and_prune if obj not in dynamic_objects]:
+            sweep_and_prune.remove(obj)
+        sweep_and_prune.update_all(ordered_objects)
+        
+        neighbors:dict[GameObject, set[GameObject]] = {}
+        for obj1, obj2 in sweep_and_prune.candidate_pairs():
+            if obj1 in neighbors:
+                neighbors[obj1].add(obj2)
+            else:
+                neighbors[obj1] = {obj2}
+            if obj2 in neighbors:
+                neighbors[obj2].add(obj1)
+            else:
+                neighbors[obj2] = {obj1}
+        
+        def refresh_neighbors(obj:GameObject) -> bool:
+            # Objects moving inside the bounds they were indexed with keep their neighbors, returns if it got new ones
+            rect = obj.rect
+            if sweep_and_prune.covers(obj, rect):
+                return False
+            sweep_and_prune.move(obj)
+            for obj2 in sweep_and_prune.query(rect):
+                if obj2 is not obj:
+                    neighbors.setdefault(obj, set()).add(obj2)
+                    neighbors.setdefault(obj2, set()).add(obj)
+            return True
+        
+        is_overlapping, resolve_overlap = self.is_overlapping, self.resolve_overlap
+        moved_objects:dict[GameObject, None] = {}
+        for obj1 in ordered_objects:
+            if not obj1.alive:
+                continue
+            obj1_movable = not immovable[obj1]
+            # Spawn index of the last object tested against obj1, objects are tested at most once like in the loop
+            last_index = obj1._spawn_index
+            while obj1 in neighbors:
+                candidates = sorted([obj2 for obj2 in neighbors[obj1] if obj2._spawn_index > last_index], key=_spawn_order)
+                requery = False
+                for obj2 in candidates:
+                    last_index = obj2._spawn_index
+                    if not obj2.alive:
+                        continue
+                    rect1, rect2 = obj1.rect, obj2.rect
+                    if not is_overlapping(rect1, rect2):
+                        continue
+                    resolve_overlap(obj1, obj2, obj1_movable, not immovable[obj2])
+                    if obj2.rect != rect2:
+                        moved_objects[obj2] = None
+                        refresh_neighbors(obj2)
+                    if obj1.rect != rect1:
+                        moved_objects[obj1] = None
+                        if refresh_neighbors(obj1):
+                            # Pushed into objects that may not be in the candidates
+                            requery = True
+                            break
+                if not requery:
+                    break
+        
+        if static_index is not None:
+            # Moving solids may have pushed the objects back into the level geometry
+            for obj in moved_objects:
+                if obj.alive and not immovable[obj]:
+                    self._push_out_of_static(obj, static_index)
+    
+    def _push_out_of_static(self, obj:GameObject, static_index:StaticIndex) -> None:
+        """Pushes the object out of the static solids it overlaps, querying again after every pass that moved it"""
+        solids, is_overlapping = self.solids, self.is_overlapping
+        for _ in range(self.max_static_passes):
+            rect = obj.rect
+            overlapping = [obj2 for obj2 in static_index.query(rect) if is_overlapping(rect, obj2.rect) and type(obj2) in solids and obj2.alive]
+            if not overlapping:
+                return
+            overlapping.sort(key=_spawn_order)
+            for obj2 in overlapping:
+                if is_overlapping(obj.rect, obj2.rect):
+                    self.resolve_overlap(obj, obj2, True, False)
+            if obj.rect == rect:
+                return
     
     def get_event_arguments(self) -> list[EventArgument]:
-        return [ObjectsArg(solid) for solid in self.solids]
+        # Exact types, solids are registered per type of the objects given to Solid
+        return [DynamicObjectsArg(solid) for solid in self.solids] + [SpatialIndexArg()]
 
 
 class Solid(Behavior):
     solids:set[Type[GameObject]] = set()
     def __init__(self, ref:GameObject, *, active:bool = True) -> None:
         self._ref = ref
+        # The solid event resolves its arguments from this set, the game manager recompiles it when it sees a new solid type
         self.__class__.solids.add(type(ref))
         self.active = active
     
@@ -0,0 +1,108 @@
+from array import array
+from typing import Any
+
+import numpy as np
+
+
+class ComponentStore:
+    """
+    Struct of arrays holding the position, size and velocity of game objects, indexed by entity id.
+    
+    Objects created with a game manager that has a component store become handles onto a row of the store,
+    so systems can read and write whole columns without touching the objects one by one.
+    """
+    fields:tuple[str, ...] = ("x", "y", "width", "height", "velocity_x", "velocity_y")
+    
+    def __init__(self, capacity:int = 256) -> None:
+        self.capacity = capacity
+        self.columns:dict[str, array] = {field:array("d", bytes(8 * capacity)) for field in self.fields}
+        self.alive = array("b", bytes(capacity))
+        self._free_ids:list[int] = list(range(capacity - 1, -1, -1))
+        self._views:dict[str, np.ndarray] = {}
+    
+    def __len__(self) -> int:
+        return self.capacity - len(self._free_ids)
+    
+    def _grow(self):
+        # New arrays are made instead of resizing, arrays cannot be resized while numpy views of them exist
+        extra = self.capacity
+        for field, column in self.columns.items():
+            new_column = array("d", column)
+            new_column.frombytes(bytes(8 * extra))
+            self.columns[field] = new_column
+        new_alive = array("b", self.alive)
+        new_alive.frombytes(bytes(extra))
+        self.alive = new_alive
+        self._free_ids = list(range(self.capacity + extra - 1, self.capacity - 1, -1)) + self._free_ids
+        self.capacity += extra
+        self._views = {}
+    
+    def allocate(self) -> int:
+        """Reserves a row of the store and returns its entity id"""
+        if not self._free_ids:
+            self._grow()
+        entity_id = self._free_ids.pop()
+        self.alive[entity_id] = 1
+        return entity_id
+    
+    def release(self, entity_id:int):
+        """Frees the row of the entity so it can be reused by a new entity"""
+        if not self.alive[entity_id]:
+            raise KeyError(f"Entity {entity_id} is not allocated")
+        self.alive[entity_id] = 0
+        for column in self.columns.values():
+            column[entity_id] = 0
+        self._free_ids.append(entity_id)
+    
+    def view(self, field:str) -> np.ndarray:
+        """
+        Returns a numpy view over the whole column of the field, indexed by entity id. Writing into it writes into the objects.
+        Views are invalidated when the store grows, get a new one after spawning objects instead of keeping it.
+        """
+        view = self._views.get(field)
+        if view is None:
+            view = self._views[field] = np.frombuffer(self.columns[field], dtype=np.float64)
+        return view
+    
+    def alive_ids(self) -> np.ndarray:
+        """Returns the entity ids of every allocated row"""
+        return np.flatnonzero(np.frombuffer(self.alive, dtype=np.int8))
+
+
+class ComponentField:
+    """
+    Attribute of a GameObject stored in the component store of its game manager.
+    Objects without a component store keep the value in their own __dict__ under the same name.
+    """
+    def __init__(self, name:str) -> None:
+        self.name = name
+    
+    def __get__(self, obj:Any, owner=None) -> Any:
+        if obj is None:
+            return self
+        store = obj._store
+        if store is None:
+            try:
+                return obj.__dict__[self.name]
+            except KeyError:
+                raise AttributeError(f"{type(obj).__name__!r} object has no attribute {self.name!r}") from None
+        return store.columns[self.name][obj._entity_id]
+    
+    def __set__(self, obj:Any, value:Any):
+        store = obj._store
+        if store is None:
+            obj.__dict__[self.name] = value
+        else:
+            store.columns[self.name][obj._entity_id] = value
+
+
+def install_component_fields(cls:type):
+    """
+    Turns the component attributes of the class into ComponentFields, done the first time the class is used with a component store.
+    Classes never used with one keep plain instance attributes and pay nothing for the store.
+    """
+    if cls.__dict__.get("_component_fields_installed", False):
+        return
+    for field in ComponentStore.fields:
+        setattr(cls, field, ComponentField(field))
+    cls._component_fields_installed = True
@@ -1,3 +1,3 @@
-from .event_args import EventArgument, ObjectsArg
+from .event_args import EventArgument, ObjectsArg, DynamicObjectsArg, SpatialIndexArg
 from .event import Event, OverlapEvent, CollisionEvent
 from .manager import EventManager
\ No newline at end of file
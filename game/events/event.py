@@ -1,17 +1,26 @@
 # Collision between circle and rectangle to be added!
 
 from abc import ABC, abstractmethod
-from typing import TypeVar, Type, Callable, Tuple, Literal, Sequence, TypeAlias, List, Generic
+from typing import TypeVar, Type, Callable, Tuple, Literal, Sequence, Collection, Iterable, TypeAlias, List, Generic
 from dataclasses import dataclass
 
 from ..abc import GameObject
-from .event_args import EventArgument, ObjectsArg
+from ..spatial import BroadPhase
+from .event_args import EventArgument, ObjectsArg, SpatialIndexArg
 
 EventArguments:TypeAlias = List[EventArgument]
 
 def _get_types_str(items:Sequence):
     return "(" + ", ".join([str(type(item)) for item in items]) + ")"
 
+def _get_candidate_pairs(objs1:Collection[GameObject], objs2:Collection[GameObject], spatial_index:BroadPhase|None) -> Iterable[tuple[GameObject, GameObject]]:
+    """
+    Returns the pairs of objects that need the exact test, using the spatial index if one is given.
+    """
+    if spatial_index is None:
+        return ((obj1, obj2) for obj1 in objs1 for obj2 in objs2)
+    return spatial_index.query_pairs(objs1, objs2)
+
 class Event(ABC):
     @abstractmethod
     def run(self, *args):...
@@ -36,9 +45,14 @@ class Event(ABC):
 
 
 class CollisionEvent(Event):
-    def __init__(self, object_type_1:Type[GameObject], object_type_2:Type[GameObject], action:Callable[[GameObject, GameObject], None]) -> None:
+    def __init__(self, object_type_1:Type[GameObject], object_type_2:Type[GameObject], action:Callable[[GameObject, GameObject], None], *, include_subclasses:bool = False) -> None:
+        """
+        Args:
+            include_subclasses (bool): If the objects of the subclasses of the object types are tested too, by default only objects of exactly these types are.
+        """
         self.check_classes = self.object_type_1, self.object_type_2 = object_type_1, object_type_2
         self.action = action
+        self.include_subclasses = include_subclasses
     
     @staticmethod
     def is_colliding(obj1:GameObject, obj2:GameObject):
@@ -56,20 +70,20 @@ class CollisionEvent(Event):
         return True
     
     def run(self, *args):
-        objs1, objs2, *_ = args
-        if not isinstance(objs1, Sequence) or not isinstance(objs2, Sequence):
+        objs1, objs2, *rest = args
+        if not isinstance(objs1, Collection) or not isinstance(objs2, Collection):
             raise TypeError(f"Argument type mismatch. Expected: {self._get_expected_run_args_str()}, Got: {_get_types_str(args)}")
+        spatial_index = rest[0] if rest and isinstance(rest[0], BroadPhase) else None
         
-        for obj1 in objs1:
-            for obj2 in objs2:
-                if not isinstance(obj1, self.object_type_1) or not isinstance(obj2, self.object_type_2):
-                    raise TypeError(f"Types of objects given not match types expected. {type(obj1)}->{self.object_type_1}, {type(obj2)}->{self.object_type_2}")
-                if not self.is_colliding(obj1, obj2):
-                    continue
-                self.action(obj1, obj2)
+        for obj1, obj2 in _get_candidate_pairs(objs1, objs2, spatial_index):
+            if not isinstance(obj1, self.object_type_1) or not isinstance(obj2, self.object_type_2):
+                raise TypeError(f"Types of objects given not match types expected. {type(obj1)}->{self.object_type_1}, {type(obj2)}->{self.object_type_2}")
+            if not self.is_colliding(obj1, obj2):
+                continue
+            self.action(obj1, obj2)
     
     def get_event_arguments(self) -> EventArguments:
-        return [ObjectsArg(self.object_type_1), ObjectsArg(self.object_type_2)]
+        return [ObjectsArg(self.object_type_1, self.include_subclasses), ObjectsArg(self.object_type_2, self.include_subclasses), SpatialIndexArg()]
 
 @dataclass
 class OverlapInfo:
@@ -79,9 +93,14 @@ class OverlapInfo:
     
 
 class OverlapEvent(Event):
-    def __init__(self, object_type_1:Type[GameObject], object_type_2:Type[GameObject], action:Callable[[GameObject, GameObject, OverlapInfo], None]) -> None:
+    def __init__(self, object_type_1:Type[GameObject], object_type_2:Type[GameObject], action:Callable[[GameObject, GameObject, OverlapInfo], None], *, include_subclasses:bool = False) -> None:
+        """
+        Args:
+            include_subclasses (bool): If the objects of the subclasses of the object types are tested too, by default only objects of exactly these types are.
+        """
         self.check_classes = self.object_type_1, self.object_type_2 = object_type_1, object_type_2
         self.action = action
+        self.include_subclasses = include_subclasses
     
     @staticmethod
     def is_overlapping(obj1:GameObject, obj2:GameObject) -> tuple[bool, float]:
@@ -102,19 +121,20 @@ class OverlapEvent(Event):
         return True, overlap_x * overlap_y
     
     def run(self, *args):
-        objs1, objs2, *_ = args
-        if not isinstance(objs1, Sequence) or not isinstance(objs2, Sequence):
-            raise TypeError(f"Argument type mismatch. Expected: {self._get_expected_run_args_str()}, Got: ({Type(objs1)}, {Type(objs2)})")
-        for obj1 in objs1:
-            for obj2 in objs2:
-                if not isinstance(obj1, self.object_type_1) or not isinstance(obj2, self.object_type_2):
-                    raise TypeError(f"Types of objects given not match types expected. {type(obj1)}->{self.object_type_1}, {type(obj2)}->{self.object_type_2}")
-                overlapping, area = self.is_overlapping(obj1, obj2)
-                if not overlapping:
-                    continue
-                
-                overlap_info = OverlapInfo(area, obj1.area/area, obj2.area/area)
-                self.action(obj1, obj2, overlap_info)
+        objs1, objs2, *rest = args
+        if not isinstance(objs1, Collection) or not isinstance(objs2, Collection):
+            raise TypeError(f"Argument type mismatch. Expected: {self._get_expected_run_args_str()}, Got: {_get_types_str(args)}")
+        spatial_index = rest[0] if rest and isinstance(rest[0], BroadPhase) else None
+        
+        for obj1, obj2 in _get_candidate_pairs(objs1, objs2, spatial_index):
+            if not isinstance(obj1, self.object_type_1) or not isinstance(obj2, self.object_type_2):
+                raise TypeError(f"Types of objects given not match types expected. {type(obj1)}->{self.object_type_1}, {type(obj2)}->{self.object_type_2}")
+            overlapping, area = self.is_overlapping(obj1, obj2)
+            if not overlapping:
+                continue
+            
+            overlap_info = OverlapInfo(area, obj1.area/area, obj2.area/area)
+            self.action(obj1, obj2, overlap_info)
     
     def get_event_arguments(self) -> EventArguments:
-        return [ObjectsArg(self.object_type_1), ObjectsArg(self.object_type_2)]
\ No newline at end of file
+        return [ObjectsArg(self.object_type_1, self.include_subclasses), ObjectsArg(self.object_type_2, self.include_subclasses), SpatialIndexArg()]
\ No newline at end of file
@@ -1,12 +1,21 @@
 from abc import ABC, abstractmethod
-from typing import Sequence, TypeVar, Type, Set, Callable, Tuple, Literal, Any, Generic
+from typing import Sequence, TypeVar, Type, Set, Callable, Tuple, Literal, Any, Generic, TYPE_CHECKING
 
-from ..game_manager import GameManager
 from .._typevars import GameObj
+from ..spatial import BroadPhase
+
+if TYPE_CHECKING:
+    from ..game_manager import GameManager
 
 class EventArgument(ABC):
+    live:bool = False
+    """
+    If True, `get` returns an object the game manager keeps up to date, so the event manager resolves it once
+    when compiling its dispatch plan instead of every frame.
+    """
+    
     @abstractmethod
-    def get(self, game_manager:GameManager) -> Any:...
+    def get(self, game_manager:"GameManager") -> Any:...
     """
     Returns the event arguments for the current game event.
     
@@ -26,10 +35,18 @@ class EventArgument(ABC):
 
 
 class ObjectsArg(EventArgument, Generic[GameObj]):
-    def __init__(self, obj_cls:Type[GameObj]) -> None:
+    live = True
+    
+    def __init__(self, obj_cls:Type[GameObj], include_subclasses:bool = False) -> None:
+        """
+        Args:
+            obj_cls (Type[GameObj]): The class of the game objects.
+            include_subclasses (bool): If the objects of the subclasses of `obj_cls` are included, by default only objects of exactly `obj_cls` are.
+        """
         self.obj_cls = obj_cls
+        self.include_subclasses = include_subclasses
     
-    def get(self, game_manager: GameManager) -> Any:
+    def get(self, game_manager: "GameManager") -> Any:
         """
         Returns the game objects of the specified class from the game manager.
         
@@ -37,9 +54,11 @@ class ObjectsArg(EventArgument, Generic[GameObj]):
             game_manager (GameManager): The game manager to retrieve the game objects from.
         
         Returns:
-            Any: The game objects of the specified class, or an empty set if none are found.
+            Any: The live set of game objects of the specified class, empty if none are found.
         """
-        return game_manager.game_objects.get(self.obj_cls, set())
+        if self.include_subclasses:
+            return game_manager.get_view(self.obj_cls)
+        return game_manager.get_bucket(self.obj_cls)
     
     def get_expected_return_type(self) -> Type:
         """
@@ -51,6 +70,47 @@ class ObjectsArg(EventArgument, Generic[GameObj]):
         return f"set[{self.obj_cls}]"
 
 
+class DynamicObjectsArg(ObjectsArg[GameObj]):
+    def get(self, game_manager: "GameManager") -> Any:
+        """
+        Returns the game objects of the specified class that are not in the static partition of the game manager.
+        
+        Args:
+            game_manager (GameManager): The game manager to retrieve the game objects from.
+        
+        Returns:
+            Any: The live set of moving game objects of the specified class, empty if none are found.
+        """
+        if self.include_subclasses:
+            return game_manager.get_dynamic_view(self.obj_cls)
+        return game_manager.get_dynamic_bucket(self.obj_cls)
+
+
+class SpatialIndexArg(EventArgument):
+    live = True
+    
+    def get(self, game_manager: "GameManager") -> BroadPhase:
+        """
+        Returns the spatial index kept up to date by the game manager, used by events to find nearby objects.
+        
+        Args:
+            game_manager (GameManager): The game manager to retrieve the spatial index from.
+        
+        Returns:
+            BroadPhase: The spatial index of the game manager.
+        """
+        return game_manager.spatial_index
+    
+    def get_expected_return_type(self) -> Type:
+        """
+        Returns the expected return type for the spatial index argument.
+        """
+        return BroadPhase
+    
+    def __str__(self) -> str:
+        return "BroadPhase"
+
+
 
 
 
@@ -1,4 +1,4 @@
-from typing import Mapping, TypeVar, Sequence
+from typing import Any, Callable, Mapping, TypeVar, Sequence
 
 
 from .event import Event
@@ -6,13 +6,64 @@ from .._typevars import GameObj
 
 class EventManager:
     def __init__(self, events:list[Event], game_manager) -> None:
-        self.events = events
+        self._events = list(events)
         self.game_manager = game_manager
+        # List of (run, args, live) per event, args are the resolved values if live and the EventArguments otherwise
+        self._plan:list[tuple[Callable, tuple, bool]]|None = None
+        # Profiler phase name per entry of the plan
+        self._plan_names:list[str] = []
     
-    def update(self):
-        for event in self.events:
-            #Find the suitable objects for the event
+    @property
+    def events(self) -> tuple[Event, ...]:
+        """The registered events, use add_event and remove_event to modify them"""
+        return tuple(self._events)
+    
+    def add_event(self, event:Event):
+        self._events.append(event)
+        self.invalidate()
+    
+    def remove_event(self, event:Event):
+        self._events.remove(event)
+        self.invalidate()
+    
+    def invalidate(self):
+        """Drops the dispatch plan, it is compiled again on the next update. Called when an event or an object type is registered."""
+        self._plan = None
+    
+    def _compile(self) -> list[tuple[Callable, tuple, bool]]:
+        """Resolves the arguments of every event once, only arguments that are not live are left to be resolved every frame"""
+        plan = []
+        self._plan_names = []
+        for event in self._events:
+            name = f"event.{type(event).__name__}"
+            if name in self._plan_names:
+                name += f".{len(self._plan_names)}"
+            self._plan_names.append(name)
             args_type = event.get_event_arguments()
-            args = [arg_type.get(self.game_manager) for arg_type in args_type]
-            event.run(*args)
-        
\ No newline at end of file
+            if all(arg_type.live for arg_type in args_type):
+                plan.append((event.run, tuple(arg_type.get(self.game_manager) for arg_type in args_type), True))
+            else:
+                plan.append((event.run, tuple(args_type), False))
+        self._plan = plan
+        return plan
+    
+    def update(self):
+        plan = self._plan
+        if plan is None:
+            plan = self._compile()
+        profiler = self.game_manager.profiler
+        if profiler is not None:
+            self._update_profiled(plan, profiler)
+            return
+        for run, args, live in plan:
+            if live:
+                run(*args)
+            else:
+                run(*[arg_type.get(self.game_manager) for arg_type in args])
+    
+    def _update_profiled(self, plan:list[tuple[Callable, tuple, bool]], profiler):
+        """Same as update, timing every event in the profiler"""
+        for name, (run, args, live) in zip(self._plan_names, plan):
+            if not live:
+                args = [arg_type.get(self.game_manager) for arg_type in args]
+            profiler.time(name, run, *args)
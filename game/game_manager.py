@@ -1,35 +1,249 @@
-from typing import Any, TypeVar, Type, Generic
+from typing import Any, Iterable, TypeVar, Type, Generic
+
+from better_pygame.profiler import Profiler
+from better_pygame.render_queue import RenderQueue
 
 from .abc import GameObject
 from .player import Player
-from .behaviors.behavior import Behavior
+from .behaviors.behavior import Behavior, Immovable, Solid
 from .events import Event, EventManager, EventArgument
+from .components import ComponentStore
+from .physics import PhysicsSystem, PhysicsBehavior
+from .spatial import BroadPhase, SpatialHashGrid, StaticIndex, PartitionedIndex
+from .type_buckets import TypeBuckets
 
 
 
 class GameManager:
-    def __init__(self, screen_size:tuple[float, float], events:list[Event]) -> None:
+    def __init__(self, screen_size:tuple[float, float], events:list[Event], spatial_index:BroadPhase|None = None, component_store:ComponentStore|None = None,
+                 interpolate:bool = False) -> None:
+        """
+        Args:
+            screen_size (tuple[float, float]): The size of the screen.
+            events (list[Event]): The events to be run every update.
+            spatial_index (BroadPhase | None): The broad phase used by the events to find nearby moving objects. Defaults to a SpatialHashGrid.
+            component_store (ComponentStore | None): If given, the position, size and velocity of the objects are stored in it so systems can work on whole columns.
+            interpolate (bool): If the position of the moving objects is recorded before every update, so `draw` can place them between
+                their previous and current position with the interpolation alpha of a fixed timestep loop.
+        """
         self.screen_size = screen_size
         
-        self.game_objects:dict[Type[GameObject], set[GameObject]] = {}
-        self._objs_to_remove:set[Any] = set()
+        # Exact type buckets in game_objects, views over a class and its subclasses are created on request
+        self.object_buckets = TypeBuckets(self._on_new_object_type)
+        self.game_objects:dict[Type[GameObject], set[GameObject]] = self.object_buckets.buckets
+        # Spawns and removals requested during an update wait here and are applied together at the end of it
+        self._objs_to_add:dict[GameObject, None] = {}
+        self._objs_to_remove:dict[GameObject, None] = {}
+        # Objects whose Immovable behavior changed during an update, moved between the partitions with the other changes
+        self._partitions_to_refresh:dict[GameObject, None] = {}
+        self._updating = False
+        # Order in which the objects were added, sets iterate in hash order so order dependent events sort by it
+        self._spawn_count = 0
+        
+        # Objects with an active Immovable behavior live in the static partition, which is baked once instead of updated every frame
+        self.dynamic_buckets = TypeBuckets()
+        self.dynamic_objects:dict[Type[GameObject], set[GameObject]] = self.dynamic_buckets.buckets
+        self.static_objects:set[GameObject] = set()
+        self._static_index_dirty = False
+        
+        # Objects keyed by each type of behavior they have active, including the base classes of the behaviors
+        self.behavior_objects:dict[Type[Behavior], set[GameObject]] = {}
+        # Object types seen with a Solid behavior, the solid event has to be recompiled for every new one
+        self._solid_types:set[Type[GameObject]] = set()
+        
+        self.component_store = component_store
+        self.physics = PhysicsSystem(component_store)
+        self.spatial_index = PartitionedIndex(spatial_index if spatial_index is not None else SpatialHashGrid())
+        self.event_manager = EventManager(events, self)
+        self.render_queue = RenderQueue()
+        self.interpolate = interpolate
+        # Set by draw, read by GameObject.draw_position
+        self.interpolation_alpha = 1.0
+        # Times the physics, the spatial index and every event when set
+        self.profiler:Profiler|None = None
 
     def add_object(self, obj:GameObject):
         """
         Adds the given object `obj` to the appropriate collection in `self.game_objects`.
+        Objects added during an update are only added at the end of it, see `apply_pending_changes`.
         """
-        if self.game_objects.get(type(obj)):
-            self.game_objects[type(obj)].add(obj)
-        else:
-            self.game_objects[type(obj)] = {obj}
+        if self._updating:
+            self._objs_to_add[obj] = None
+            return
+        self._link_object(obj)
+    
+    def _link_object(self, obj:GameObject):
+        """Adds the object to game_objects and every index"""
+        obj._spawn_index = self._spawn_count
+        self._spawn_count += 1
+        self.object_buckets.add(obj)
+        self._add_to_partition(obj)
+        self._add_to_behavior_index(obj, obj.behavior_types())
+        for behavior in obj.get_behaviors(PhysicsBehavior):
+            self.physics.add(behavior)
     
     def add_objects(self, objs:list[GameObject]):
         for obj in objs:
             self.add_object(obj)
     
+    def _on_new_object_type(self, obj_cls:Type[GameObject]):
+        # A new object type may be needed by events whose arguments were resolved without it
+        self.event_manager.invalidate()
+    
+    def get_bucket(self, obj_cls:Type[GameObject]) -> set[GameObject]:
+        """
+        Returns the set of objects of exactly the given class. The set is created if missing and kept up to date afterwards,
+        so it can be held on to across frames, but should not be modified.
+        
+        Args:
+            obj_cls (Type[GameObject]): The class of the objects.
+        
+        Returns:
+            set[GameObject]: The live set of objects of the class.
+        """
+        return self.object_buckets.get_bucket(obj_cls)
+    
+    def get_view(self, obj_cls:Type[GameObject]) -> set[GameObject]:
+        """
+        Returns the set of objects of the given class or any of its subclasses. Like `get_bucket`, the set is kept up to date
+        incrementally and can be held on to across frames, but should not be modified.
+        
+        Args:
+            obj_cls (Type[GameObject]): The base class of the objects.
+        
+        Returns:
+            set[GameObject]: The live set of objects of the class and its subclasses.
+        """
+        return self.object_buckets.get_view(obj_cls)
+    
+    def get_dynamic_bucket(self, obj_cls:Type[GameObject]) -> set[GameObject]:
+        """
+        Returns the live set of objects of exactly the given class that are not in the static partition, see `get_bucket`.
+        """
+        return self.dynamic_buckets.get_bucket(obj_cls)
+    
+    def get_dynamic_view(self, obj_cls:Type[GameObject]) -> set[GameObject]:
+        """
+        Returns the live set of objects of the given class or its subclasses that are not in the static partition, see `get_view`.
+        """
+        return self.dynamic_buckets.get_view(obj_cls)
+    
+    def _add_to_partition(self, obj:GameObject):
+        if obj.has_behavior(Immovable):
+            obj.prev_position = None
+            self.static_objects.add(obj)
+            self._static_index_dirty = True
+            return
+        self.dynamic_buckets.add(obj)
+        self.spatial_index.insert(obj)
+    
+    def _remove_from_partition(self, obj:GameObject):
+        if obj in self.static_objects:
+            self.static_objects.remove(obj)
+            self._static_index_dirty = True
+            return
+        self.dynamic_buckets.discard(obj)
+        self.spatial_index.remove(obj)
+    
+    def _add_to_behavior_index(self, obj:GameObject, behavior_types:Iterable[Type[Behavior]]):
+        if Solid in behavior_types and type(obj) not in self._solid_types:
+            self._solid_types.add(type(obj))
+            self.event_manager.invalidate()
+        for behavior_type in behavior_types:
+            if self.behavior_objects.get(behavior_type) is None:
+                self.behavior_objects[behavior_type] = {obj}
+            else:
+                self.behavior_objects[behavior_type].add(obj)
+    
+    def _remove_from_behavior_index(self, obj:GameObject, behavior_types:Iterable[Type[Behavior]]):
+        for behavior_type in behavior_types:
+            behavior_objs = self.behavior_objects.get(behavior_type)
+            if behavior_objs is not None:
+                behavior_objs.discard(obj)
+    
+    def _unlink_object(self, obj:GameObject):
+        """Removes the object from every index except game_objects"""
+        self._remove_from_partition(obj)
+        self._remove_from_behavior_index(obj, obj.behavior_types())
+        for behavior in obj.get_behaviors(PhysicsBehavior):
+            self.physics.remove(behavior)
+        self._release_object(obj)
+    
+    def _release_object(self, obj:GameObject):
+        """Frees the component store row of a removed object, then returns it to its pool"""
+        obj._detach_from_store()
+        obj._return_to_pool()
+    
+    def on_behavior_change(self, obj:GameObject, behavior:Behavior, behavior_types:list[Type[Behavior]], active:bool):
+        """
+        Called by a game object when one of its behaviors is activated, deactivated, attached or detached.
+        
+        Args:
+            obj (GameObject): The object whose behaviors changed.
+            behavior (Behavior): The behavior that changed.
+            behavior_types (list[Type[Behavior]]): The behavior types the object gained or lost entirely because of the change.
+            active (bool): True if the behavior became active, False otherwise.
+        """
+        if obj not in self.game_objects.get(type(obj), ()):
+            return
+        if isinstance(behavior, PhysicsBehavior):
+            if active:
+                self.physics.add(behavior)
+            else:
+                self.physics.remove(behavior)
+        if not behavior_types:
+            return
+        if active:
+            self._add_to_behavior_index(obj, behavior_types)
+        else:
+            self._remove_from_behavior_index(obj, behavior_types)
+        if Immovable in behavior_types:
+            if self._updating:
+                self._partitions_to_refresh[obj] = None
+            else:
+                self.refresh_partition(obj)
+    
+    def get_objects_with_behavior(self, behavior_type:Type[Behavior]) -> set[GameObject]:
+        """
+        Returns the objects that have a certain type of behavior active, subclasses of the behavior type included.
+        The returned set is kept up to date by the game manager and should not be modified.
+        
+        Args:
+            behavior_type (Type[Behavior]): The type of behavior to look for.
+        
+        Returns:
+            set[GameObject]: The objects with the behavior active.
+        """
+        behavior_objs = self.behavior_objects.get(behavior_type)
+        if behavior_objs is None:
+            behavior_objs = self.behavior_objects[behavior_type] = set()
+        return behavior_objs
+    
+    def refresh_partition(self, obj:GameObject):
+        """
+        Moves the object to the static or dynamic partition after its Immovable behavior was activated or deactivated.
+        Changes made during an update are applied with the other pending changes, see `apply_pending_changes`.
+        
+        Args:
+            obj (GameObject): The object to be checked.
+        """
+        if obj.has_behavior(Immovable) == (obj in self.static_objects):
+            return
+        self._remove_from_partition(obj)
+        self._add_to_partition(obj)
+    
+    def bake_static_index(self):
+        """
+        Builds the read-only index of the static objects. Call it once after the stage is loaded,
+        it is otherwise baked again on the next update whenever the static objects changed.
+        """
+        self.spatial_index.static = StaticIndex(self.static_objects, self.spatial_index.static.cell_size)
+        self._static_index_dirty = False
+    
     def req_delete_object(self, obj:GameObject) -> bool:
         """
         Request to delete the given object from the game_objects dictionary. Provides a warning if the object cannot be found.
+        The object is removed the next time the pending changes are applied, so it is safe to call while the objects are being iterated.
         
         Args:
             obj (Any): The object to be deleted from the game_objects dictionary.
@@ -37,24 +251,92 @@ class GameManager:
         Returns:
             bool: True if the deletion request was successful, False otherwise.
         """
+        if obj in self._objs_to_add:
+            # Spawned and destroyed within the same update, it never has to be indexed
+            del self._objs_to_add[obj]
+            self._release_object(obj)
+            return True
         if self.game_objects.get(type(obj)) is None:
             print(f"Cannot find object requested to be deleted, {type(obj)} not exist in game_objects.")
             return False
         if obj not in self.game_objects[type(obj)]:
             print(f"Cannot find object requested to be deleted. {obj} not exist in game_objects[{type(obj)}]")
             return False
+        self._objs_to_remove[obj] = None
         return True
+    
+    def apply_pending_changes(self):
+        """
+        Applies every pending removal, partition change then spawn in one batch, keeping all the indexes consistent.
+        Called at the start and at the end of `update`, costs O(k) for k pending changes.
+        """
+        if self._objs_to_remove:
+            objs_to_remove, self._objs_to_remove = self._objs_to_remove, {}
+            for obj in objs_to_remove:
+                self.object_buckets.discard(obj)
+                self._unlink_object(obj)
+        if self._partitions_to_refresh:
+            partitions_to_refresh, self._partitions_to_refresh = self._partitions_to_refresh, {}
+            for obj in partitions_to_refresh:
+                if obj in self.game_objects.get(type(obj), ()):
+                    self.refresh_partition(obj)
+        if self._objs_to_add:
+            objs_to_add, self._objs_to_add = self._objs_to_add, {}
+            for obj in objs_to_add:
+                self._link_object(obj)
             
-    def update(self):
-        # Handle other game updates
-        
+    def update(self, dt:float):
+        self._updating = True
+        try:
+            self.apply_pending_changes()
+            if self.interpolate:
+                self._record_prev_positions()
+            profiler = self.profiler
+            if profiler is None:
+                self.physics.step(dt)
+                self._refresh_spatial_index()
+                self.event_manager.update()
+            else:
+                profiler.time("game.physics", self.physics.step, dt)
+                profiler.time("game.spatial_index", self._refresh_spatial_index)
+                profiler.time("game.events", self.event_manager.update)
+            
+            self.apply_pending_changes()
+        finally:
+            self._updating = False
+    
+    def _record_prev_positions(self):
+        # Static objects never move, their prev_position stays None and they are drawn at their position
+        for objs in self.dynamic_objects.values():
+            for obj in objs:
+                obj.prev_position = obj.position
+    
+    def _refresh_spatial_index(self):
+        if self._static_index_dirty:
+            self.bake_static_index()
+        # Moving objects change position freely between updates, refresh them before the events query the index
+        for objs in self.dynamic_objects.values():
+            self.spatial_index.update_all(objs)
+
+    def draw(self, screen, alpha:float = 1.0) -> None:
+        """
+        Draws every object through the render queue, batching the draws into one blits call per layer.
         
-        for obj_to_rm in self._objs_to_remove:
-            self.game_objects[type(obj_to_rm)].remove(obj_to_rm)
+        Args:
+            screen (pygame.Surface): The surface to draw on.
+            alpha (float): How far the simulation is into the next fixed update, 0-1, such as `SceneManager.interpolation_alpha`.
+                Moving objects are drawn that far between their previous and current position when `interpolate` is set.
+        """
+        self.interpolation_alpha = alpha
+        render_queue = self.render_queue
+        for objs in self.game_objects.values():
+            for obj in objs:
+                obj.draw(render_queue)
+        render_queue.flush(screen)
 
     def delete_object(self, obj:GameObject) -> None:
         """
-        Deletes the specified object from the game object manager.
+        Deletes the specified object from the game object manager immediately. Use `req_delete_object` while the game manager is updating.
         
         Args:
             obj (Any): The object to be deleted.
@@ -64,10 +346,26 @@ class GameManager:
         """
         if self.game_objects.get(type(obj)) is None:
             raise KeyError(f"Cannot find object to be deleted, {type(obj)} not exist in game_objects.")
-        try:
-            self.game_objects[type(obj)].remove(obj)
-        except KeyError as e:
+        if obj not in self.game_objects[type(obj)]:
             raise KeyError(f"Cannot find object to be deleted. {obj} not exist in game_objects[{type(obj)}]")
+        self.object_buckets.discard(obj)
+        self._unlink_object(obj)
     
     def delete_all_objects(self) -> None:
-        self.game_objects = {}
\ No newline at end of file
+        for objs in self.game_objects.values():
+            for obj in objs:
+                self._release_object(obj)
+        for obj in self._objs_to_add:
+            self._release_object(obj)
+        self._objs_to_add = {}
+        self._objs_to_remove = {}
+        self._partitions_to_refresh = {}
+        # Cleared in place, the sets may be held by the dispatch plan of the event manager
+        self.object_buckets.clear()
+        self.dynamic_buckets.clear()
+        for objs in self.behavior_objects.values():
+            objs.clear()
+        self.static_objects = set()
+        self._static_index_dirty = False
+        self.physics.clear()
+        self.spatial_index.clear()
\ No newline at end of file
@@ -0,0 +1,229 @@
+import math
+from typing import Any
+
+import numpy as np
+
+from .abc import Behavior
+from .components import ComponentStore
+
+
+class PhysicsField:
+    """
+    Attribute of a PhysicsBehavior that lives in a column of a PhysicsSystem while the behavior is registered in one,
+    and in the behavior itself otherwise.
+    """
+    def __init__(self, *, optional:bool = False) -> None:
+        # Optional fields store None as NaN in the column
+        self.optional = optional
+    
+    def __set_name__(self, owner, name:str):
+        self.name = name
+        self.private_name = "_" + name
+    
+    def __get__(self, behavior:"PhysicsBehavior|None", owner=None) -> Any:
+        if behavior is None:
+            return self
+        table = behavior._physics_table
+        if table is None:
+            return behavior.__dict__[self.private_name]
+        value = float(table.columns[self.name][behavior._physics_slot])
+        if self.optional and math.isnan(value):
+            return None
+        return value
+    
+    def __set__(self, behavior:"PhysicsBehavior", value:Any):
+        table = behavior._physics_table
+        if table is None:
+            behavior.__dict__[self.private_name] = value
+            return
+        table.columns[self.name][behavior._physics_slot] = math.nan if value is None else value
+
+
+class PhysicsBehavior(Behavior):
+    """Behavior whose per frame update is run in a batch by a PhysicsSystem"""
+    physics_table_name:str
+    _physics_table:"BodyTable|None" = None
+    _physics_slot:int = -1
+    
+    def step(self, dt:float) -> None:
+        """Runs one physics step of this behavior alone"""
+    
+    def update(self, dt:float) -> None:
+        # Stepped by the PhysicsSystem of the game manager while registered in it
+        if not self.active or self._physics_table is not None:
+            return
+        self.step(dt)
+
+
+class BodyTable:
+    """
+    Struct of arrays holding the fields of every registered behavior of one kind.
+    
+    Rows are kept packed at the start of the columns, removing a behavior moves the last row into its slot.
+    """
+    def __init__(self, fields:tuple[str, ...], capacity:int = 64) -> None:
+        self.fields = fields
+        self.columns:dict[str, np.ndarray] = {field:np.zeros(capacity) for field in fields}
+        # Entity id in the component store of the object each behavior moves, -1 without a component store
+        self.entity_ids = np.full(capacity, -1, dtype=np.intp)
+        self.behaviors:list[PhysicsBehavior] = []
+        self._ref_counts:dict[int, int] = {}
+        self.shared_refs = 0
+    
+    def __len__(self) -> int:
+        return len(self.behaviors)
+    
+    def view(self, field:str) -> np.ndarray:
+        """Returns the column of the field for the registered behaviors, writing into it writes into the behaviors"""
+        return self.columns[field][:len(self.behaviors)]
+    
+    def entity_view(self) -> np.ndarray:
+        """Returns the entity ids of the objects moved by the registered behaviors"""
+        return self.entity_ids[:len(self.behaviors)]
+    
+    def _grow(self):
+        for field, column in self.columns.items():
+            new_column = np.zeros(len(column) * 2)
+            new_column[:len(column)] = column
+            self.columns[field] = new_column
+        new_entity_ids = np.full(len(self.entity_ids) * 2, -1, dtype=np.intp)
+        new_entity_ids[:len(self.entity_ids)] = self.entity_ids
+        self.entity_ids = new_entity_ids
+    
+    def _count_ref(self, ref:Any, change:int):
+        """Tracks how many objects are moved by more than one behavior of the table"""
+        ref_id = id(ref)
+        count = self._ref_counts.get(ref_id, 0)
+        new_count = count + change
+        if new_count:
+            self._ref_counts[ref_id] = new_count
+        else:
+            del self._ref_counts[ref_id]
+        if count == 1 and new_count == 2:
+            self.shared_refs += 1
+        elif count == 2 and new_count == 1:
+            self.shared_refs -= 1
+    
+    def add(self, behavior:PhysicsBehavior):
+        if behavior._physics_table is not None:
+            raise ValueError(f"{behavior} is already registered in a physics system")
+        slot = len(self.behaviors)
+        if slot == len(self.columns[self.fields[0]]):
+            self._grow()
+        for field in self.fields:
+            value = behavior.__dict__[f"_{field}"]
+            self.columns[field][slot] = math.nan if value is None else value
+        self.entity_ids[slot] = behavior._ref._entity_id
+        self.behaviors.append(behavior)
+        self._count_ref(behavior._ref, 1)
+        behavior._physics_table = self
+        behavior._physics_slot = slot
+    
+    def remove(self, behavior:PhysicsBehavior):
+        if behavior._physics_table is not self:
+            return
+        # Hand the current values back to the behavior so it keeps working on its own
+        values = {field:getattr(behavior, field) for field in self.fields}
+        slot = behavior._physics_slot
+        last_slot = len(self.behaviors) - 1
+        if slot != last_slot:
+            last_behavior = self.behaviors[last_slot]
+            for column in self.columns.values():
+                column[slot] = column[last_slot]
+            self.entity_ids[slot] = self.entity_ids[last_slot]
+            self.behaviors[slot] = last_behavior
+            last_behavior._physics_slot = slot
+        self.behaviors.pop()
+        self._count_ref(behavior._ref, -1)
+        behavior._physics_table = None
+        behavior._physics_slot = -1
+        for field, value in values.items():
+            setattr(behavior, field, value)
+    
+    def clear(self):
+        for behavior in list(self.behaviors):
+            self.remove(behavior)
+
+
+class PhysicsSystem:
+    """
+    Steps every registered Projectile and Gravity behavior in one vectorized pass per frame.
+    
+    With a component store the results are applied straight to its columns, otherwise they are
+    written back to the x, y and velocity_y of the objects the behaviors are attached to.
+    """
+    def __init__(self, component_store:ComponentStore|None = None) -> None:
+        self.component_store = component_store
+        self.tables:dict[str, BodyTable] = {
+            "projectiles":BodyTable(("speed", "angle", "accel")),
+            "gravities":BodyTable(("accel", "terminal_velo")),
+        }
+    
+    def add(self, behavior:PhysicsBehavior):
+        self.tables[behavior.physics_table_name].add(behavior)
+    
+    def remove(self, behavior:PhysicsBehavior):
+        self.tables[behavior.physics_table_name].remove(behavior)
+    
+    def clear(self):
+        for table in self.tables.values():
+            table.clear()
+    
+    def step(self, dt:float):
+        """Runs one update of every registered behavior"""
+        self._step_projectiles(dt)
+        self._step_gravities(dt)
+    
+    def _step_projectiles(self, dt:float):
+        table = self.tables["projectiles"]
+        if not len(table):
+            return
+        speed = table.view("speed")
+        angle = table.view("angle")
+        speed_change = speed * table.view("accel") * (dt / 2)
+        speed += speed_change
+        magnitude = speed * dt
+        move_x = magnitude * np.cos(angle)
+        move_y = magnitude * np.sin(angle)
+        speed += speed_change
+        
+        if self.component_store is not None:
+            entity_ids = table.entity_view()
+            # add.at sums the moves of several projectiles attached to the same object
+            np.add.at(self.component_store.view("x"), entity_ids, move_x)
+            np.add.at(self.component_store.view("y"), entity_ids, move_y)
+            return
+        move_x, move_y = move_x.tolist(), move_y.tolist()
+        for behavior, change_x, change_y in zip(table.behaviors, move_x, move_y):
+            ref = behavior._ref
+            ref.x += change_x
+            ref.y += change_y
+    
+    def _step_gravities(self, dt:float):
+        table = self.tables["gravities"]
+        if not len(table):
+            return
+        if table.shared_refs:
+            # Several gravities on one object depend on each other's result, step them one by one
+            for behavior in table.behaviors:
+                behavior.step(dt)
+            return
+        
+        if self.component_store is not None:
+            entity_ids = table.entity_view()
+            velocity_column = self.component_store.view("velocity_y")
+            curr_velo = velocity_column[entity_ids]
+        else:
+            refs = [behavior._ref for behavior in table.behaviors]
+            curr_velo = np.fromiter((ref.velocity_y for ref in refs), float, len(refs))
+        velo_change = -table.view("accel") * dt
+        terminal_velo = table.view("terminal_velo")
+        # Same rule as Gravity.step, a terminal velocity of None or 0 never applies the change
+        apply = (terminal_velo != 0) & (curr_velo + velo_change > terminal_velo)
+        new_velo = np.where(apply, curr_velo + velo_change, curr_velo)
+        
+        if self.component_store is not None:
+            velocity_column[entity_ids] = new_velo
+            return
+        for ref, velocity_y in zip(refs, new_velo.tolist()):
+            ref.velocity_y = velocity_y
@@ -0,0 +1,2 @@
+from .broad_phase import BroadPhase, SpatialHashGrid, SweepAndPrune
+from .static_index import StaticIndex, PartitionedIndex
@@ -0,0 +1,322 @@
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
+from typing import Collection, Iterable, Iterator, Mapping
+
+from ..abc import GameObject
+
+Rect = tuple[float, float, float, float]
+
+def get_cell_range(rect:Rect, cell_size:float) -> tuple[int, int, int, int]:
+    """Returns the (left, top, right, bottom) grid cells covered by the rect, inclusive"""
+    x, y, w, h = rect
+    return int(x // cell_size), int(y // cell_size), int((x + w) // cell_size), int((y + h) // cell_size)
+
+class BroadPhase(ABC):
+    """
+    Spatial index used to find the objects that could be touching each other.
+    
+    The broad phase only narrows down candidates, the exact collision test is still done by the event using it.
+    """
+    @abstractmethod
+    def insert(self, obj:GameObject) -> None:...
+    """
+    Adds the object to the index using its current rect.
+    """
+    
+    @abstractmethod
+    def remove(self, obj:GameObject) -> None:...
+    """
+    Removes the object from the index. Does nothing if the object is not in the index.
+    """
+    
+    @abstractmethod
+    def update(self, obj:GameObject) -> None:...
+    """
+    Refreshes the position of the object in the index after it moved.
+    """
+    
+    @abstractmethod
+    def query(self, rect:Rect) -> Iterable[GameObject]:...
+    """
+    Returns every indexed object that could be touching the given rect, each object at most once.
+    """
+    
+    @abstractmethod
+    def clear(self) -> None:...
+    
+    @abstractmethod
+    def __contains__(self, obj:GameObject) -> bool:...
+    
+    @abstractmethod
+    def __len__(self) -> int:...
+    
+    def update_all(self, objs:Iterable[GameObject]) -> None:
+        """
+        Refreshes every given object, inserting the ones not indexed yet.
+        """
+        for obj in objs:
+            if obj in self:
+                self.update(obj)
+            else:
+                self.insert(obj)
+    
+    def query_pairs(self, objs1:Collection[GameObject], objs2:Collection[GameObject]) -> Iterator[tuple[GameObject, GameObject]]:
+        """
+        Yields the candidate pairs between the two groups of objects.
+        
+        Like the loop over every pair it replaces, an object in both groups is also paired with itself.
+        
+        Args:
+            objs1 (Collection[GameObject]): The first group of objects.
+            objs2 (Collection[GameObject]): The second group of objects, should support fast membership tests (e.g. a set).
+        
+        Yields:
+            tuple[GameObject, GameObject]: Pairs of (obj1, obj2) that are close enough to be tested.
+        """
+        if not isinstance(objs2, (set, frozenset)):
+            objs2 = set(objs2)
+        for obj1 in objs1:
+            for obj2 in self.query(obj1.rect):
+                if obj2 in objs2:
+                    yield obj1, obj2
+
+
+class SpatialHashGrid(BroadPhase):
+    """
+    Uniform grid broad phase. Every object is stored in all the cells its rect covers.
+    
+    Works best when `cell_size` is around the size of the common moving objects.
+    """
+    def __init__(self, cell_size:float = 64) -> None:
+        if cell_size <= 0:
+            raise ValueError(f"cell_size must be positive, got {cell_size}")
+        self.cell_size = cell_size
+        self.cells:dict[tuple[int, int], set[GameObject]] = {}
+        self._obj_cells:dict[GameObject, tuple[int, int, int, int]] = {}
+    
+    def _get_cell_range(self, rect:Rect) -> tuple[int, int, int, int]:
+        return get_cell_range(rect, self.cell_size)
+    
+    def _add_to_cells(self, obj:GameObject, cell_range:tuple[int, int, int, int]) -> None:
+        cells = self.cells
+        left, top, right, bottom = cell_range
+        for cell_x in range(left, right + 1):
+            for cell_y in range(top, bottom + 1):
+                cell = cells.get((cell_x, cell_y))
+                if cell is None:
+                    cells[(cell_x, cell_y)] = {obj}
+                else:
+                    cell.add(obj)
+    
+    def _remove_from_cells(self, obj:GameObject, cell_range:tuple[int, int, int, int]) -> None:
+        cells = self.cells
+        left, top, right, bottom = cell_range
+        for cell_x in range(left, right + 1):
+            for cell_y in range(top, bottom + 1):
+                cell = cells[(cell_x, cell_y)]
+                cell.discard(obj)
+                if not cell:
+                    del cells[(cell_x, cell_y)]
+    
+    def insert(self, obj:GameObject) -> None:
+        if obj in self._obj_cells:
+            self.update(obj)
+            return
+        cell_range = self._get_cell_range(obj.rect)
+        self._obj_cells[obj] = cell_range
+        self._add_to_cells(obj, cell_range)
+    
+    def remove(self, obj:GameObject) -> None:
+        cell_range = self._obj_cells.pop(obj, None)
+        if cell_range is None:
+            return
+        self._remove_from_cells(obj, cell_range)
+    
+    def update(self, obj:GameObject) -> None:
+        old_range = self._obj_cells.get(obj)
+        if old_range is None:
+            self.insert(obj)
+            return
+        new_range = self._get_cell_range(obj.rect)
+        if new_range == old_range:
+            return
+        self._remove_from_cells(obj, old_range)
+        self._add_to_cells(obj, new_range)
+        self._obj_cells[obj] = new_range
+    
+    def query(self, rect:Rect) -> set[GameObject]:
+        cells = self.cells
+        left, top, right, bottom = self._get_cell_range(rect)
+        if left == right and top == bottom:
+            return set(cells.get((left, top), ()))
+        
+        result:set[GameObject] = set()
+        for cell_x in range(left, right + 1):
+            for cell_y in range(top, bottom + 1):
+                cell = cells.get((cell_x, cell_y))
+                if cell:
+                    result.update(cell)
+        return result
+    
+    def clear(self) -> None:
+        self.cells = {}
+        self._obj_cells = {}
+    
+    def __contains__(self, obj:GameObject) -> bool:
+        return obj in self._obj_cells
+    
+    def __len__(self) -> int:
+        return len(self._obj_cells)
+
+
+
+class SweepAndPrune(BroadPhase):
+    """
+    Sorted axis broad phase. Objects are kept sorted by their left edge between frames.
+    
+    Objects barely move from one frame to the next, so the list stays almost sorted and
+    re-sorting it with an insertion sort costs close to O(n) instead of a full sort.
+    """
+    def __init__(self) -> None:
+        self._objs:list[GameObject] = []
+        self._bounds:dict[GameObject, tuple[float, float, float, float]] = {}
+        self._lefts:list[float] = []
+        self._max_width:float = 0
+        self._sorted = True
+    
+    @staticmethod
+    def _get_bounds(rect:Rect) -> tuple[float, float, float, float]:
+        x, y, w, h = rect
+        return x, y, x + w, y + h
+    
+    def _sort(self) -> None:
+        """Insertion sort of the objects on their left edge, cheap when the list is almost sorted"""
+        objs, bounds = self._objs, self._bounds
+        for index in range(1, len(objs)):
+            obj = objs[index]
+            left = bounds[obj][0]
+            prev_index = index - 1
+            while prev_index >= 0 and bounds[objs[prev_index]][0] > left:
+                objs[prev_index + 1] = objs[prev_index]
+                prev_index -= 1
+            objs[prev_index + 1] = obj
+        
+        self._lefts = [bounds[obj][0] for obj in objs]
+        self._max_width = max((right - left for left, _, right, _ in bounds.values()), default=0)
+        self._sorted = True
+    
+    def insert(self, obj:GameObject) -> None:
+        if obj in self._bounds:
+            self.update(obj)
+            return
+        self._bounds[obj] = self._get_bounds(obj.rect)
+        self._objs.append(obj)
+        self._sorted = False
+    
+    def remove(self, obj:GameObject) -> None:
+        if self._bounds.pop(obj, None) is None:
+            return
+        self._objs.remove(obj)
+        self._sorted = False
+    
+    def update(self, obj:GameObject) -> None:
+        if obj not in self._bounds:
+            self.insert(obj)
+            return
+        bounds = self._get_bounds(obj.rect)
+        if bounds != self._bounds[obj]:
+            self._bounds[obj] = bounds
+            self._sorted = False
+
+    def covers(self, obj:GameObject, rect:Rect) -> bool:
+        """
+        Returns if the bounds the object is indexed with contain the rect, queries made since then found
+        everything that could touch the object at that rect.
+        """
+        left, top, right, bottom = self._bounds[obj]
+        x, y, w, h = rect
+        return left <= x and top <= y and x + w <= right and y + h <= bottom
+    
+    def move(self, obj:GameObject) -> None:
+        """
+        Refreshes a single object and moves it to its sorted place right away, for objects moved between queries.
+
+        `update` defers the sort to the next query, which is cheaper for many objects but walks the whole list again.
+        """
+        if not self._sorted or obj not in self._bounds:
+            self.update(obj)
+            return
+        old_bounds = self._bounds[obj]
+        bounds = self._get_bounds(obj.rect)
+        if bounds == old_bounds:
+            return
+        self._bounds[obj] = bounds
+        objs, lefts = self._objs, self._lefts
+        index = bisect_left(lefts, old_bounds[0])
+        while objs[index] is not obj:
+            index += 1
+        del objs[index]
+        del lefts[index]
+        index = bisect_right(lefts, bounds[0])
+        objs.insert(index, obj)
+        lefts.insert(index, bounds[0])
+        self._max_width = max(self._max_width, bounds[2] - bounds[0])
+
+    def query(self, rect:Rect) -> list[GameObject]:
+        if not self._sorted:
+            self._sort()
+        left, top, right, bottom = self._get_bounds(rect)
+        objs, bounds = self._objs, self._bounds
+        start = bisect_left(self._lefts, left - self._max_width)
+        end = bisect_right(self._lefts, right)
+        result:list[GameObject] = []
+        for index in range(start, end):
+            obj = objs[index]
+            _, obj_top, obj_right, obj_bottom = bounds[obj]
+            if obj_right >= left and obj_bottom >= top and obj_top <= bottom:
+                result.append(obj)
+        return result
+    
+    def candidate_pairs(self, static:Mapping[GameObject, bool]|None = None) -> Iterator[tuple[GameObject, GameObject]]:
+        """
+        Sweeps the sorted objects and yields every pair with touching bounds.
+        
+        Args:
+            static (Mapping[GameObject, bool] | None): Marks the objects that never move. Pairs of two static objects are skipped without being tested.
+        
+        Yields:
+            tuple[GameObject, GameObject]: Pairs of objects whose bounds touch or overlap.
+        """
+        if not self._sorted:
+            self._sort()
+        objs, bounds, lefts = self._objs, self._bounds, self._lefts
+        count = len(objs)
+        for index1 in range(count):
+            obj1 = objs[index1]
+            _, top1, right1, bottom1 = bounds[obj1]
+            obj1_static = static is not None and static[obj1]
+            index2 = index1 + 1
+            while index2 < count and lefts[index2] <= right1:
+                obj2 = objs[index2]
+                index2 += 1
+                if obj1_static and static[obj2]:
+                    continue
+                _, top2, _, bottom2 = bounds[obj2]
+                if top2 <= bottom1 and top1 <= bottom2:
+                    yield obj1, obj2
+    
+    def clear(self) -> None:
+        self._objs = []
+        self._bounds = {}
+        self._lefts = []
+        self._max_width = 0
+        self._sorted = True
+    
+    def __contains__(self, obj:GameObject) -> bool:
+        return obj in self._bounds
+    
+    def __len__(self) -> int:
+        return len(self._bounds)
+    
+    def __iter__(self) -> Iterator[GameObject]:
+        return iter(self._bounds)
@@ -0,0 +1,106 @@
+from typing import Collection, Iterable, Iterator
+
+from ..abc import GameObject
+from .broad_phase import BroadPhase, Rect, get_cell_range
+
+class StaticIndex:
+    """
+    Read-only grid of the objects that never move, baked once when the stage loads.
+    
+    Every cell stores a tuple of its objects, so queries never pay for keeping the index up to date.
+    Bake a new index instead of modifying it.
+    """
+    def __init__(self, objs:Iterable[GameObject] = (), cell_size:float = 64) -> None:
+        if cell_size <= 0:
+            raise ValueError(f"cell_size must be positive, got {cell_size}")
+        self.cell_size = cell_size
+        
+        cells:dict[tuple[int, int], list[GameObject]] = {}
+        for obj in objs:
+            left, top, right, bottom = get_cell_range(obj.rect, cell_size)
+            for cell_x in range(left, right + 1):
+                for cell_y in range(top, bottom + 1):
+                    cell = cells.get((cell_x, cell_y))
+                    if cell is None:
+                        cells[(cell_x, cell_y)] = [obj]
+                    else:
+                        cell.append(obj)
+        
+        self.cells:dict[tuple[int, int], tuple[GameObject, ...]] = {cell:tuple(cell_objs) for cell, cell_objs in cells.items()}
+        self._objs = frozenset(obj for cell_objs in self.cells.values() for obj in cell_objs)
+    
+    def query(self, rect:Rect) -> Collection[GameObject]:
+        """
+        Returns every static object that could be touching the given rect, each object at most once.
+        """
+        cells = self.cells
+        left, top, right, bottom = get_cell_range(rect, self.cell_size)
+        if left == right and top == bottom:
+            return cells.get((left, top), ())
+        
+        result:set[GameObject] = set()
+        for cell_x in range(left, right + 1):
+            for cell_y in range(top, bottom + 1):
+                cell = cells.get((cell_x, cell_y))
+                if cell:
+                    result.update(cell)
+        return result
+    
+    def __contains__(self, obj:GameObject) -> bool:
+        return obj in self._objs
+    
+    def __len__(self) -> int:
+        return len(self._objs)
+    
+    def __iter__(self) -> Iterator[GameObject]:
+        return iter(self._objs)
+
+
+class PartitionedIndex(BroadPhase):
+    """
+    Spatial index split between the moving objects and the baked static objects.
+    
+    Only the dynamic partition is updated every frame, and pairs of two static objects are never returned.
+    """
+    def __init__(self, dynamic:BroadPhase, static:StaticIndex|None = None) -> None:
+        self.dynamic = dynamic
+        self.static = static if static is not None else StaticIndex()
+    
+    def insert(self, obj:GameObject) -> None:
+        self.dynamic.insert(obj)
+    
+    def remove(self, obj:GameObject) -> None:
+        self.dynamic.remove(obj)
+    
+    def update(self, obj:GameObject) -> None:
+        self.dynamic.update(obj)
+    
+    def query(self, rect:Rect) -> set[GameObject]:
+        result = set(self.dynamic.query(rect))
+        result.update(self.static.query(rect))
+        return result
+    
+    def query_pairs(self, objs1:Collection[GameObject], objs2:Collection[GameObject]) -> Iterator[tuple[GameObject, GameObject]]:
+        if not isinstance(objs2, (set, frozenset)):
+            objs2 = set(objs2)
+        dynamic, static = self.dynamic, self.static
+        for obj1 in objs1:
+            rect = obj1.rect
+            for obj2 in dynamic.query(rect):
+                if obj2 in objs2:
+                    yield obj1, obj2
+            if obj1 in static:
+                continue
+            for obj2 in static.query(rect):
+                if obj2 in objs2:
+                    yield obj1, obj2
+    
+    def clear(self) -> None:
+        self.dynamic.clear()
+        self.static = StaticIndex(cell_size=self.static.cell_size)
+    
+    def __contains__(self, obj:GameObject) -> bool:
+        return obj in self.dynamic or obj in self.static
+    
+    def __len__(self) -> int:
+        return len(self.dynamic) + len(self.static)
@@ -0,0 +1,71 @@
+from typing import Any, Callable, Type
+
+
+class TypeBuckets:
+    """
+    Sets of objects keyed by their exact type, plus views keyed by base class holding every object of the class and its subclasses.
+    
+    Views are created on first request and then updated incrementally, each type caches the views it belongs to
+    so adding or removing an object never walks the MRO.
+    """
+    def __init__(self, on_new_type:Callable[[type], None]|None = None) -> None:
+        '''
+        Args:
+            on_new_type (Callable[[type], None] | None): Called with the type when a bucket is created for a new type.
+        '''
+        self.buckets:dict[type, set[Any]] = {}
+        self.views:dict[type, set[Any]] = {}
+        self._type_views:dict[type, tuple[set[Any], ...]] = {}
+        self._on_new_type = on_new_type
+    
+    def _get_type_views(self, obj_type:type) -> tuple[set[Any], ...]:
+        type_views = self._type_views.get(obj_type)
+        if type_views is None:
+            views = self.views
+            type_views = self._type_views[obj_type] = tuple(views[cls] for cls in obj_type.__mro__ if cls in views)
+        return type_views
+    
+    def get_bucket(self, obj_type:type) -> set[Any]:
+        """Returns the live set of objects of exactly this type, created empty if missing"""
+        bucket = self.buckets.get(obj_type)
+        if bucket is None:
+            bucket = self.buckets[obj_type] = set()
+            if self._on_new_type is not None:
+                self._on_new_type(obj_type)
+        return bucket
+    
+    def get_view(self, base_type:type) -> set[Any]:
+        """Returns the live set of objects of this type or any of its subclasses, the first request costs one pass over the buckets"""
+        view = self.views.get(base_type)
+        if view is not None:
+            return view
+        view = self.views[base_type] = set()
+        for obj_type, bucket in self.buckets.items():
+            if issubclass(obj_type, base_type):
+                view.update(bucket)
+        # The cached views of the types below this base class are now missing it
+        self._type_views = {}
+        return view
+    
+    def add(self, obj:Any):
+        self.get_bucket(type(obj)).add(obj)
+        for view in self._get_type_views(type(obj)):
+            view.add(obj)
+    
+    def discard(self, obj:Any):
+        bucket = self.buckets.get(type(obj))
+        if bucket is None:
+            return
+        bucket.discard(obj)
+        for view in self._get_type_views(type(obj)):
+            view.discard(obj)
+    
+    def clear(self):
+        """Empties every bucket and view in place, so the live sets handed out stay valid"""
+        for bucket in self.buckets.values():
+            bucket.clear()
+        for view in self.views.values():
+            view.clear()
+    
+    def __contains__(self, obj:Any) -> bool:
+        return obj in self.buckets.get(type(obj), ())
@@ -1,3 +1,5 @@
+import argparse
+
 import pygame
 pygame.init()
 
@@ -5,32 +7,40 @@ import better_pygame
 from scenes import *
 
 def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--record", help="Record the input and frame times to this path")
+    parser.add_argument("--replay", help="Replay a recording as fast as possible instead of playing")
+    parser.add_argument("--no-draw", action="store_true", help="Skip drawing while replaying")
+    args = parser.parse_args()
+
     SCREEN_SIZE = SCREEN_WIDTH, SCREEN_HEIGHT = 1280, 720
     screen = pygame.display.set_mode(SCREEN_SIZE)
-    scene_manager = better_pygame.SceneManager(SCREEN_SIZE)
+    # Images loaded while importing the scenes could not be converted without a display
+    better_pygame.asset_manager.convert_loaded()
+    scene_manager = better_pygame.SceneManager(SCREEN_SIZE, dirty_rects=True, max_loaded_scenes=4)
+    # Scene classes are built on first use
     scenes = {
-        "menu":MenuScene(scene_manager)
+        "menu":MenuScene
     }
     scene_manager.init_scenes(scenes)
     
     
     
     
-    running = True
-    clock = pygame.time.Clock()
-    dt = 0
-    while running:
-        events = pygame.event.get()
-        for event in events:
-            if event.type == pygame.QUIT:
-                running = False
-            scene_manager.handle_event(event)
-
-        scene_manager.update(dt)
-        
-        scene_manager.draw(screen)
-        pygame.display.update()
-        dt = clock.tick(60)/1000
+    # Simulation at a fixed 60 updates per second, drawing capped at 60 fps so the idle menu stays light
+    if args.replay:
+        replay = better_pygame.InputReplay(args.replay)
+        game_loop = better_pygame.GameLoop(scene_manager, screen, update_rate=60)
+        elapsed = game_loop.replay(replay, draw=not args.no_draw)
+        print(f"Replayed {len(replay)} frames ({replay.total_time:.2f} s recorded) in {elapsed:.3f} s")
+        return
+    recorder = better_pygame.InputRecorder(args.record) if args.record else None
+    game_loop = better_pygame.GameLoop(scene_manager, screen, update_rate=60, max_fps=60, recorder=recorder)
+    try:
+        game_loop.run()
+    finally:
+        if recorder is not None:
+            recorder.close()
             
 
 
@@ -3,14 +3,15 @@ import pygame_gui
 import better_pygame
 
 class MenuScene(better_pygame.Scene):
+    assets = (("assets/menu_bg.png", (1280, 720)),)
+    
     def __init__(self, scene_manager:better_pygame.SceneManager) -> None:
         super().__init__(scene_manager)
         self.scene_manager = scene_manager
         self.screen_size = scene_manager.screen_size
         self.ui_manager = pygame_gui.UIManager(self.screen_size, theme_path="themes/menu_theme.json")
         
-        self.bg_img = pygame.image.load("assets/menu_bg.png")
-        self.bg_img = pygame.transform.scale(self.bg_img, (1280, 720))
+        self.bg_img = better_pygame.asset_manager.load("assets/menu_bg.png", (1280, 720))
         
         self.title = pygame_gui.elements.UILabel(pygame.Rect(0, -100, self.screen_size[0], 200),
                                                  "New Game",
@@ -36,6 +37,10 @@ class MenuScene(better_pygame.Scene):
                                                       anchors={"center":"center"},
                                                       object_id=pygame_gui.core.ObjectID("#map_making_btn", "@menu_btn"))
         
+        # The menu is static apart from its ui elements, only their changes are redrawn
+        self.set_dirty_rect_tracking(True)
+        self._ui_states:dict = {}
+        
     def handle_event(self, event: pygame.Event):
         self.ui_manager.process_events(event)
         
@@ -49,12 +54,31 @@ class MenuScene(better_pygame.Scene):
     
     def update(self, dt: float):
         self.ui_manager.update(dt)
+        self._mark_changed_ui()
+    
+    def _mark_changed_ui(self):
+        '''Mark the regions of the ui elements whose image, position or visibility changed as dirty'''
+        ui_states = {}
+        for sprite in self.ui_manager.get_sprite_group().sprites():
+            state = (sprite.image, pygame.Rect(sprite.rect), sprite.visible)
+            ui_states[sprite] = state
+            prev_state = self._ui_states.pop(sprite, None)
+            if prev_state is None or prev_state[0] is not state[0] or prev_state[1:] != state[1:]:
+                self.mark_dirty(state[1])
+                if prev_state is not None:
+                    self.mark_dirty(prev_state[1])
+        for prev_state in self._ui_states.values():
+            self.mark_dirty(prev_state[1])
+        self._ui_states = ui_states
     
     
     def draw(self, screen: pygame.Surface):
         screen.blit(self.bg_img, (0, 0))
         self.ui_manager.draw_ui(screen)
     
+    def unload(self):
+        better_pygame.asset_manager.release("assets/menu_bg.png", (1280, 720))
+    
 
 
 class GameScene(better_pygame.Scene):
@@ -0,0 +1,17 @@
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def restore_solid_types():
+    '''Solid registers the types of its objects on the class, shared by every game manager'''
+    from game.behaviors.behavior import Solid
+    solids = set(Solid.solids)
+    yield
+    Solid.solids.clear()
+    Solid.solids.update(solids)
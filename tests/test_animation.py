@@ -0,0 +1,88 @@
+import pygame
+import pytest
+
+from better_pygame import Animation, AnimationTimeline, MultiAnimation
+from better_pygame.animation_system import AnimationSystem
+
+
+def test_timeline_frame_at():
+    timeline = AnimationTimeline([0.1, 0.2, 0.3])
+    assert timeline.total == pytest.approx(0.6)
+    assert [timeline.frame_at(time) for time in (0, 0.05, 0.1, 0.29, 0.31, 0.59)] == [0, 0, 1, 1, 2, 2]
+
+
+def test_timer_setter_seeks_within_the_current_frame():
+    animation = Animation([pygame.Surface((1, 1)) for _ in range(4)], 10)
+    animation.update(0.15)
+    assert animation.current_frame == 1
+    animation.timer = 0.02
+    assert animation.current_frame == 1
+    assert animation.timer == pytest.approx(0.02)
+    animation.update(0.03)
+    assert animation.current_frame == 2
+
+
+def test_timer_setter_with_time_offset():
+    animation = Animation([pygame.Surface((1, 1)) for _ in range(4)], 10, time_offset=0.05)
+    animation.timer = 0.01
+    assert animation.current_frame == 0
+    assert animation.timer == pytest.approx(0.01)
+
+
+def make_animation(frame_count:int = 4) -> Animation:
+    return Animation([pygame.Surface((1, 1)) for _ in range(frame_count)], 10)
+
+
+def test_system_only_advances_the_current_animation_of_a_multi_animation():
+    idle, run = make_animation(), make_animation()
+    multi_animation = MultiAnimation({"idle":idle, "run":run})
+    system = AnimationSystem()
+    system.add(multi_animation)
+    # Picks the first animation like MultiAnimation.update
+    assert multi_animation.curr_animation is idle
+    assert len(system) == 1
+    system.update(0.15)
+    assert (idle.current_frame, run.current_frame) == (1, 0)
+
+    multi_animation.switch_animation("run")
+    system.update(0.1)
+    assert (idle.current_frame, run.current_frame) == (1, 1)
+    assert idle.cycle_time == pytest.approx(0.15)
+
+    system.remove(multi_animation)
+    assert len(system) == 0
+    assert run.cycle_time == pytest.approx(0.1)
+
+
+def test_system_matches_the_updates_of_a_multi_animation():
+    system = AnimationSystem()
+    registered = MultiAnimation({"idle":make_animation(), "run":make_animation(6)}, "idle")
+    updated = MultiAnimation({"idle":make_animation(), "run":make_animation(6)}, "idle")
+    system.add(registered)
+    for step in range(30):
+        if step == 10:
+            registered.switch_animation("run")
+            updated.switch_animation("run")
+        system.update(0.07)
+        updated.update(0.07)
+        for key in ("idle", "run"):
+            assert registered.animations[key].current_frame == updated.animations[key].current_frame
+            assert registered.animations[key].cycle_time == pytest.approx(updated.animations[key].cycle_time)
+
+
+def test_seek_keeps_the_system_frame_in_sync():
+    changed = []
+    animation = make_animation()
+    system = AnimationSystem(changed.append)
+    system.add(animation)
+    system.update(0.25)
+    assert animation.current_frame == 2
+    animation.seek(0)
+    # Back to frame 0, then to frame 2 again, which the system saw last
+    system.update(0.25)
+    assert animation.current_frame == 2
+    assert changed == [animation, animation]
+
+    animation.seek_frame(1)
+    assert system.update(0.01) == []
+    assert animation.current_frame == 1
@@ -0,0 +1,55 @@
+import pygame
+import pytest
+
+from better_pygame.assets import AssetManager
+
+
+@pytest.fixture
+def image_path(tmp_path):
+    path = str(tmp_path / "image.png")
+    pygame.image.save(pygame.Surface((16, 16)), path)
+    return path
+
+
+def test_references_keep_the_image_cached(image_path):
+    assets = AssetManager()
+    image = assets.load(image_path)
+    assert assets.load(image_path) is image
+    assert assets.get_refcount(image_path) == 2
+    assets.release(image_path)
+    assert image_path in assets
+    assets.release(image_path)
+    assert image_path not in assets
+    with pytest.raises(KeyError):
+        assets.release(image_path)
+
+
+def test_release_without_reference_raises(image_path):
+    assets = AssetManager()
+    assets.preload([image_path]).wait()
+    assert image_path in assets and assets.get_refcount(image_path) == 0
+    with pytest.raises(KeyError):
+        assets.release(image_path)
+    # The preloaded image is still cached for the first load
+    assert image_path in assets
+    assets.load(image_path)
+    assets.release(image_path)
+    assert image_path not in assets
+
+
+def test_images_loaded_before_the_display_are_converted_once_it_is_set(image_path):
+    pygame.display.quit()
+    assets = AssetManager()
+    image = assets.load(image_path, (8, 8))
+    pygame.display.init()
+    try:
+        screen = pygame.display.set_mode((32, 32))
+        assets.convert_loaded()
+        converted = assets.load(image_path, (8, 8))
+        assert converted is not image
+        assert converted.get_bitsize() == screen.get_bitsize()
+        # Converted once, later loads share it
+        assert assets.load(image_path, (8, 8)) is converted
+        assert assets.get_refcount(image_path, (8, 8)) == 3
+    finally:
+        pygame.display.quit()
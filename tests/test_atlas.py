@@ -0,0 +1,41 @@
+import os
+
+import pygame
+
+from better_pygame import TextureAtlas, asset_manager
+
+
+def test_loaded_sheet_is_evicted_after_release(tmp_path):
+    frames = {"default":[pygame.Surface((4, 4)) for _ in range(3)]}
+    path = str(tmp_path / "atlas.png")
+    TextureAtlas.pack(frames).save(path)
+
+    atlas = TextureAtlas.load(path)
+    other = TextureAtlas.load(path)
+    assert asset_manager.get_refcount(path) == 2
+    atlas.release()
+    atlas.release()
+    assert asset_manager.get_refcount(path) == 1
+    other.release()
+    assert path not in asset_manager
+
+
+def test_rebuilt_sheet_replaces_the_cached_one(tmp_path):
+    frame_path = str(tmp_path / "frame.png")
+    frame = pygame.Surface((4, 4))
+    frame.fill((255, 0, 0))
+    pygame.image.save(frame, frame_path)
+    path = str(tmp_path / "atlas.png")
+    old = TextureAtlas.load_or_build(path, {"default":[frame_path]})
+
+    frame.fill((0, 0, 255))
+    pygame.image.save(frame, frame_path)
+    # Saved in the same second on some file systems
+    os.utime(frame_path, (0, 0))
+    new = TextureAtlas.load_or_build(path, {"default":[frame_path]})
+    assert new.get_frames()[0].get_at((0, 0))[:3] == (0, 0, 255)
+    assert old.get_frames()[0].get_at((0, 0))[:3] == (255, 0, 0)
+    assert asset_manager.get_refcount(path) == 2
+    old.release()
+    new.release()
+    assert path not in asset_manager
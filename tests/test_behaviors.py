@@ -0,0 +1,64 @@
+import pytest
+
+from game.abc import GameObject
+from game.behaviors.behavior import Anchor, Immovable, JumpThru
+from game.game_manager import GameManager
+
+
+class Drone(GameObject):
+    ...
+
+
+class Magnet(Anchor):
+    ...
+
+
+def test_behavior_index_follows_activation():
+    game_manager = GameManager((100, 100), [])
+    drone = Drone(game_manager, (0, 0), (10, 10))
+    magnet = Magnet(active=False)
+    drone.behaviors = [magnet, JumpThru()]
+
+    assert not drone.has_behavior(Anchor)
+    assert drone not in game_manager.get_objects_with_behavior(Anchor)
+    assert drone in game_manager.get_objects_with_behavior(JumpThru)
+
+    magnet.active = True
+    # Indexed under the base classes of the behavior too
+    assert drone.get_behaviors(Anchor) == [magnet]
+    assert drone in game_manager.get_objects_with_behavior(Magnet)
+    assert drone in game_manager.get_objects_with_behavior(Anchor)
+
+    drone.remove_behavior(magnet)
+    assert not drone.has_behavior(Magnet)
+    assert drone not in game_manager.get_objects_with_behavior(Anchor)
+    assert drone.behaviors == (drone.get_behaviors(JumpThru)[0],)
+
+
+def test_type_stays_indexed_while_another_behavior_of_it_is_active():
+    game_manager = GameManager((100, 100), [])
+    drone = Drone(game_manager, (0, 0), (10, 10))
+    first, second = Anchor(), Magnet()
+    drone.behaviors = [first, second]
+    first.active = False
+    assert drone in game_manager.get_objects_with_behavior(Anchor)
+    second.active = False
+    assert drone not in game_manager.get_objects_with_behavior(Anchor)
+
+
+def test_behavior_cannot_be_shared_between_objects():
+    game_manager = GameManager((100, 100), [])
+    immovable = Immovable()
+    first = Drone(game_manager, (0, 0), (10, 10), behaviors=[immovable])
+    second = Drone(game_manager, (20, 0), (10, 10))
+    with pytest.raises(ValueError):
+        second.add_behavior(immovable)
+    with pytest.raises(ValueError):
+        first.add_behavior(immovable)
+    assert second.behaviors == ()
+
+    # Free again once detached
+    first.remove_behavior(immovable)
+    second.add_behavior(immovable)
+    assert second in game_manager.get_objects_with_behavior(Immovable)
+    assert first not in game_manager.get_objects_with_behavior(Immovable)
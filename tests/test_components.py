@@ -0,0 +1,32 @@
+import pytest
+
+from game.components import ComponentStore
+
+
+def test_allocate_and_release_reuse_rows():
+    store = ComponentStore(capacity=2)
+    first, second = store.allocate(), store.allocate()
+    assert len(store) == 2
+    store.columns["x"][first] = 5
+    store.release(first)
+    assert len(store) == 1
+    assert store.columns["x"][first] == 0
+    assert store.allocate() == first
+    assert sorted(store.alive_ids()) == sorted([first, second])
+
+
+def test_grow_keeps_values():
+    store = ComponentStore(capacity=2)
+    ids = [store.allocate() for _ in range(5)]
+    assert store.capacity >= 5
+    store.view("y")[ids[4]] = 3
+    assert store.columns["y"][ids[4]] == 3
+    assert len(set(ids)) == 5
+
+
+def test_release_twice_raises():
+    store = ComponentStore()
+    entity_id = store.allocate()
+    store.release(entity_id)
+    with pytest.raises(KeyError):
+        store.release(entity_id)
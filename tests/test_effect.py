@@ -0,0 +1,86 @@
+import pygame
+
+from better_pygame import EffectRenderCache
+
+
+def surface_bytes(size:tuple[int, int]) -> int:
+    surf = pygame.Surface(size, pygame.SRCALPHA)
+    return surf.get_pitch() * surf.get_height()
+
+
+def test_render_cache_hits_and_evicts_least_recently_used():
+    cache = EffectRenderCache(max_bytes=surface_bytes((8, 8)) * 2)
+    image = pygame.Surface((8, 8))
+    first = cache.get(image, (8, 8), (8, 8), 0)
+    cache.get(image, (8, 8), (8, 8), 180)
+    assert cache.get(image, (8, 8), (8, 8), 0) is first
+    # 180 is now the least recently used and is dropped
+    cache.get(image, (8, 8), (8, 8), 90)
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (1, 3)
+    cache.get(image, (8, 8), (8, 8), 180)
+    assert cache.misses == 4
+
+
+def test_render_cache_is_bounded_by_memory():
+    cache = EffectRenderCache(max_bytes=surface_bytes((64, 64)))
+    image = pygame.Surface((64, 64))
+    for size in range(4, 36, 4):
+        cache.get(image, (64, 64), (size, size), 0)
+    assert cache.size_bytes <= cache.max_bytes
+    # One big surface takes the room of the small ones
+    cache.get(image, (64, 64), (64, 64), 0)
+    assert len(cache) == 1
+    assert cache.size_bytes == surface_bytes((64, 64))
+    # Bigger than the whole cache, rendered but never kept
+    cache.get(image, (64, 64), (80, 80), 0)
+    assert cache.size_bytes == surface_bytes((64, 64))
+
+
+def test_render_cache_quantizes_keys():
+    cache = EffectRenderCache(angle_step=5, size_step=4)
+    image = pygame.Surface((8, 8))
+    surf = cache.get(image, (8, 8), (10.5, 9), 41)
+    assert cache.get(image, (8, 8), (9, 11), 39) is surf
+    assert cache.hit_rate == 0.5
+
+
+def test_precomputed_sheet_does_not_evict_other_surfaces():
+    cache = EffectRenderCache(max_bytes=surface_bytes((16, 16)) * 4, angle_step=10)
+    spinning, other = pygame.Surface((16, 16)), pygame.Surface((16, 16))
+    kept = cache.get(other, (16, 16), (16, 16), 0)
+    cache.precompute(spinning, (16, 16), (16, 16))
+    assert len(cache) == 1 + 36
+    assert cache.get(other, (16, 16), (16, 16), 0) is kept
+    cache.reset_stats()
+    for angle in range(0, 360, 10):
+        cache.get(spinning, (16, 16), (16, 16), angle)
+    assert cache.hit_rate == 1
+
+    cache.discard_image(spinning)
+    assert len(cache) == 1
+
+
+def test_precompute_respects_its_own_budget():
+    cache = EffectRenderCache(max_sheet_bytes=surface_bytes((16, 16)) * 10, angle_step=90)
+    images = [pygame.Surface((16, 16)) for _ in range(3)]
+    for image in images:
+        cache.precompute(image, (16, 16), (16, 16))
+    # 4 surfaces per sheet, the oldest sheet is dropped to make room for the last one
+    assert len(cache) == 8
+    assert cache.size_bytes <= cache.max_sheet_bytes
+    cache.get(images[0], (16, 16), (16, 16), 90)
+    assert cache.misses == 1
+
+
+def test_discard_image_and_disabled_cache():
+    cache = EffectRenderCache()
+    image, other = pygame.Surface((8, 8)), pygame.Surface((8, 8))
+    cache.get(image, (8, 8), (8, 8), 0)
+    cache.get(other, (8, 8), (8, 8), 0)
+    cache.discard_image(image)
+    assert len(cache) == 1
+
+    disabled = EffectRenderCache(max_bytes=0)
+    disabled.get(image, (8, 8), (8, 8), 0)
+    assert len(disabled) == 0
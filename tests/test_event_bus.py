@@ -0,0 +1,65 @@
+import pygame
+import pytest
+
+from better_pygame import Animation
+from better_pygame._constants import ON_ANIMATION_END, ON_ANIMATION_LOOP
+from better_pygame.event_bus import EventBus, event_bus
+
+
+def test_events_reach_the_subscribers_of_their_id_and_of_every_id():
+    bus = EventBus()
+    received = []
+    bus.subscribe(ON_ANIMATION_END, lambda event: received.append(("player", event.count)), object_id="player")
+    bus.subscribe(ON_ANIMATION_END, lambda event: received.append(("any", event.count)))
+    bus.publish(ON_ANIMATION_END, None, "player", count=1)
+    bus.publish(ON_ANIMATION_END, None, "enemy", count=2)
+    bus.publish(ON_ANIMATION_LOOP, None, "player", count=3)
+    assert received == [("player", 1), ("any", 1), ("any", 2)]
+
+
+def test_unsubscribing_during_a_publish_keeps_the_other_callbacks():
+    bus = EventBus()
+    received = []
+    def once(event):
+        received.append("once")
+        bus.unsubscribe(ON_ANIMATION_END, once)
+    bus.subscribe(ON_ANIMATION_END, once)
+    bus.subscribe(ON_ANIMATION_END, lambda event: received.append("always"))
+    bus.publish(ON_ANIMATION_END, None)
+    bus.publish(ON_ANIMATION_END, None)
+    assert received == ["once", "always", "always"]
+    with pytest.raises(ValueError):
+        bus.unsubscribe(ON_ANIMATION_END, once)
+
+
+def test_bridge_posts_the_published_events_to_sdl():
+    pygame.init()
+    try:
+        pygame.event.clear()
+        bus = EventBus(bridge_to_sdl=True)
+        received = []
+        bus.subscribe(ON_ANIMATION_END, received.append, object_id="player")
+        bus.publish(ON_ANIMATION_END, "element", "player")
+        posted = pygame.event.get(ON_ANIMATION_END)
+        assert len(posted) == 1 and len(received) == 1
+        assert (posted[0].element, posted[0].object_id) == ("element", "player")
+
+        # Published to SDL even without subscribers
+        EventBus(bridge_to_sdl=True).publish(ON_ANIMATION_LOOP, None, count=2)
+        assert [event.count for event in pygame.event.get(ON_ANIMATION_LOOP)] == [2]
+        # Not bridged, nothing is posted
+        EventBus().publish(ON_ANIMATION_LOOP, None)
+        assert not pygame.event.get(ON_ANIMATION_LOOP)
+    finally:
+        pygame.quit()
+
+
+def test_animation_events_are_published_on_the_shared_bus():
+    received = []
+    callback = event_bus.subscribe(ON_ANIMATION_LOOP, lambda event: received.append(event.count), object_id="spinner")
+    try:
+        animation = Animation([pygame.Surface((1, 1)) for _ in range(2)], 10, object_id="spinner")
+        animation.update(0.45)
+        assert received == [2]
+    finally:
+        event_bus.unsubscribe(ON_ANIMATION_LOOP, callback, object_id="spinner")
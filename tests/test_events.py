@@ -0,0 +1,40 @@
+from game.abc import GameObject
+from game.events import CollisionEvent, OverlapEvent
+from game.game_manager import GameManager
+
+
+class Crate(GameObject):
+    ...
+
+class BigCrate(Crate):
+    ...
+
+
+def run_collisions(**kwargs) -> tuple[list, tuple[Crate, BigCrate]]:
+    pairs = []
+    game_manager = GameManager((100, 100), [CollisionEvent(Crate, Crate, lambda obj1, obj2: pairs.append((obj1, obj2)), **kwargs)])
+    crate = Crate(game_manager, (0, 0), (10, 10))
+    big_crate = BigCrate(game_manager, (5, 5), (10, 10))
+    game_manager.update(1/60)
+    return pairs, (crate, big_crate)
+
+
+def test_events_use_exact_types_by_default():
+    pairs, (crate, _) = run_collisions()
+    # Like the loop over every pair, an object of both types collides with itself
+    assert pairs == [(crate, crate)]
+
+
+def test_events_can_include_subclasses():
+    pairs, (crate, big_crate) = run_collisions(include_subclasses=True)
+    assert set(pairs) == {(crate, crate), (crate, big_crate), (big_crate, crate), (big_crate, big_crate)}
+
+
+def test_overlap_event_only_reports_overlapping_pairs():
+    infos = []
+    game_manager = GameManager((100, 100), [OverlapEvent(Crate, BigCrate, lambda obj1, obj2, info: infos.append((obj1, obj2, info.area)))])
+    crate = Crate(game_manager, (0, 0), (10, 10))
+    big_crate = BigCrate(game_manager, (5, 5), (10, 10))
+    BigCrate(game_manager, (50, 50), (10, 10))
+    game_manager.update(1/60)
+    assert infos == [(crate, big_crate, 25)]
@@ -0,0 +1,86 @@
+from game.abc import GameObject
+from game.components import ComponentStore
+from game.game_manager import GameManager
+
+
+class Spark(GameObject):
+    ...
+
+class PooledSpark(GameObject):
+    pool_size = 8
+
+
+def make_manager() -> tuple[GameManager, ComponentStore]:
+    store = ComponentStore()
+    return GameManager((100, 100), [], component_store=store), store
+
+
+def test_delete_object_frees_store_row():
+    game_manager, store = make_manager()
+    sparks = [Spark(game_manager, (index, 0), (1, 1)) for index in range(5)]
+    assert len(store) == 5
+    for spark in sparks:
+        game_manager.delete_object(spark)
+    assert len(store) == 0
+
+
+def test_spawn_and_delete_in_same_update_frees_store_row():
+    game_manager, store = make_manager()
+    game_manager._updating = True
+    sparks = [PooledSpark(game_manager, (index, 0), (1, 1)) for index in range(5)]
+    for spark in sparks:
+        spark.on_destroy()
+    game_manager._updating = False
+    game_manager.apply_pending_changes()
+    assert len(store) == 0
+    assert not game_manager.game_objects.get(PooledSpark)
+    assert all(spark._store is None and spark._entity_id == -1 for spark in sparks)
+    PooledSpark.clear_pool()
+
+
+def test_delete_all_objects_frees_pending_rows():
+    game_manager, store = make_manager()
+    for index in range(5):
+        Spark(game_manager, (index, 0), (1, 1))
+    game_manager._updating = True
+    for index in range(3):
+        Spark(game_manager, (index, 0), (1, 1))
+    game_manager._updating = False
+    assert len(store) == 8
+    game_manager.delete_all_objects()
+    assert len(store) == 0
+
+
+def test_pooled_object_gets_a_new_row():
+    game_manager, store = make_manager()
+    spark = PooledSpark(game_manager, (1, 2), (1, 1))
+    game_manager.delete_object(spark)
+    reused = PooledSpark(game_manager, (3, 4), (1, 1))
+    assert reused is spark
+    assert len(store) == 1
+    assert reused.position == (3, 4)
+    PooledSpark.clear_pool()
+
+
+def test_partition_change_during_update_waits_for_pending_changes():
+    from game.behaviors.behavior import Immovable
+    game_manager = GameManager((100, 100), [])
+    spark = Spark(game_manager, (0, 0), (1, 1))
+    immovable = Immovable(active=False)
+    spark.behaviors = [immovable]
+    assert spark in game_manager.get_dynamic_bucket(Spark)
+
+    game_manager._updating = True
+    immovable.active = True
+    # The events of this update still see the object where it was
+    assert spark in game_manager.get_dynamic_bucket(Spark)
+    assert spark in game_manager.spatial_index.dynamic
+    assert spark not in game_manager.static_objects
+    game_manager.apply_pending_changes()
+    game_manager._updating = False
+    assert spark not in game_manager.get_dynamic_bucket(Spark)
+    assert spark not in game_manager.spatial_index.dynamic
+    assert spark in game_manager.static_objects
+
+    immovable.active = False
+    assert spark in game_manager.get_dynamic_bucket(Spark)
@@ -0,0 +1,77 @@
+import pygame
+
+from better_pygame.render_queue import RenderQueue
+from game.abc import Behavior, GameObject
+from game.game_manager import GameManager
+
+
+class Ghost(GameObject):
+    alpha = 100
+
+
+def test_draw_does_not_change_the_image_alpha():
+    image = pygame.Surface((4, 4))
+    image.fill((255, 255, 255))
+    game_manager = GameManager((100, 100), [])
+    ghost = Ghost(game_manager, (0, 0), (4, 4))
+    ghost.image = image
+    screen = pygame.Surface((10, 10))
+
+    ghost.draw(screen)
+    assert image.get_alpha() is None
+    assert abs(screen.get_at((0, 0))[0] - 100) <= 2
+
+    render_queue = RenderQueue()
+    ghost.draw(render_queue)
+    render_queue.flush(screen)
+    assert image.get_alpha() is None
+
+
+def test_draw_interpolates_between_fixed_updates():
+    game_manager = GameManager((100, 100), [], interpolate=True)
+    ghost = Ghost(game_manager, (0, 0), (4, 4), velocity=(0, 0))
+    ghost.image = pygame.Surface((4, 4))
+    game_manager.update(1/60)
+    ghost.position = (10, 20)
+    game_manager.update(1/60)
+    assert ghost.prev_position == (10, 20)
+    ghost.position = (20, 40)
+
+    queue_draws = []
+    class Recorder:
+        def submit(self, surface, position, *args):
+            queue_draws.append(position)
+    game_manager.interpolation_alpha = 0.5
+    ghost.draw(Recorder())
+    assert queue_draws == [(15, 30)]
+    game_manager.interpolation_alpha = 1.0
+    ghost.draw(Recorder())
+    assert queue_draws[-1] == (20, 40)
+
+
+class Outline(Behavior):
+    '''Records what it is drawn on and draws a pixel over the image of its object'''
+    def __init__(self) -> None:
+        super().__init__()
+        self.screens = []
+
+    def draw(self, screen):
+        self.screens.append(screen)
+        screen.set_at((0, 0), (0, 255, 0))
+
+
+def test_behaviors_are_drawn_on_the_surface_over_the_image():
+    game_manager = GameManager((100, 100), [])
+    outline = Outline()
+    ghost = Ghost(game_manager, (0, 0), (4, 4), behaviors=[outline])
+    ghost.alpha = None
+    ghost.image = pygame.Surface((4, 4))
+    ghost.image.fill((255, 0, 0))
+    screen = pygame.Surface((10, 10))
+
+    render_queue = RenderQueue()
+    ghost.draw(render_queue)
+    render_queue.flush(screen)
+    assert outline.screens == [screen]
+    assert screen.get_at((0, 0))[:3] == (0, 255, 0)
+    assert screen.get_at((1, 1))[:3] == (255, 0, 0)
@@ -0,0 +1,95 @@
+import pygame
+import pytest
+
+import better_pygame
+from better_pygame import InputRecorder, InputReplay
+
+
+@pytest.fixture(autouse=True)
+def display():
+    pygame.init()
+    screen = pygame.display.set_mode((100, 100))
+    yield screen
+    pygame.quit()
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "session.bpir")
+    frames = [
+        (0.016, [pygame.Event(pygame.KEYDOWN, key=pygame.K_a, mod=0, unicode="a", scancode=4, window=None)]),
+        (0.017, []),
+        (0.033, [pygame.Event(pygame.MOUSEMOTION, pos=(3, 4), rel=(1, -1), buttons=(0, 0, 0), touch=False),
+                 pygame.Event(pygame.USEREVENT + 1, data="posted by the game")]),
+    ]
+    with InputRecorder(path) as recorder:
+        for frame_time, events in frames:
+            recorder.record_frame(frame_time, events)
+    assert recorder.frame_count == 3
+
+    replay = InputReplay(path)
+    assert len(replay) == 3
+    assert replay.total_time == pytest.approx(0.066)
+    (time1, events1), (time2, events2), (time3, events3) = replay
+    assert (time1, time2, time3) == (0.016, 0.017, 0.033)
+    assert events1[0].type == pygame.KEYDOWN and events1[0].key == pygame.K_a and events1[0].unicode == "a"
+    assert events2 == []
+    # Events posted by the game are not recorded
+    assert [event.type for event in events3] == [pygame.MOUSEMOTION]
+    assert events3[0].pos == (3, 4)
+
+
+def test_truncated_frame_is_dropped(tmp_path):
+    path = str(tmp_path / "session.bpir")
+    with InputRecorder(path) as recorder:
+        recorder.record_frame(0.01, [])
+        recorder.record_frame(0.02, [pygame.Event(pygame.KEYUP, key=1)])
+    with open(path, "rb") as file:
+        data = file.read()
+    with open(path, "wb") as file:
+        file.write(data[:-3])
+    assert len(InputReplay(path)) == 1
+
+
+def test_not_a_recording(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"nope" + bytes(8))
+    with pytest.raises(ValueError):
+        InputReplay(str(path))
+
+
+class LogScene(better_pygame.Scene):
+    def __init__(self, scene_manager) -> None:
+        super().__init__(scene_manager)
+        self.log = []
+
+    def handle_event(self, event):
+        self.log.append(("event", event.type, getattr(event, "key", None)))
+
+    def update(self, dt):
+        self.log.append(("update", dt))
+
+    def draw(self, screen):
+        ...
+
+
+def test_replay_matches_recorded_run(tmp_path, display):
+    path = str(tmp_path / "session.bpir")
+    scene_manager = better_pygame.SceneManager((100, 100))
+    scene = LogScene(scene_manager)
+    scene_manager.init_scenes({"log":scene})
+    pygame.event.clear()
+    with InputRecorder(path) as recorder:
+        game_loop = better_pygame.GameLoop(scene_manager, display, recorder=recorder)
+        for index in range(10):
+            pygame.event.post(pygame.Event(pygame.KEYDOWN, key=index, mod=0, unicode="", scancode=0))
+            game_loop.frame()
+    recorded = [entry for entry in scene.log if entry[0] == "update" or entry[1] == pygame.KEYDOWN]
+
+    replay_manager = better_pygame.SceneManager((100, 100))
+    replay_scene = LogScene(replay_manager)
+    replay_manager.init_scenes({"log":replay_scene})
+    better_pygame.GameLoop(replay_manager, display).replay(InputReplay(path), draw=False)
+    replayed = [entry for entry in replay_scene.log if entry[0] == "update" or entry[1] == pygame.KEYDOWN]
+    assert replayed == recorded
+    scene_manager.close()
+    replay_manager.close()
@@ -0,0 +1,72 @@
+import math
+import random
+
+import pytest
+
+from game.abc import GameObject
+from game.behaviors.behavior import Gravity, Projectile
+from game.components import ComponentStore
+from game.game_manager import GameManager
+
+
+class Ball(GameObject):
+    ...
+
+
+def spawn_balls(game_manager:GameManager, seed:int) -> list[Ball]:
+    rng = random.Random(seed)
+    balls = []
+    for index in range(40):
+        ball = Ball(game_manager, (rng.uniform(0, 100), rng.uniform(0, 100)), (4, 4), (0, rng.uniform(-5, 5)))
+        behaviors = [Projectile(rng.uniform(10, 50), rng.uniform(0, math.tau), ball, rng.uniform(-0.5, 0.5)),
+                     Gravity(ball, rng.uniform(5, 15), rng.choice([None, -30, -60]))]
+        if index % 10 == 0:
+            # Several behaviors of one kind moving the same object
+            behaviors += [Projectile(20, 1, ball), Gravity(ball, 3, -40)]
+        ball.behaviors = behaviors
+        balls.append(ball)
+    return balls
+
+
+@pytest.mark.parametrize("component_store", [None, ComponentStore])
+def test_physics_system_matches_stepping_every_behavior(component_store):
+    stepped_manager = GameManager((100, 100), [])
+    stepped = spawn_balls(stepped_manager, 1)
+    system_manager = GameManager((100, 100), [], component_store=component_store() if component_store else None)
+    batched = spawn_balls(system_manager, 1)
+
+    for _ in range(30):
+        for ball in stepped:
+            for behavior in ball.behaviors:
+                behavior.step(1/60)
+        system_manager.physics.step(1/60)
+
+    for ball, reference in zip(batched, stepped):
+        assert ball.position == pytest.approx(reference.position)
+        assert ball.velocity_y == pytest.approx(reference.velocity_y)
+        for behavior, reference_behavior in zip(ball.behaviors, reference.behaviors):
+            if isinstance(behavior, Projectile):
+                assert behavior.speed == pytest.approx(reference_behavior.speed)
+
+
+def test_removed_behaviors_keep_their_values_and_step_alone():
+    game_manager = GameManager((100, 100), [], component_store=ComponentStore())
+    ball = Ball(game_manager, (0, 0), (4, 4))
+    projectile = Projectile(10, 0, ball, accel=1)
+    ball.behaviors = [projectile]
+    game_manager.physics.step(1)
+    speed = projectile.speed
+    assert speed == pytest.approx(20)
+
+    projectile.active = False
+    assert projectile._physics_table is None
+    assert projectile.speed == speed
+    # Steps on its own values while out of the system
+    projectile.step(1)
+    assert projectile.speed == pytest.approx(40)
+    projectile.active = True
+    assert projectile.speed == pytest.approx(40)
+    assert len(game_manager.physics.tables["projectiles"]) == 1
+
+    with pytest.raises(ValueError):
+        game_manager.physics.add(projectile)
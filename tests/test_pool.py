@@ -0,0 +1,59 @@
+import gc
+import weakref
+
+from game.abc import Behavior, GameObject
+from game.game_manager import GameManager
+
+
+class Bullet(GameObject):
+    pool_size = 2
+
+class Rock(GameObject):
+    ...
+
+class Trail(Behavior):
+    ...
+
+
+def test_removed_objects_are_reused_and_initialized_again():
+    game_manager = GameManager((100, 100), [])
+    trail = Trail()
+    bullet = Bullet(game_manager, (1, 2), (3, 3), (5, 0), [trail])
+    bullet.on_destroy()
+    game_manager.apply_pending_changes()
+    assert Bullet.get_pooled_count() == 1
+    # The behaviors are detached so they can be attached to another object
+    assert trail._owner is None
+
+    reused = Bullet(game_manager, (7, 8), (2, 2))
+    assert reused is bullet
+    assert Bullet.get_pooled_count() == 0
+    assert (reused.position, reused.size, reused.velocity) == ((7, 8), (2, 2), (0, 0))
+    assert reused.alive and reused.behaviors == () and not reused.has_behavior(Trail)
+    assert reused in game_manager.get_bucket(Bullet)
+    Bullet.clear_pool()
+
+
+def test_pool_keeps_at_most_pool_size_objects():
+    game_manager = GameManager((100, 100), [])
+    bullets = [Bullet(game_manager, (index, 0), (1, 1)) for index in range(4)]
+    for bullet in bullets:
+        game_manager.delete_object(bullet)
+        # Removed twice, pooled once
+        bullet._return_to_pool()
+    assert Bullet.get_pooled_count() == 2
+    Bullet.clear_pool()
+    assert Bullet.get_pooled_count() == 0
+    assert Rock.get_pooled_count() == 0
+
+
+def test_instances_do_not_keep_removed_objects_alive():
+    game_manager = GameManager((100, 100), [])
+    rocks = [Rock(game_manager, (index, 0), (1, 1)) for index in range(3)]
+    assert set(rocks) <= set(Rock.instances[Rock])
+    game_manager.delete_object(rocks[0])
+    removed = weakref.ref(rocks.pop(0))
+    gc.collect()
+    assert removed() is None
+    assert len(Rock.instances[Rock]) == 2
+    assert set(rocks) <= set(Rock.instances[Rock])
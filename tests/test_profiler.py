@@ -0,0 +1,66 @@
+import csv
+import json
+
+import pytest
+
+from better_pygame import Profiler
+from game.game_manager import GameManager
+
+
+def test_phase_times_are_summed_per_frame_in_a_ring_buffer():
+    profiler = Profiler(frames=3)
+    for frame in range(1, 5):
+        profiler.add("update", frame / 1000)
+        profiler.add("update", frame / 1000)
+        profiler.end_frame()
+    # The first frame was overwritten
+    assert profiler.get_samples("update") == pytest.approx([0.004, 0.006, 0.008])
+    stats = profiler.get_stats("update")
+    assert stats["mean"] == pytest.approx(6)
+    assert (stats["p50"], stats["max"]) == pytest.approx((6, 8))
+
+
+def test_phases_timed_later_count_zero_before():
+    profiler = Profiler(frames=10)
+    profiler.add("draw", 0.001)
+    profiler.end_frame()
+    assert profiler.time("late", sum, [1, 2]) == 3
+    profiler.end_frame()
+    profiler.end_frame()
+    assert profiler.phases == ["draw", "late"]
+    assert profiler.get_samples("draw") == [0.001, 0, 0]
+    late = profiler.get_samples("late")
+    assert late[0] == 0 and late[1] > 0 and late[2] == 0
+
+    profiler.reset()
+    assert profiler.phases == [] and profiler.frame_count == 0
+
+
+def test_game_manager_times_its_phases():
+    game_manager = GameManager((100, 100), [])
+    game_manager.profiler = Profiler()
+    game_manager.update(1/60)
+    game_manager.profiler.end_frame()
+    assert {"game.physics", "game.spatial_index", "game.events"} <= set(game_manager.profiler.phases)
+
+
+def test_dumps_hold_every_phase(tmp_path):
+    profiler = Profiler(frames=4)
+    for frame in range(2):
+        profiler.add("update", 0.002)
+        profiler.add("draw", 0.004)
+        profiler.end_frame()
+
+    json_path = tmp_path / "profile.json"
+    profiler.dump_json(str(json_path))
+    data = json.loads(json_path.read_text())
+    assert data["frames"] == 2
+    assert data["samples"]["draw"] == pytest.approx([4, 4])
+    assert data["stats"]["update"]["p99"] == pytest.approx(2)
+
+    csv_path = tmp_path / "profile.csv"
+    profiler.dump_csv(str(csv_path))
+    with open(csv_path, newline="") as file:
+        rows = list(csv.reader(file))
+    assert rows[0] == ["frame_index", "update", "draw"]
+    assert len(rows) == 3 and float(rows[1][2]) == pytest.approx(4)
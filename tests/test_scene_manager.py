@@ -0,0 +1,244 @@
+import pygame
+import pytest
+
+import better_pygame
+
+
+@pytest.fixture(autouse=True)
+def display():
+    pygame.init()
+    screen = pygame.display.set_mode((200, 200))
+    yield screen
+    pygame.quit()
+
+
+class ColorScene(better_pygame.Scene):
+    '''Fills the screen with a color changing every update, reporting only the rects given to it as dirty'''
+    def __init__(self, scene_manager) -> None:
+        super().__init__(scene_manager)
+        self.color = (10, 10, 10)
+        self.set_dirty_rect_tracking(True)
+
+    def handle_event(self, event):
+        ...
+
+    def update(self, dt):
+        ...
+
+    def draw(self, screen):
+        screen.fill(self.color)
+
+
+def test_dirty_draw_only_touches_dirty_rects(display):
+    scene_manager = better_pygame.SceneManager((200, 200), dirty_rects=True)
+    scene = ColorScene(scene_manager)
+    scene_manager.init_scenes({"color":scene})
+    scene_manager.draw(display)
+
+    scene.color = (200, 0, 0)
+    scene.mark_dirty((0, 0, 10, 10))
+    scene.mark_dirty((20, 0, 10, 10))
+    rects = scene_manager.draw(display)
+
+    # Drawn once clipped to the union of the rects, the whole union is redrawn and updated
+    assert [tuple(rect) for rect in rects] == [(0, 0, 30, 10)]
+    assert display.get_at((5, 5))[:3] == (200, 0, 0)
+    assert display.get_at((15, 5))[:3] == (200, 0, 0)
+    assert display.get_at((100, 100))[:3] == (10, 10, 10)
+
+
+class EffectScene(better_pygame.Scene):
+    '''Draws a tracked effect over a black screen'''
+    def __init__(self, scene_manager, effect) -> None:
+        super().__init__(scene_manager)
+        self.effect = effect
+        self.set_dirty_rect_tracking(True)
+        self.track_effect(effect)
+
+    def handle_event(self, event):
+        ...
+
+    def update(self, dt):
+        self.effect.update(dt)
+
+    def draw(self, screen):
+        self.effect.draw(screen)
+
+
+def test_moving_effect_draws_its_new_rect(display):
+    scene_manager = better_pygame.SceneManager((200, 200), dirty_rects=True)
+    effect = better_pygame.Effect([{"start_position":(0, 0), "end_position":(50, 0), "duration":1}])
+    image = pygame.Surface((20, 20))
+    image.fill((200, 0, 0))
+    effect.start(image, (100, 100), (20, 20))
+    scene = EffectScene(scene_manager, effect)
+    scene_manager.init_scenes({"effect":scene})
+    scene_manager.draw(display)
+    assert display.get_at((105, 110))[:3] == (200, 0, 0)
+
+    scene_manager.update(0.5)
+    rects = scene_manager.draw(display)
+    # Moved to x 125, the leading edge is outside of the rect drawn last frame
+    assert display.get_at((140, 110))[:3] == (200, 0, 0)
+    assert display.get_at((105, 110))[:3] == (0, 0, 0)
+    assert any(rect.contains((100, 100, 45, 20)) for rect in rects)
+
+
+def test_growing_effect_draws_its_new_rect(display):
+    scene_manager = better_pygame.SceneManager((200, 200), dirty_rects=True)
+    effect = better_pygame.Effect([{"start_position":(0, 0), "start_size":(20, 20), "end_size":(60, 60), "duration":1}])
+    image = pygame.Surface((20, 20))
+    image.fill((200, 0, 0))
+    effect.start(image, (100, 100), (20, 20))
+    scene = EffectScene(scene_manager, effect)
+    scene_manager.init_scenes({"effect":scene})
+    scene_manager.draw(display)
+
+    scene_manager.update(0.5)
+    scene_manager.draw(display)
+    assert display.get_at((135, 135))[:3] == (200, 0, 0)
+
+
+def test_tracked_effect_rects_are_collected(display):
+    scene_manager = better_pygame.SceneManager((200, 200), dirty_rects=True)
+    scene = ColorScene(scene_manager)
+    scene_manager.init_scenes({"color":scene})
+    scene_manager.draw(display)
+
+    effect = better_pygame.Effect([{"start_position":(0, 0), "end_position":(50, 0), "duration":1000}])
+    image = pygame.Surface((20, 20))
+    effect.start(image, (100, 100), (20, 20))
+    scene.track_effect(effect)
+    effect.update(0.5)
+    effect.draw(display)
+    rects = scene_manager.draw(display)
+    assert rects and any(rect.colliderect((100, 100, 80, 20)) for rect in rects)
+
+
+def test_scene_managers_are_not_kept_alive_by_the_event_bus():
+    import gc
+    import weakref
+    from better_pygame._constants import ON_TRANSITION_END
+    from better_pygame.event_bus import ANY_ID, event_bus
+
+    key = (ON_TRANSITION_END, ANY_ID)
+    # Drop the subscriptions of the scene managers of the other tests
+    gc.collect()
+    event_bus.publish(ON_TRANSITION_END, object())
+    subscribed = len(event_bus._subscribers.get(key, ()))
+    scene_manager = better_pygame.SceneManager((200, 200))
+    reference = weakref.ref(scene_manager)
+    assert len(event_bus._subscribers.get(key, ())) == subscribed + 1
+    del scene_manager
+    gc.collect()
+    assert reference() is None
+    event_bus.publish(ON_TRANSITION_END, object())
+    assert len(event_bus._subscribers.get(key, ())) == subscribed
+
+
+def test_close_unsubscribes():
+    from better_pygame._constants import ON_TRANSITION_END
+    from better_pygame.event_bus import ANY_ID, event_bus
+
+    key = (ON_TRANSITION_END, ANY_ID)
+    subscribed = len(event_bus._subscribers.get(key, ()))
+    scene_manager = better_pygame.SceneManager((200, 200))
+    scene_manager.close()
+    assert len(event_bus._subscribers.get(key, ())) == subscribed
+
+
+def make_lazy_scene(image_path:str, log:list):
+    class LazyScene(better_pygame.Scene):
+        assets = ((image_path, (8, 8)),)
+
+        def __init__(self, scene_manager) -> None:
+            super().__init__(scene_manager)
+            self.image = better_pygame.asset_manager.load(image_path, (8, 8))
+            log.append("build")
+
+        def handle_event(self, event):
+            ...
+
+        def update(self, dt):
+            ...
+
+        def draw(self, screen):
+            screen.blit(self.image, (0, 0))
+
+        def unload(self):
+            better_pygame.asset_manager.release(image_path, (8, 8))
+            log.append("unload")
+    return LazyScene
+
+
+@pytest.fixture
+def image_paths(tmp_path):
+    paths = []
+    for index in range(4):
+        path = str(tmp_path / f"image_{index}.png")
+        pygame.image.save(pygame.Surface((16, 16)), path)
+        paths.append(path)
+    return paths
+
+
+def test_scenes_are_built_on_first_use(image_paths):
+    log = []
+    scene_manager = better_pygame.SceneManager((200, 200))
+    scene_manager.init_scenes({"a":make_lazy_scene(image_paths[0], log), "b":make_lazy_scene(image_paths[1], log)})
+    assert scene_manager.is_loaded("a") and not scene_manager.is_loaded("b")
+    scene_manager.change_scene("b")
+    assert scene_manager.is_loaded("b")
+    assert log == ["build", "build"]
+
+
+def test_least_recently_used_scenes_are_unloaded(image_paths):
+    log = []
+    asset_manager = better_pygame.asset_manager
+    scene_manager = better_pygame.SceneManager((200, 200), max_loaded_scenes=2)
+    scene_manager.init_scenes({str(index):make_lazy_scene(path, log) for index, path in enumerate(image_paths)})
+    for key in ("1", "2", "0", "3"):
+        scene_manager.change_scene(key)
+        assert len(scene_manager.scenes) <= 2
+    assert set(scene_manager.scenes) == {"0", "3"}
+    # 0 went out when 2 was built, then 1 and 2
+    assert log.count("unload") == 3
+    for path in image_paths[1:3]:
+        assert not any(key[0] == path for key in asset_manager._images)
+    scene_manager.close()
+
+
+def test_preload_caches_the_scaled_image_and_unload_evicts_it(image_paths):
+    log = []
+    asset_manager = better_pygame.asset_manager
+    scene_manager = better_pygame.SceneManager((200, 200), max_loaded_scenes=1)
+    scene_manager.init_scenes({"a":make_lazy_scene(image_paths[0], log), "b":make_lazy_scene(image_paths[1], log)})
+
+    task = scene_manager.preload_scene("b")
+    task.wait()
+    assert not task.errors
+    assert asset_manager.get_refcount(image_paths[1], (8, 8)) == 0
+    assert image_paths[1] not in asset_manager
+    scene_manager.update(1/60)
+    assert scene_manager.is_loaded("b")
+    assert asset_manager.get_refcount(image_paths[1], (8, 8)) == 1
+
+    # Only one scene fits, b is kept as the newest and a is current, so the limit waits for a change
+    scene_manager.change_scene("b")
+    assert not scene_manager.is_loaded("a")
+    assert asset_manager.get_refcount(image_paths[0], (8, 8)) == 0
+    assert not any(key[0] == image_paths[0] for key in asset_manager._images)
+    scene_manager.close()
+
+
+def test_scene_freed_by_a_transition_end_is_unloaded(image_paths):
+    log = []
+    scene_manager = better_pygame.SceneManager((200, 200), max_loaded_scenes=1)
+    scene_a = make_lazy_scene(image_paths[0], log)
+    scene_manager.init_scenes({"a":scene_a, "b":make_lazy_scene(image_paths[1], log)})
+    scene_manager.get_scene("a").set_exit_transition(better_pygame.transition.LinearFadeOut(0.05))
+    scene_manager.change_scene("b")
+    assert scene_manager.is_loaded("a")
+    for _ in range(10):
+        scene_manager.update(1/60)
+    assert not scene_manager.is_loaded("a")
+    scene_manager.close()
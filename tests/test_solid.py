@@ -0,0 +1,99 @@
+import random
+
+from game.abc import GameObject
+from game.behaviors.behavior import Immovable, Solid
+from game.game_manager import GameManager
+
+
+class Box(GameObject):
+    ...
+
+
+def overlap(obj1:GameObject, obj2:GameObject) -> float:
+    x1, y1, w1, h1 = obj1.rect
+    x2, y2, w2, h2 = obj2.rect
+    return max(0, min(x1 + w1, x2 + w2) - max(x1, x2)) * max(0, min(y1 + h1, y2 + h2) - max(y1, y2))
+
+
+def resolve_like_all_pairs_loop(boxes:list[GameObject]):
+    """The loop the solid event replaces: every pair in order, tested with the current rects"""
+    event = Solid.register_event()
+    for index1 in range(len(boxes)):
+        for index2 in range(index1 + 1, len(boxes)):
+            if event.is_overlapping(boxes[index1].rect, boxes[index2].rect):
+                event.resolve_overlap(boxes[index1], boxes[index2])
+
+
+def test_objects_pushed_into_contact_are_resolved_in_the_same_frame():
+    game_manager = GameManager((200, 200), [])
+    # a overlaps b, b only reaches c once pushed by a
+    boxes = [Box(game_manager, (x, 0), (20, 20)) for x in (0, 15, 36)]
+    for box in boxes:
+        box.behaviors = [Solid(box)]
+    game_manager.event_manager.add_event(Solid.register_event())
+    game_manager.update(0)
+    a, b, c = boxes
+    assert overlap(b, c) == 0
+    # Pushing b out of c pushes it back into a, which the loop does not test again
+    assert [box.position for box in boxes] == [(-2.5, 0), (16.75, 0), (36.75, 0)]
+
+
+def test_moving_solids_match_the_all_pairs_loop():
+    rng = random.Random(3)
+    positions = [(rng.uniform(0, 180), rng.uniform(0, 180)) for _ in range(60)]
+    sizes = [(rng.uniform(8, 30), rng.uniform(8, 30)) for _ in range(60)]
+
+    game_manager = GameManager((200, 200), [Solid.register_event()])
+    boxes = [Box(game_manager, position, size) for position, size in zip(positions, sizes)]
+    for box in boxes:
+        box.behaviors = [Solid(box)]
+    game_manager.update(0)
+
+    expected = [Box(GameManager((200, 200), []), position, size) for position, size in zip(positions, sizes)]
+    resolve_like_all_pairs_loop(expected)
+    assert [box.position for box in boxes] == [box.position for box in expected]
+
+
+class Crate(GameObject):
+    ...
+
+
+def test_solid_does_not_need_a_game_manager():
+    class Detached:
+        game_manager = None
+    Solid(Detached())
+
+
+def test_solid_type_added_after_the_plan_was_compiled():
+    game_manager = GameManager((200, 200), [Solid.register_event()])
+    # The plan is compiled before any crate is solid
+    Crate(game_manager, (100, 100), (20, 20))
+    game_manager.update(0)
+    crates = [Crate(game_manager, (x, 0), (20, 20)) for x in (0, 10)]
+    for crate in crates:
+        crate.behaviors = [Solid(crate)]
+    game_manager.update(0)
+    assert overlap(*crates) == 0
+
+
+class Package(GameObject):
+    ...
+
+
+class Tile(GameObject):
+    ...
+
+
+def test_package_pushed_across_a_cell_into_another_tile():
+    game_manager = GameManager((200, 200), [Solid.register_event()])
+    # Pushed right out of the first tile, across the cell boundary at x 64 into the top of the second tile
+    first = Tile(game_manager, (29, 0), (20, 20))
+    second = Tile(game_manager, (64, 17), (20, 20))
+    for tile in (first, second):
+        tile.behaviors = [Solid(tile), Immovable()]
+    package = Package(game_manager, (40, 0), (20, 20))
+    package.behaviors = [Solid(package)]
+    game_manager.update(0)
+    assert overlap(package, first) == 0
+    assert overlap(package, second) == 0
+    assert package.position == (49, -3)
@@ -0,0 +1,133 @@
+import random
+
+import pytest
+
+from game.abc import GameObject
+from game.game_manager import GameManager
+from game.spatial import SpatialHashGrid, SweepAndPrune, StaticIndex, PartitionedIndex
+
+
+class Block(GameObject):
+    ...
+
+
+def touching(obj1:GameObject, obj2:GameObject) -> bool:
+    x1, y1, w1, h1 = obj1.rect
+    x2, y2, w2, h2 = obj2.rect
+    return x1 <= x2 + w2 and x2 <= x1 + w1 and y1 <= y2 + h2 and y2 <= y1 + h1
+
+
+def make_blocks(count:int, seed:int) -> list[Block]:
+    rng = random.Random(seed)
+    game_manager = GameManager((400, 400), [])
+    return [Block(game_manager, (rng.uniform(-50, 350), rng.uniform(-50, 350)), (rng.uniform(4, 90), rng.uniform(4, 90)))
+            for _ in range(count)]
+
+
+def test_static_index_query_finds_every_touching_object_once():
+    blocks = make_blocks(200, 1)
+    index = StaticIndex(blocks, cell_size=32)
+    assert len(index) == len(blocks)
+    for query_block in make_blocks(50, 2):
+        found = list(index.query(query_block.rect))
+        assert len(found) == len(set(found))
+        assert {block for block in blocks if touching(block, query_block)} <= set(found)
+
+
+def test_static_index_rejects_bad_cell_size():
+    with pytest.raises(ValueError):
+        StaticIndex(cell_size=0)
+
+
+def test_partitioned_index_queries_both_partitions():
+    blocks = make_blocks(60, 3)
+    static_blocks, dynamic_blocks = blocks[:30], blocks[30:]
+    index = PartitionedIndex(SpatialHashGrid(32), StaticIndex(static_blocks, 32))
+    for block in dynamic_blocks:
+        index.insert(block)
+    assert len(index) == len(blocks)
+    assert all(block in index for block in blocks)
+
+    query_block = make_blocks(1, 4)[0]
+    assert {block for block in blocks if touching(block, query_block)} <= index.query(query_block.rect)
+
+    index.remove(dynamic_blocks[0])
+    assert dynamic_blocks[0] not in index
+    index.clear()
+    assert len(index) == 0 and index.static.cell_size == 32
+
+
+def test_partitioned_index_never_pairs_two_static_objects():
+    blocks = make_blocks(80, 5)
+    static_blocks, dynamic_blocks = blocks[:40], blocks[40:]
+    index = PartitionedIndex(SpatialHashGrid(32), StaticIndex(static_blocks, 32))
+    for block in dynamic_blocks:
+        index.insert(block)
+    pairs = list(index.query_pairs(blocks, blocks))
+    static_set = set(static_blocks)
+    assert not any(obj1 in static_set and obj2 in static_set for obj1, obj2 in pairs)
+    expected = {(obj1, obj2) for obj1 in blocks for obj2 in blocks
+                if obj1 is not obj2 and not (obj1 in static_set and obj2 in static_set) and touching(obj1, obj2)}
+    assert expected <= set(pairs)
+
+
+def brute_force_pairs(objs1:list[GameObject], objs2:list[GameObject]) -> set[tuple[GameObject, GameObject]]:
+    return {(obj1, obj2) for obj1 in objs1 for obj2 in objs2 if touching(obj1, obj2)}
+
+
+@pytest.mark.parametrize("make_index", [lambda: SpatialHashGrid(32), lambda: SpatialHashGrid(7), SweepAndPrune])
+def test_query_pairs_finds_every_touching_pair(make_index):
+    blocks = make_blocks(150, 6)
+    group1, group2 = blocks[:50], blocks[50:]
+    index = make_index()
+    for block in blocks:
+        index.insert(block)
+    pairs = list(index.query_pairs(group1, group2))
+    assert len(pairs) == len(set(pairs))
+    assert brute_force_pairs(group1, group2) <= set(pairs)
+
+    # Moved, grown and removed objects are found where they are now
+    rng = random.Random(7)
+    for block in blocks[::3]:
+        block.x += rng.uniform(-40, 40)
+        block.width += rng.uniform(0, 30)
+        index.update(block)
+    for block in blocks[1::10]:
+        index.remove(block)
+    remaining = [block for block in blocks if block in index]
+    group1 = [block for block in group1 if block in index]
+    pairs = set(index.query_pairs(group1, remaining))
+    assert brute_force_pairs(group1, remaining) <= pairs
+    assert all(obj2 in index for _, obj2 in pairs)
+
+
+def test_sweep_and_prune_candidate_pairs_match_brute_force():
+    blocks = make_blocks(120, 8)
+    index = SweepAndPrune()
+    index.update_all(blocks)
+    expected = {frozenset(pair) for pair in brute_force_pairs(blocks, blocks) if pair[0] is not pair[1]}
+    pairs = [frozenset(pair) for pair in index.candidate_pairs()]
+    assert len(pairs) == len(set(pairs))
+    assert set(pairs) == expected
+
+    # Sorted again incrementally after the objects moved
+    rng = random.Random(9)
+    for block in blocks:
+        block.x += rng.uniform(-20, 20)
+    index.update_all(blocks)
+    expected = {frozenset(pair) for pair in brute_force_pairs(blocks, blocks) if pair[0] is not pair[1]}
+    assert {frozenset(pair) for pair in index.candidate_pairs()} == expected
+
+
+def test_sweep_and_prune_move_keeps_queries_exact():
+    blocks = make_blocks(80, 10)
+    index = SweepAndPrune()
+    index.update_all(blocks)
+    index.query((0, 0, 0, 0))
+    rng = random.Random(11)
+    for block in blocks[:20]:
+        block.position = (rng.uniform(-50, 350), rng.uniform(-50, 350))
+        index.move(block)
+        assert index.covers(block, block.rect)
+    for query_block in make_blocks(30, 12):
+        assert set(index.query(query_block.rect)) == {block for block in blocks if touching(block, query_block)}
@@ -0,0 +1,89 @@
+import pygame
+import pytest
+
+import better_pygame
+
+
+@pytest.fixture(autouse=True)
+def display():
+    pygame.init()
+    screen = pygame.display.set_mode((200, 200))
+    yield screen
+    pygame.quit()
+
+
+class CountingScene(better_pygame.Scene):
+    '''Counts how many times it is drawn'''
+    def __init__(self, scene_manager) -> None:
+        super().__init__(scene_manager)
+        self.draw_count = 0
+
+    def handle_event(self, event):
+        ...
+
+    def update(self, dt):
+        ...
+
+    def draw(self, screen):
+        self.draw_count += 1
+        screen.fill((200, 0, 0))
+
+
+def test_snapshot_refresh_counts_frames_not_draws(display):
+    scene = CountingScene(None)
+    transition = better_pygame.Transition([{"start_position":(0, 0), "end_position":(100, 0), "duration":10}],
+                                          snapshot=True, refresh_interval=2)
+    transition.start(scene, (200, 200))
+    assert scene.draw_count == 1
+
+    for _ in range(4):
+        transition.update(0.1)
+        # Drawn twice in a frame, once per dirty rect for example
+        transition.draw(display)
+        transition.draw(display)
+    # Recaptured every 2 frames
+    assert scene.draw_count == 3
+
+
+def test_static_scene_is_drawn_once_and_the_transform_is_reused(display):
+    scene = CountingScene(None)
+    transition = better_pygame.Transition([{"start_size":(100, 100), "end_size":(100, 100), "start_angle":30, "end_angle":30, "duration":10}])
+    transition.start(scene, (200, 200))
+    transition.draw(display)
+    transformed = transition._transformed_surface
+    assert transformed is not None
+    for _ in range(3):
+        transition.update(0.1)
+        transition.draw(display)
+    assert scene.draw_count == 1
+    assert transition._transformed_surface is transformed
+
+    transition.invalidate_cache()
+    transition.draw(display)
+    assert scene.draw_count == 2
+    assert transition._transformed_surface is not transformed
+
+
+def test_scene_requiring_update_is_drawn_every_frame(display):
+    scene = CountingScene(None)
+    scene.set_transition_require_update(True)
+    transition = better_pygame.Transition([{"start_position":(0, 0), "end_position":(100, 0), "duration":10}])
+    transition.start(scene, (200, 200))
+    for _ in range(3):
+        transition.update(0.1)
+        transition.draw(display)
+    assert scene.draw_count == 3
+
+
+def test_scaling_scene_is_transformed_again_when_its_size_changes(display):
+    scene = CountingScene(None)
+    transition = better_pygame.Transition([{"start_size":(200, 200), "end_size":(100, 100), "duration":1}])
+    transition.start(scene, (200, 200))
+    transition.update(0.5)
+    transition.draw(display)
+    transformed = transition._transformed_surface
+    transition.update(0.25)
+    transition.draw(display)
+    assert transition._transformed_surface is not transformed
+    assert transition._transformed_surface.get_size() == tuple(int(length) for length in transition._curr_size)
+    assert scene.draw_count == 1
@@ -0,0 +1,63 @@
+from game.type_buckets import TypeBuckets
+
+
+class Base:
+    ...
+
+class Child(Base):
+    ...
+
+class GrandChild(Child):
+    ...
+
+
+def test_views_hold_the_objects_of_the_subclasses():
+    buckets = TypeBuckets()
+    base, child = Base(), Child()
+    buckets.add(base)
+    buckets.add(child)
+    # Built from the buckets on the first request
+    view = buckets.get_view(Base)
+    assert view == {base, child}
+    assert buckets.get_bucket(Base) == {base}
+
+    grand_child = GrandChild()
+    buckets.add(grand_child)
+    assert view == {base, child, grand_child}
+    assert buckets.get_view(Child) == {child, grand_child}
+    assert buckets.get_view(Base) is view
+
+    buckets.discard(child)
+    assert view == {base, grand_child}
+    assert buckets.get_view(Child) == {grand_child}
+    assert child not in buckets and grand_child in buckets
+
+
+def test_views_created_after_adding_a_type_are_kept_up_to_date():
+    buckets = TypeBuckets()
+    buckets.add(GrandChild())
+    # The views of GrandChild are cached before the view of Child exists
+    buckets.get_view(Base)
+    child_view = buckets.get_view(Child)
+    grand_child = GrandChild()
+    buckets.add(grand_child)
+    assert grand_child in child_view
+    buckets.discard(grand_child)
+    assert grand_child not in child_view
+
+
+def test_new_types_are_reported_and_clear_keeps_the_live_sets():
+    new_types = []
+    buckets = TypeBuckets(new_types.append)
+    view = buckets.get_view(Base)
+    bucket = buckets.get_bucket(Child)
+    buckets.add(Child())
+    buckets.add(Child())
+    buckets.add(GrandChild())
+    assert new_types == [Child, GrandChild]
+    assert len(view) == 3
+
+    buckets.clear()
+    assert not view and not bucket
+    assert buckets.get_view(Base) is view and buckets.get_bucket(Child) is bucket
+    buckets.discard(Base())
@@ -0,0 +1,25 @@
+import pygame
+
+from better_pygame.utils import merge_rects
+
+BOUNDS = pygame.Rect(0, 0, 100, 100)
+
+
+def test_overlapping_rects_are_merged():
+    rects = merge_rects([pygame.Rect(0, 0, 10, 10), pygame.Rect(5, 5, 10, 10), pygame.Rect(50, 50, 5, 5)], BOUNDS)
+    assert sorted(map(tuple, rects)) == [(0, 0, 15, 15), (50, 50, 5, 5)]
+
+
+def test_chained_rects_are_merged():
+    rects = merge_rects([pygame.Rect(0, 0, 10, 10), pygame.Rect(20, 0, 10, 10), pygame.Rect(8, 0, 14, 10)], BOUNDS)
+    assert list(map(tuple, rects)) == [(0, 0, 30, 10)]
+
+
+def test_rects_are_clipped_and_empty_ones_dropped():
+    rects = merge_rects([pygame.Rect(-5, -5, 10, 10), pygame.Rect(200, 200, 10, 10)], BOUNDS)
+    assert list(map(tuple, rects)) == [(0, 0, 5, 5)]
+
+
+def test_large_coverage_becomes_full_redraw():
+    rects = merge_rects([pygame.Rect(0, 0, 80, 80)], BOUNDS)
+    assert list(map(tuple, rects)) == [(0, 0, 100, 100)]